@@ -26,6 +26,10 @@ from fastapi.responses import JSONResponse
 
 from api.middleware.auth import verify_api_key
 from api.routes import signals, ux_issues, pull_requests, darwin, stats
+from src.config.settings import get_settings
+from src.db import warm_up_pool, close_client, ensure_indexes, has_drift
+from src.db import async_mongodb
+from src.jobs import recover_stale_jobs, shutdown_job_runner
 
 # Create FastAPI app
 app = FastAPI(
@@ -53,7 +57,7 @@ app = FastAPI(
     - **Signals**: View and filter UX friction signals
     - **UX Issues**: View, approve, or reject diagnosed issues
     - **Pull Requests**: View PRs created by Darwin
-    - **Darwin**: Trigger pipeline runs
+    - **Darwin**: Trigger pipeline runs and track background jobs
     - **Stats**: Get dashboard statistics
     """,
     version="1.0.0",
@@ -171,6 +175,23 @@ async def global_exception_handler(request, exc):
 async def startup_event():
     """Run on application startup."""
     print("🚀 Darwin API starting up...")
+    if warm_up_pool():
+        print("🗄️  MongoDB connection pool warmed up")
+        if get_settings().MONGODB_AUTO_INDEX:
+            report = ensure_indexes()
+            for col_name, names in report["created"].items():
+                print(f"🗂️  Created indexes on {col_name}: {', '.join(names)}")
+            for col_name, error in report["errors"].items():
+                print(f"⚠️  Could not create indexes on {col_name}: {error}")
+            if has_drift(report["drift"]):
+                print(f"⚠️  Index drift detected: {report['drift']}")
+        stale_jobs = recover_stale_jobs()
+        if stale_jobs:
+            print(f"🧹 Marked {stale_jobs} interrupted pipeline job(s) as failed")
+    else:
+        print("⚠️  MongoDB unreachable at startup - connections will open on demand")
+    if await async_mongodb.warm_up_pool():
+        print("🗄️  Async MongoDB connection pool warmed up")
     print("📖 API Docs: http://localhost:8000/docs")
     print("🔑 API Key authentication enabled")
 
@@ -179,3 +200,6 @@ async def startup_event():
 async def shutdown_event():
     """Run on application shutdown."""
     print("👋 Darwin API shutting down...")
+    shutdown_job_runner()
+    await async_mongodb.close_client()
+    close_client()
@@ -4,15 +4,27 @@ Darwin Pipeline API Routes
 Endpoints for triggering Darwin agent pipelines.
 """
 
-from fastapi import APIRouter, HTTPException, Body
+from fastapi import APIRouter, HTTPException, Body, Query, Response, Header
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 from enum import Enum
-import subprocess
+import json
 import os
 import sys
 
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.db import async_mongodb as adb
+from src.jobs import JOBS_COLLECTION, JOB_FINISHED, JobQueueFull, get_job_runner, get_event_bus
+from src.models.enums import JobStatus
+
 router = APIRouter()
 
+# Seconds between SSE keep-alive comments on an idle stream
+SSE_HEARTBEAT_SECONDS = 15
+
 
 class PipelineMode(str, Enum):
     analyze = "analyze"
@@ -23,12 +35,17 @@ class PipelineMode(str, Enum):
 
 @router.post("/run")
 async def run_darwin_pipeline(
+    response: Response,
     mode: PipelineMode = Body(..., description="Pipeline mode to run"),
     dry_run: bool = Body(default=False, description="If true, only validate without running"),
 ):
     """
     Trigger a Darwin pipeline run.
     
+    The run is queued as a background job and its `job_id` is returned
+    immediately. Poll `GET /api/darwin/jobs/{job_id}` for its status, or
+    stream its progress from `GET /api/darwin/jobs/{job_id}/events`.
+    
     Modes:
     - analyze: Run Watcher + Analyst (detect signals, diagnose issues)
     - engineer: Run Engineer (create PRs for approved issues)
@@ -52,52 +69,160 @@ async def run_darwin_pipeline(
             "dry_run": True,
         }
     
-    # Get the project root directory
-    # __file__ = api/routes/darwin.py, need to go up 3 levels to reach project root
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    script_path = os.path.join(project_root, "scripts", "run_darwin.py")
-    venv_python = os.path.join(project_root, "venv", "bin", "python")
-    
-    # Check if script exists
-    if not os.path.exists(script_path):
+    try:
+        job = await run_in_threadpool(get_job_runner().submit, mode.value)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Darwin job queue is full: {str(e)}")
+    except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Darwin script not found at {script_path}"
+            detail=f"Error queuing Darwin pipeline: {str(e)}"
         )
     
-    # Use venv python if available, otherwise system python
-    python_cmd = venv_python if os.path.exists(venv_python) else sys.executable
+    response.status_code = 202
+    return {
+        "success": True,
+        "message": f"Darwin pipeline '{mode.value}' queued",
+        "mode": mode,
+        "job_id": job["_id"],
+        "status": job["status"],
+        "status_url": f"/api/darwin/jobs/{job['_id']}",
+        "events_url": f"/api/darwin/jobs/{job['_id']}/events",
+    }
+
+
+# ============================================================================
+# Pipeline Jobs
+# ============================================================================
+
+@router.get("/jobs")
+async def get_jobs(
+    status: Optional[JobStatus] = Query(None, description="Filter by job status"),
+    mode: Optional[PipelineMode] = Query(None, description="Filter by pipeline mode"),
+    limit: int = Query(20, description="Maximum number of results", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+):
+    """
+    Get pipeline jobs, newest first.
+    """
+    query = {}
+    
+    if status:
+        query["status"] = status.value
+    if mode:
+        query["mode"] = mode.value
     
     try:
-        # Run the Darwin pipeline
-        result = subprocess.run(
-            [python_cmd, script_path, "--mode", mode.value],
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minute timeout
-            cwd=project_root,
-            env={**os.environ, "PYTHONPATH": project_root},
-        )
+        jobs, next_cursor = await adb.find_page(JOBS_COLLECTION, query, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "jobs": jobs,
+        "count": len(jobs),
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status and result of a pipeline job.
+    """
+    try:
+        job = await adb.find_by_id(JOBS_COLLECTION, job_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid job ID: {str(e)}")
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job
+
+
+def format_sse(event: dict) -> str:
+    """Format a job event as a Server-Sent Events message."""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    last_event_id: Optional[int] = Header(None, description="Resume after this event ID (sent by EventSource on reconnect)"),
+    after: int = Query(0, description="Only stream events with an ID greater than this", ge=0),
+):
+    """
+    Stream a pipeline job's progress as Server-Sent Events.
+    
+    Event types: job_queued, job_started, agent_started, agent_step,
+    tool_call (with latency_ms), document_written, pr_created,
+    task_finished, cancel_requested, job_finished. The stream replays
+    buffered events first and closes after `job_finished`.
+    """
+    stream = get_event_bus().get(job_id)
+    
+    if stream is None:
+        # Not held in memory (older job or another API process): report the stored outcome
+        try:
+            job = await adb.find_by_id(JOBS_COLLECTION, job_id)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid job ID: {str(e)}")
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job["status"] not in (JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value):
+            raise HTTPException(status_code=409, detail="Job events are not available from this API process")
         
-        return {
-            "success": result.returncode == 0,
-            "message": f"Darwin pipeline '{mode}' completed" if result.returncode == 0 else f"Darwin pipeline '{mode}' failed",
-            "mode": mode,
-            "exit_code": result.returncode,
-            "stdout": result.stdout[-2000:] if len(result.stdout) > 2000 else result.stdout,  # Truncate if too long
-            "stderr": result.stderr[-1000:] if len(result.stderr) > 1000 else result.stderr,
-        }
+        async def stored_outcome():
+            yield format_sse({
+                "id": 1,
+                "type": JOB_FINISHED,
+                "job_id": job_id,
+                "timestamp": job.get("finished_at"),
+                "data": {
+                    "status": job["status"],
+                    "error": job.get("error"),
+                    "duration_seconds": job.get("duration_seconds"),
+                },
+            })
         
-    except subprocess.TimeoutExpired:
-        raise HTTPException(
-            status_code=504,
-            detail=f"Darwin pipeline '{mode}' timed out after 5 minutes"
-        )
+        return StreamingResponse(stored_outcome(), media_type="text/event-stream")
+    
+    async def live_events():
+        async for event in stream.subscribe(
+            after_id=max(after, last_event_id or 0),
+            heartbeat_seconds=SSE_HEARTBEAT_SECONDS,
+        ):
+            yield ": keep-alive\n\n" if event is None else format_sse(event)
+    
+    return StreamingResponse(
+        live_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """
+    Cancel a pipeline job.
+    
+    Queued jobs are cancelled immediately. Running jobs stop at the
+    next agent step, so the job may report `running` with
+    `cancel_requested: true` for a short while.
+    """
+    try:
+        job = await run_in_threadpool(get_job_runner().cancel, job_id)
     except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error running Darwin pipeline: {str(e)}"
-        )
+        raise HTTPException(status_code=400, detail=f"Invalid job ID: {str(e)}")
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {
+        "success": job["status"] in (JobStatus.CANCELLED.value, JobStatus.RUNNING.value),
+        "message": f"Job {job['status']}" if job["status"] != JobStatus.RUNNING.value else "Cancellation requested",
+        "job": job,
+    }
 
 
 @router.get("/status")
@@ -118,9 +243,16 @@ async def get_darwin_status():
         "tools_folder": os.path.exists(os.path.join(project_root, "src", "tools")),
     }
     
+    runner = get_job_runner()
+    
     return {
         "status": "healthy" if all(checks.values()) else "degraded",
         "available_modes": ["analyze", "engineer", "full"],
         "interactive_modes": ["review"],
         "checks": checks,
+        "jobs": {
+            "active": runner.active_jobs(),
+            "max_workers": runner.max_workers,
+            "max_queued": runner.max_queued,
+        },
     }
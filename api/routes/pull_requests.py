@@ -13,7 +13,8 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.db import find_many, find_by_id
+from src.db import async_mongodb as adb
+from src.db import parse_fields
 
 router = APIRouter()
 
@@ -36,23 +37,30 @@ def serialize_doc(doc: dict) -> dict:
 async def get_pull_requests(
     status: Optional[str] = Query(None, description="Filter by status (open, merged, closed)"),
     limit: int = Query(50, description="Maximum number of results", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (e.g. pr_url,status)"),
 ):
     """
-    Get all Pull Requests created by Darwin.
+    Get all Pull Requests created by Darwin, newest first.
     
     Optionally filter by status.
+    Pass `next_cursor` back as `cursor` to fetch the next page.
     """
     query = {}
     
     if status:
         query["status"] = status
     
-    prs = find_many("pull_requests", query, limit=limit)
+    try:
+        prs, next_cursor = await adb.find_page("pull_requests", query, limit=limit, cursor=cursor, projection=parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     serialized = [serialize_doc(pr) for pr in prs]
     
     return {
         "pull_requests": serialized,
         "count": len(serialized),
+        "next_cursor": next_cursor,
         "filters": {
             "status": status,
         }
@@ -65,7 +73,7 @@ async def get_pull_request(pr_id: str):
     Get a specific Pull Request by ID.
     """
     try:
-        pr = find_by_id("pull_requests", pr_id)
+        pr = await adb.find_by_id("pull_requests", pr_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid PR ID: {str(e)}")
     
@@ -80,20 +88,11 @@ async def get_pr_stats():
     """
     Get Pull Request statistics.
     """
-    prs = find_many("pull_requests", {})
-    
-    status_counts = {
-        "open": 0,
-        "merged": 0,
-        "closed": 0,
-    }
-    
-    for pr in prs:
-        st = pr.get("status", "unknown")
-        if st in status_counts:
-            status_counts[st] += 1
-        else:
-            status_counts[st] = 1
+    status_counts = await adb.count_by(
+        "pull_requests",
+        "status",
+        keys=["open", "merged", "closed"],
+    )
     
     return {
         "by_status": status_counts,
@@ -13,7 +13,8 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.db import find_many, find_by_id
+from src.db import async_mongodb as adb
+from src.db import parse_fields
 
 router = APIRouter()
 
@@ -34,11 +35,14 @@ async def get_signals(
     processed: Optional[bool] = Query(None, description="Filter by processed status"),
     type: Optional[str] = Query(None, description="Filter by signal type (rage_click, drop_off, error_spike)"),
     limit: int = Query(50, description="Maximum number of results", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (e.g. title,severity,page)"),
 ):
     """
-    Get all friction signals.
+    Get all friction signals, newest first.
     
     Optionally filter by severity, processed status, or type.
+    Pass `next_cursor` back as `cursor` to fetch the next page.
     """
     query = {}
     
@@ -49,12 +53,16 @@ async def get_signals(
     if type:
         query["type"] = type
     
-    signals = find_many("signals", query, limit=limit)
+    try:
+        signals, next_cursor = await adb.find_page("signals", query, limit=limit, cursor=cursor, projection=parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     serialized = [serialize_doc(s) for s in signals]
     
     return {
         "signals": serialized,
         "count": len(serialized),
+        "next_cursor": next_cursor,
         "filters": {
             "severity": severity,
             "processed": processed,
@@ -69,7 +77,7 @@ async def get_signal(signal_id: str):
     Get a specific signal by ID.
     """
     try:
-        signal = find_by_id("signals", signal_id)
+        signal = await adb.find_by_id("signals", signal_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid signal ID: {str(e)}")
     
@@ -84,19 +92,12 @@ async def get_signals_by_severity():
     """
     Get signal counts grouped by severity.
     """
-    signals = find_many("signals", {})
-    
-    severity_counts = {
-        "critical": 0,
-        "high": 0,
-        "medium": 0,
-        "low": 0,
-    }
-    
-    for signal in signals:
-        sev = signal.get("severity", "unknown")
-        if sev in severity_counts:
-            severity_counts[sev] += 1
+    severity_counts = await adb.count_by(
+        "signals",
+        "severity",
+        keys=["critical", "high", "medium", "low"],
+        include_other=False,
+    )
     
     return {
         "by_severity": severity_counts,
@@ -109,12 +110,7 @@ async def get_signals_by_type():
     """
     Get signal counts grouped by type.
     """
-    signals = find_many("signals", {})
-    
-    type_counts = {}
-    for signal in signals:
-        signal_type = signal.get("type", "unknown")
-        type_counts[signal_type] = type_counts.get(signal_type, 0) + 1
+    type_counts = await adb.count_by("signals", "type")
     
     return {
         "by_type": type_counts,
@@ -4,7 +4,8 @@ Statistics API Routes
 Endpoints for getting dashboard statistics and insights.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime
 import sys
 import os
@@ -12,7 +13,8 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.db import find_many, get_stats as db_get_stats
+from src.db import async_mongodb as adb
+from src.db import get_stats as db_get_stats, get_pool_stats, check_index_drift, has_drift
 
 router = APIRouter()
 
@@ -31,42 +33,25 @@ def serialize_doc(doc: dict) -> dict:
 
 
 @router.get("/")
-async def get_stats():
+async def get_stats(
+    exact: bool = Query(False, description="Exact counts instead of collection metadata estimates"),
+):
     """
     Get overall statistics for the Darwin dashboard.
     
-    Returns counts for all collections and key metrics.
+    Returns counts for all collections and key metrics. Totals come from
+    collection metadata (cached for a few seconds) unless `exact` is set.
     """
-    stats = db_get_stats()
+    # Cached, thread-pooled counts; keep them off the event loop
+    stats = await run_in_threadpool(db_get_stats, exact=exact)
     
-    # Get additional breakdowns
-    signals = find_many("signals", {})
-    ux_issues = find_many("ux_issues", {})
-    prs = find_many("pull_requests", {})
-    
-    # Signal severity breakdown
-    signal_severity = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-    for s in signals:
-        sev = s.get("severity", "unknown")
-        if sev in signal_severity:
-            signal_severity[sev] += 1
-    
-    # Issue status breakdown
-    issue_status = {"diagnosed": 0, "approved": 0, "rejected": 0, "pr_created": 0}
-    for i in ux_issues:
-        st = i.get("status", "unknown")
-        if st in issue_status:
-            issue_status[st] += 1
-    
-    # PR status breakdown
-    pr_status = {"open": 0, "merged": 0, "closed": 0}
-    for p in prs:
-        st = p.get("status", "unknown")
-        if st in pr_status:
-            pr_status[st] += 1
+    # Severity/status breakdowns in a single aggregation round trip
+    breakdowns = await adb.dashboard_breakdowns()
+    issue_status = breakdowns["issues_by_status"]
     
     return {
         "database": stats.get("database"),
+        "exact_counts": stats.get("exact", False),
         "totals": {
             "signals": stats.get("collections", {}).get("signals", 0),
             "ux_issues": stats.get("collections", {}).get("ux_issues", 0),
@@ -78,12 +63,12 @@ async def get_stats():
             "code_fixes": stats.get("collections", {}).get("code_fixes", 0),
         },
         "breakdowns": {
-            "signals_by_severity": signal_severity,
+            "signals_by_severity": breakdowns["signals_by_severity"],
             "issues_by_status": issue_status,
-            "prs_by_status": pr_status,
+            "prs_by_status": breakdowns["prs_by_status"],
         },
         "pending_actions": {
-            "signals_unprocessed": len([s for s in signals if not s.get("processed", False)]),
+            "signals_unprocessed": breakdowns["signals_unprocessed"],
             "issues_pending_review": issue_status.get("diagnosed", 0),
             "issues_approved_pending_pr": issue_status.get("approved", 0),
         },
@@ -95,7 +80,7 @@ async def get_insights():
     """
     Get AI-generated insights from Darwin.
     """
-    insights = find_many("insights", {}, limit=20)
+    insights = await adb.find_many("insights", {}, limit=20)
     serialized = [serialize_doc(i) for i in insights]
     
     return {
@@ -109,7 +94,7 @@ async def get_agent_logs(limit: int = 50):
     """
     Get recent agent activity logs.
     """
-    logs = find_many("agent_logs", {}, limit=limit)
+    logs = await adb.find_many("agent_logs", {}, limit=limit)
     serialized = [serialize_doc(log) for log in logs]
     
     return {
@@ -123,10 +108,32 @@ async def get_product_metrics():
     """
     Get product metrics tracked by Darwin.
     """
-    metrics = find_many("product_metrics", {}, limit=50)
+    metrics = await adb.find_many("product_metrics", {}, limit=50)
     serialized = [serialize_doc(m) for m in metrics]
     
     return {
         "metrics": serialized,
         "count": len(serialized),
     }
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats():
+    """
+    Get MongoDB connection pool settings and checkout metrics.
+    """
+    return get_pool_stats()
+
+
+@router.get("/indexes")
+async def get_index_drift():
+    """
+    Compare registered indexes with the live database.
+    
+    Lists missing, changed and unregistered indexes per collection.
+    """
+    report = await run_in_threadpool(check_index_drift)
+    return {
+        "in_sync": not has_drift(report),
+        "collections": report,
+    }
@@ -13,7 +13,8 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.db import find_many, find_by_id, update_by_id, find_one
+from src.db import async_mongodb as adb
+from src.db import parse_fields
 
 router = APIRouter()
 
@@ -37,11 +38,14 @@ async def get_ux_issues(
     status: Optional[str] = Query(None, description="Filter by status (diagnosed, approved, rejected, pr_created)"),
     priority: Optional[str] = Query(None, description="Filter by priority (critical, high, medium, low)"),
     limit: int = Query(50, description="Maximum number of results", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (e.g. title,status,priority)"),
 ):
     """
-    Get all UX issues.
+    Get all UX issues, newest first.
     
     Optionally filter by status or priority.
+    Pass `next_cursor` back as `cursor` to fetch the next page.
     """
     query = {}
     
@@ -50,21 +54,19 @@ async def get_ux_issues(
     if priority:
         query["priority"] = priority
     
-    issues = find_many("ux_issues", query, limit=limit)
+    try:
+        issues, next_cursor = await adb.find_page("ux_issues", query, limit=limit, cursor=cursor, projection=parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     serialized = [serialize_doc(i) for i in issues]
     
-    # Enrich issues with pr_url if they have pr_created status
-    for issue in serialized:
-        if issue.get("status") == "pr_created":
-            # Look up PR by issue_id
-            pr = find_one("pull_requests", {"issue_id": issue["_id"]})
-            if pr:
-                issue["pr_url"] = pr.get("pr_url")
-                issue["pr_number"] = pr.get("pr_number")
+    # Enrich pr_created issues with pr_url / pr_number in one batched lookup
+    await adb.attach_pull_requests(serialized)
     
     return {
         "issues": serialized,
         "count": len(serialized),
+        "next_cursor": next_cursor,
         "filters": {
             "status": status,
             "priority": priority,
@@ -77,7 +79,7 @@ async def get_pending_review():
     """
     Get UX issues that are pending human review (status = 'diagnosed').
     """
-    issues = find_many("ux_issues", {"status": "diagnosed"})
+    issues = await adb.find_many("ux_issues", {"status": "diagnosed"})
     serialized = [serialize_doc(i) for i in issues]
     
     return {
@@ -92,7 +94,7 @@ async def get_ux_issue(issue_id: str):
     Get a specific UX issue by ID.
     """
     try:
-        issue = find_by_id("ux_issues", issue_id)
+        issue = await adb.find_by_id("ux_issues", issue_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid issue ID: {str(e)}")
     
@@ -111,7 +113,7 @@ async def approve_issue(issue_id: str):
     for the Engineer agent to create a Pull Request.
     """
     try:
-        issue = find_by_id("ux_issues", issue_id)
+        issue = await adb.find_by_id("ux_issues", issue_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid issue ID: {str(e)}")
     
@@ -125,7 +127,7 @@ async def approve_issue(issue_id: str):
             detail=f"Cannot approve issue with status '{current_status}'. Only 'diagnosed' or 'rejected' issues can be approved."
         )
     
-    update_by_id("ux_issues", issue_id, {
+    await adb.update_by_id("ux_issues", issue_id, {
         "status": "approved",
         "approved_at": datetime.now().isoformat(),
     })
@@ -149,7 +151,7 @@ async def reject_issue(
     This updates the issue status to 'rejected' and stores the rejection reason.
     """
     try:
-        issue = find_by_id("ux_issues", issue_id)
+        issue = await adb.find_by_id("ux_issues", issue_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid issue ID: {str(e)}")
     
@@ -158,7 +160,7 @@ async def reject_issue(
     
     current_status = issue.get("status")
     
-    update_by_id("ux_issues", issue_id, {
+    await adb.update_by_id("ux_issues", issue_id, {
         "status": "rejected",
         "rejection_reason": reason,
         "rejected_at": datetime.now().isoformat(),
@@ -178,21 +180,11 @@ async def get_issues_by_status():
     """
     Get issue counts grouped by status.
     """
-    issues = find_many("ux_issues", {})
-    
-    status_counts = {
-        "diagnosed": 0,
-        "approved": 0,
-        "rejected": 0,
-        "pr_created": 0,
-    }
-    
-    for issue in issues:
-        st = issue.get("status", "unknown")
-        if st in status_counts:
-            status_counts[st] += 1
-        else:
-            status_counts[st] = 1
+    status_counts = await adb.count_by(
+        "ux_issues",
+        "status",
+        keys=["diagnosed", "approved", "rejected", "pr_created"],
+    )
     
     return {
         "by_status": status_counts,
@@ -9,7 +9,6 @@ Run: python scripts/check_posthog_data.py
 
 import os
 import sys
-import requests
 from datetime import datetime, timedelta
 from rich.console import Console
 from rich.table import Table
@@ -20,6 +19,7 @@ from rich.progress import Progress
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config.settings import get_settings
+from src.tools.posthog_client import PostHogError, get_posthog_client
 
 console = Console()
 
@@ -48,28 +48,25 @@ def check_posthog_connection():
 
 def query_posthog(settings, query: str) -> dict:
     """Execute a HogQL query."""
-    headers = {
-        "Authorization": f"Bearer {settings.POSTHOG_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    base_url = f"{settings.POSTHOG_HOST}/api/projects/{settings.POSTHOG_PROJECT_ID}"
-    
-    response = requests.post(
-        f"{base_url}/query/",
-        headers=headers,
-        json={"query": {"kind": "HogQLQuery", "query": query}},
-        timeout=30
-    )
-    
-    if response.status_code == 200:
-        return response.json()
-    else:
-        console.print(f"[red]API Error: {response.status_code}[/red]")
-        console.print(f"[dim]{response.text[:500]}[/dim]")
+    try:
+        # Always fresh: this script reports what PostHog holds right now
+        return get_posthog_client().query(query, use_cache=False)
+    except PostHogError as e:
+        console.print(f"[red]API Error: {e.status}[/red]")
+        console.print(f"[dim]{e.message}[/dim]")
         return {"results": []}
 
 
+def query_posthog_batch(settings, queries: dict) -> dict:
+    """Execute independent HogQL queries concurrently; results keyed by name."""
+    # Always fresh, like query_posthog()
+    batch = get_posthog_client().query_many(queries, use_cache=False)
+    for name, data in batch.items():
+        if "error" in data:
+            console.print(f"[red]API Error ({name}):[/red] [dim]{data['error'][:500]}[/dim]")
+    return batch
+
+
 def check_event_counts(settings):
     """Check all event types and counts."""
     console.print("[bold yellow]📊 Event Summary (Last 30 Days)[/bold yellow]")
@@ -132,16 +129,9 @@ def check_event_counts(settings):
     return darwin_relevant
 
 
-def check_friction_signals(settings):
-    """Check for specific friction patterns Darwin looks for."""
-    console.print("[bold yellow]🚨 Friction Signal Detection[/bold yellow]")
-    console.print()
-    
-    friction_checks = []
-    
-    # 1. Check for rage clicks (rapid add-to-cart)
-    console.print("[bold]1. Rage Clicks (Rapid Add to Cart):[/bold]")
-    query = """
+# HogQL of each friction check (independent, so run as one concurrent batch)
+FRICTION_QUERIES = {
+    "rage_clicks": """
         SELECT 
             distinct_id,
             properties.product_id as product,
@@ -156,9 +146,60 @@ def check_friction_signals(settings):
         HAVING count() >= 3
         ORDER BY click_count DESC
         LIMIT 20
-    """
+    """,
+    "cart_abandonment": """
+        SELECT 
+            count(DISTINCT case when event = 'product_added_to_cart' then distinct_id end) as added_to_cart,
+            count(DISTINCT case when event = 'checkout_initiated' then distinct_id end) as started_checkout
+        FROM events 
+        WHERE timestamp > now() - INTERVAL 7 DAY
+    """,
+    "coupon_failures": """
+        SELECT 
+            count(case when event = 'coupon_failed' then 1 end) as failed,
+            count(case when event = 'coupon_applied' then 1 end) as success,
+            uniq(case when event = 'coupon_failed' then distinct_id end) as users_failed
+        FROM events 
+        WHERE event IN ('coupon_failed', 'coupon_applied')
+        AND timestamp > now() - INTERVAL 7 DAY
+    """,
+    "wishlist_churn": """
+        SELECT 
+            distinct_id,
+            count(case when event = 'product_added_to_wishlist' then 1 end) as adds,
+            count(case when event = 'product_removed_from_wishlist' then 1 end) as removes
+        FROM events 
+        WHERE event IN ('product_added_to_wishlist', 'product_removed_from_wishlist')
+        AND timestamp > now() - INTERVAL 7 DAY
+        GROUP BY distinct_id
+        HAVING adds >= 2 AND removes >= 2
+    """,
+    "quantity_spam": """
+        SELECT 
+            distinct_id,
+            count() as updates
+        FROM events 
+        WHERE event = 'cart_quantity_updated'
+        AND timestamp > now() - INTERVAL 7 DAY
+        GROUP BY distinct_id
+        HAVING updates >= 5
+    """,
+}
+
+
+def check_friction_signals(settings):
+    """Check for specific friction patterns Darwin looks for."""
+    console.print("[bold yellow]🚨 Friction Signal Detection[/bold yellow]")
+    console.print()
     
-    data = query_posthog(settings, query)
+    friction_checks = []
+    
+    # The checks are independent: run all their queries at once
+    batch = query_posthog_batch(settings, FRICTION_QUERIES)
+    
+    # 1. Check for rage clicks (rapid add-to-cart)
+    console.print("[bold]1. Rage Clicks (Rapid Add to Cart):[/bold]")
+    data = batch["rage_clicks"]
     results = data.get("results", [])
     
     if results:
@@ -173,15 +214,7 @@ def check_friction_signals(settings):
     
     # 2. Check for cart abandonment
     console.print("[bold]2. Cart Abandonment:[/bold]")
-    query = """
-        SELECT 
-            count(DISTINCT case when event = 'product_added_to_cart' then distinct_id end) as added_to_cart,
-            count(DISTINCT case when event = 'checkout_initiated' then distinct_id end) as started_checkout
-        FROM events 
-        WHERE timestamp > now() - INTERVAL 7 DAY
-    """
-    
-    data = query_posthog(settings, query)
+    data = batch["cart_abandonment"]
     results = data.get("results", [])
     
     if results and results[0][0]:
@@ -201,17 +234,7 @@ def check_friction_signals(settings):
     
     # 3. Check for coupon failures
     console.print("[bold]3. Coupon Failures:[/bold]")
-    query = """
-        SELECT 
-            count(case when event = 'coupon_failed' then 1 end) as failed,
-            count(case when event = 'coupon_applied' then 1 end) as success,
-            uniq(case when event = 'coupon_failed' then distinct_id end) as users_failed
-        FROM events 
-        WHERE event IN ('coupon_failed', 'coupon_applied')
-        AND timestamp > now() - INTERVAL 7 DAY
-    """
-    
-    data = query_posthog(settings, query)
+    data = batch["coupon_failures"]
     results = data.get("results", [])
     
     if results and (results[0][0] or results[0][1]):
@@ -231,19 +254,7 @@ def check_friction_signals(settings):
     
     # 4. Check for wishlist churn
     console.print("[bold]4. Wishlist Churn:[/bold]")
-    query = """
-        SELECT 
-            distinct_id,
-            count(case when event = 'product_added_to_wishlist' then 1 end) as adds,
-            count(case when event = 'product_removed_from_wishlist' then 1 end) as removes
-        FROM events 
-        WHERE event IN ('product_added_to_wishlist', 'product_removed_from_wishlist')
-        AND timestamp > now() - INTERVAL 7 DAY
-        GROUP BY distinct_id
-        HAVING adds >= 2 AND removes >= 2
-    """
-    
-    data = query_posthog(settings, query)
+    data = batch["wishlist_churn"]
     results = data.get("results", [])
     
     if results:
@@ -256,18 +267,7 @@ def check_friction_signals(settings):
     
     # 5. Check for quantity update spam
     console.print("[bold]5. Quantity Update Spam:[/bold]")
-    query = """
-        SELECT 
-            distinct_id,
-            count() as updates
-        FROM events 
-        WHERE event = 'cart_quantity_updated'
-        AND timestamp > now() - INTERVAL 7 DAY
-        GROUP BY distinct_id
-        HAVING updates >= 5
-    """
-    
-    data = query_posthog(settings, query)
+    data = batch["quantity_spam"]
     results = data.get("results", [])
     
     if results:
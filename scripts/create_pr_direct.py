@@ -18,116 +18,21 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from rich.console import Console
 from rich.panel import Panel
 from rich.syntax import Syntax
-from github import Github, Auth
-from github.GithubException import GithubException
-import base64
 
 from src.config.settings import get_settings
 from src.db import find_many, update_by_id, insert_one
+from src.tools.github_pr_builder import Fix, PreparedChange, get_pr_builder
 
 console = Console()
 
 
-def get_file_from_github(repo, file_path: str, branch: str = "main") -> str:
-    """Read file content from GitHub."""
-    try:
-        file_content = repo.get_contents(file_path, ref=branch)
-        if isinstance(file_content, list):
-            raise ValueError(f"'{file_path}' is a directory")
-        return base64.b64decode(file_content.content).decode('utf-8')
-    except GithubException as e:
-        if e.status == 404:
-            raise FileNotFoundError(f"File not found: {file_path}")
-        raise
-
-
-def apply_fix(original_content: str, original_code: str, suggested_code: str) -> str:
-    """Apply the fix by replacing original_code with suggested_code."""
-    # Normalize line endings
-    original_content = original_content.replace('\r\n', '\n')
-    original_code = original_code.replace('\r\n', '\n')
-    suggested_code = suggested_code.replace('\r\n', '\n')
-    
-    if original_code in original_content:
-        return original_content.replace(original_code, suggested_code, 1)
-    
-    # Try with normalized whitespace
-    original_lines = [line.strip() for line in original_code.split('\n')]
-    content_lines = original_content.split('\n')
-    
-    # Find matching section
-    for i in range(len(content_lines) - len(original_lines) + 1):
-        match = True
-        for j, orig_line in enumerate(original_lines):
-            if content_lines[i + j].strip() != orig_line:
-                match = False
-                break
-        
-        if match:
-            # Found the match - replace preserving indentation
-            result_lines = content_lines[:i]
-            
-            # Get base indentation from first line
-            base_indent = len(content_lines[i]) - len(content_lines[i].lstrip())
-            indent = ' ' * base_indent
-            
-            # Add suggested code with proper indentation
-            for suggested_line in suggested_code.split('\n'):
-                if suggested_line.strip():
-                    result_lines.append(indent + suggested_line.lstrip())
-                else:
-                    result_lines.append('')
-            
-            result_lines.extend(content_lines[i + len(original_lines):])
-            return '\n'.join(result_lines)
-    
-    raise ValueError("Could not find original code in file content")
-
-
-def create_pr(repo, file_path: str, new_content: str, title: str, body: str, base_branch: str = "main"):
-    """Create a PR with the changes."""
-    # Generate branch name
-    timestamp = int(time.time())
-    clean_title = title.lower()
-    clean_title = ''.join(c if c.isalnum() or c == ' ' else '' for c in clean_title)
-    clean_title = clean_title.replace(' ', '-')[:30]
-    branch_name = f"darwin/{clean_title}-{timestamp}"
-    
-    # Get base branch ref
-    base_ref = repo.get_git_ref(f"heads/{base_branch}")
-    base_sha = base_ref.object.sha
-    
-    # Create new branch
-    repo.create_git_ref(f"refs/heads/{branch_name}", base_sha)
-    console.print(f"[green]✅ Created branch: {branch_name}[/green]")
-    
-    # Get current file SHA
-    file_obj = repo.get_contents(file_path, ref=base_branch)
-    
-    # Commit the change
-    repo.update_file(
-        path=file_path,
-        message=f"🧬 Darwin Fix: {title}",
-        content=new_content,
-        sha=file_obj.sha,
-        branch=branch_name
-    )
-    console.print(f"[green]✅ Committed changes to {file_path}[/green]")
-    
-    # Create PR
-    pr = repo.create_pull(
-        title=title,
-        body=body,
-        head=branch_name,
-        base=base_branch
-    )
-    console.print(f"[green]✅ Created PR: {pr.html_url}[/green]")
-    
-    return {
-        "pr_number": pr.number,
-        "pr_url": pr.html_url,
-        "branch_name": branch_name
-    }
+def create_pr(change: PreparedChange, title: str, body: str):
+    """Create a PR with the changes (one commit via the Git Data API)."""
+    result = get_pr_builder().open_pull_request(change, title, body)
+    console.print(f"[green]✅ Committed changes to {', '.join(result['files'])}[/green]")
+    console.print(f"[green]✅ Created branch: {result['branch_name']}[/green]")
+    console.print(f"[green]✅ Created PR: {result['pr_url']}[/green]")
+    return result
 
 
 def main():
@@ -142,9 +47,7 @@ def main():
     settings = get_settings()
     
     # Connect to GitHub
-    auth = Auth.Token(settings.GITHUB_TOKEN)
-    g = Github(auth=auth)
-    repo = g.get_repo(f"{settings.GITHUB_OWNER}/{settings.GITHUB_REPO}")
+    builder = get_pr_builder()
     console.print(f"[green]✅ Connected to GitHub: {settings.GITHUB_OWNER}/{settings.GITHUB_REPO}[/green]")
     
     # Find approved issues (or diagnosed if none approved)
@@ -205,23 +108,18 @@ def main():
     console.print(Syntax(suggested_code, "typescript", theme="monokai"))
     console.print()
     
-    # Read current file from GitHub
-    console.print("[cyan]📖 Reading file from GitHub...[/cyan]")
+    # Read the current file from GitHub and apply the fix
+    console.print("[cyan]🔧 Applying fix to the current head of main...[/cyan]")
     try:
-        current_content = get_file_from_github(repo, file_path)
-        console.print(f"[green]✅ Read {len(current_content)} characters[/green]")
+        change = builder.prepare([Fix(file_path, original_code, suggested_code)])
     except Exception as e:
         console.print(f"[red]❌ Failed to read file: {e}[/red]")
         return
     
-    # Apply the fix
-    console.print("[cyan]🔧 Applying fix...[/cyan]")
-    try:
-        new_content = apply_fix(current_content, original_code, suggested_code)
-        console.print(f"[green]✅ Fix applied successfully[/green]")
-    except Exception as e:
-        console.print(f"[red]❌ Failed to apply fix: {e}[/red]")
+    if change.failed:
+        console.print(f"[red]❌ Failed to apply fix: {change.failed[0]['error']}[/red]")
         return
+    console.print(f"[green]✅ Fix applied at {change.matches[0].describe()}[/green]")
     
     # Create PR
     console.print()
@@ -246,7 +144,7 @@ def main():
 """
     
     try:
-        pr_result = create_pr(repo, file_path, new_content, pr_title, pr_body)
+        pr_result = create_pr(change, pr_title, pr_body)
         
         # Save PR to MongoDB
         pr_doc = {
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Fake PostHog Server
+===================
+Local stand-in for the PostHog API, for exercising Darwin's PostHog
+client, tools and scripts without a real project.
+
+Serves canned data for HogQL queries (/query/), persons, session
+recordings, insights and dashboards. It can add latency and fail the
+first requests with 429/503 to exercise retries.
+
+Run: python scripts/fake_posthog_server.py --port 8010
+Then: POSTHOG_HOST=http://127.0.0.1:8010 python scripts/check_posthog_data.py
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple
+
+
+# Canned HogQL results, picked by the first pattern found in the query
+QUERY_RESULTS: List[Tuple[str, List[str], List[list]]] = [
+    (
+        r"\$rageclick",
+        ["page", "element", "rage_clicks", "affected_users"],
+        [
+            ["http://localhost:8081/product/12", "Add to Cart", 42, 17],
+            ["http://localhost:8081/checkout", "Pay now", 11, 6],
+        ],
+    ),
+    (
+        r"\$autocapture",
+        ["page", "total_clicks", "unique_users"],
+        [
+            ["http://localhost:8081/product/12", 930, 210],
+            ["http://localhost:8081/", 610, 305],
+        ],
+    ),
+    (
+        r"product_viewed",
+        ["event", "total", "unique_users"],
+        [
+            ["product_viewed", 1200, 400],
+            ["product_added_to_cart", 240, 120],
+            ["checkout_started", 90, 60],
+            ["payment_completed", 40, 35],
+        ],
+    ),
+    (
+        r"countIf",
+        ["page", "errors", "recent_errors", "affected_users"],
+        [["http://localhost:8081/checkout", 30, 24, 9]],
+    ),
+    (
+        r"\$exception",
+        ["page", "errors", "unique_users"],
+        [["http://localhost:8081/checkout", 25, 9]],
+    ),
+    (
+        r"FROM persons",
+        ["count()"],
+        [[5]],
+    ),
+    (
+        r"GROUP BY event",
+        ["event", "count", "unique_users"],
+        [
+            ["$pageview", 5200, 800],
+            ["$autocapture", 3100, 640],
+            ["product_viewed", 1200, 400],
+            ["$rageclick", 53, 23],
+        ],
+    ),
+]
+
+
+def _incremental_response(query: str, columns: List[str], results: List[list]) -> Dict[str, Any]:
+    """
+    Canned rows reshaped for an incremental (per-hour) query: every group
+    gets one bucket at the end of the queried window.
+    """
+    bounds = re.findall(r"toDateTime\('([^']+)'\)", query)
+    end = bounds[-1] if bounds else "2026-01-01 00:00:00"
+    bucket = end[:13].replace(" ", "T") + ":00:00Z"
+    rows = []
+    for row in results:
+        *groups, count, users = row
+        rows.append([*groups, bucket, count, users, [f"user-{i}" for i in range(users)]])
+    return {
+        "columns": [*columns[:-2], "bucket", "events", "unique_users", "users"],
+        "results": rows,
+    }
+
+
+class FakePostHogState:
+    """Counters and fault injection shared by all request handlers."""
+
+    def __init__(self, latency: float = 0.0, fail_first: int = 0, fail_status: int = 503):
+        self.latency = latency
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.queries: List[str] = []
+        self.insights: Dict[int, Dict[str, Any]] = {}
+        self.dashboards: Dict[int, Dict[str, Any]] = {}
+
+    def take_failure(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return True
+            return False
+
+
+class FakePostHogHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    state: FakePostHogState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _handle(self, method: str) -> None:
+        body = self._body() if method in ("POST", "PATCH") else {}
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self._send(401, {"detail": "Authentication credentials were not provided."})
+        if self.state.take_failure():
+            status = self.state.fail_status
+            return self._send(status, {"detail": "Injected failure"}, {"Retry-After": "0"} if status == 429 else None)
+
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/api/projects/@current":
+            return self._send(200, {"id": 1, "name": "Fake PostHog"})
+
+        match = re.match(r"^/api/projects/(\d+)(/.*)?$", path)
+        if not match:
+            return self._send(404, {"detail": "Not found."})
+        route = match.group(2) or ""
+
+        if route == "/query" and method == "POST":
+            return self._query(body)
+        if route == "/persons" and method == "GET":
+            return self._send(200, {"results": [{"id": i, "distinct_ids": [f"user-{i}"]} for i in range(5)]})
+        if route == "/session_recordings" and method == "GET":
+            return self._send(200, {"results": [
+                {"id": f"0190fake{i:04d}recording", "recording_duration": 30 + i, "start_time": "2026-01-01T00:00:00Z"}
+                for i in range(3)
+            ]})
+        if route in ("/insights", "/dashboards"):
+            return self._create_or_list(route, method, body)
+        return self._send(404, {"detail": "Not found."})
+
+    def _query(self, body: Dict[str, Any]) -> None:
+        query = (body.get("query") or {}).get("query", "")
+        with self.state.lock:
+            self.state.queries.append(query)
+        for pattern, columns, results in QUERY_RESULTS:
+            if re.search(pattern, query):
+                if "toStartOfHour" in query:
+                    return self._send(200, _incremental_response(query, columns, results))
+                return self._send(200, {"columns": columns, "results": results})
+        return self._send(200, {"columns": [], "results": []})
+
+    def _create_or_list(self, route: str, method: str, body: Dict[str, Any]) -> None:
+        store = self.state.insights if route == "/insights" else self.state.dashboards
+        with self.state.lock:
+            if method == "GET":
+                return self._send(200, {"results": list(store.values())})
+            item = {**body, "id": len(store) + 1}
+            store[item["id"]] = item
+        return self._send(201, item)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+
+def start_fake_posthog(
+    port: int = 0,
+    latency: float = 0.0,
+    fail_first: int = 0,
+    fail_status: int = 503,
+) -> Tuple[ThreadingHTTPServer, FakePostHogState]:
+    """
+    Start the fake server in a background thread.
+
+    Returns:
+        (server, state); the URL is http://127.0.0.1:{server.server_port}
+    """
+    state = FakePostHogState(latency=latency, fail_first=fail_first, fail_status=fail_status)
+    handler = type("Handler", (FakePostHogHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake PostHog API server")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--fail-first", type=int, default=0, help="Fail this many requests first")
+    parser.add_argument("--fail-status", type=int, default=503, help="Status of injected failures")
+    args = parser.parse_args()
+
+    server, _ = start_fake_posthog(args.port, args.latency, args.fail_first, args.fail_status)
+    print(f"Fake PostHog listening on http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
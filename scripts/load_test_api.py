@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Darwin Multi-Agent System - API Load Test
+=========================================
+Fires concurrent requests at the read endpoints of a running Darwin API
+and reports latency percentiles per endpoint.
+
+Usage:
+    python scripts/load_test_api.py [--url URL] [--concurrency N] [--requests N]
+
+Examples:
+    python scripts/load_test_api.py                         # 20 workers, 500 requests
+    python scripts/load_test_api.py --concurrency 50        # Heavier fan-in
+    python scripts/load_test_api.py --endpoint /api/stats/   # Single endpoint
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(os.path.join(project_root, ".env"))
+
+import requests
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# Read endpoints exercised by default (all hit MongoDB)
+DEFAULT_ENDPOINTS = [
+    "/api/signals/?limit=50",
+    "/api/signals/summary/by-severity",
+    "/api/ux-issues/?limit=50",
+    "/api/ux-issues/summary/by-status",
+    "/api/pull-requests/?limit=50",
+    "/api/stats/",
+]
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def run_load_test(base_url: str, endpoints: list, total: int, concurrency: int, api_key: str) -> dict:
+    """
+    Send `total` requests spread round-robin over `endpoints`.
+
+    Returns:
+        Dictionary of endpoint -> {"latencies": [ms...], "errors": int}
+    """
+    results = defaultdict(lambda: {"latencies": [], "errors": 0})
+    lock = threading.Lock()
+    local = threading.local()
+    headers = {"Authorization": f"Bearer {api_key}"}
+
+    def session() -> requests.Session:
+        # One keep-alive session per worker thread
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            local.session.headers.update(headers)
+        return local.session
+
+    def hit(i: int) -> None:
+        endpoint = endpoints[i % len(endpoints)]
+        start = time.perf_counter()
+        try:
+            response = session().get(f"{base_url}{endpoint}", timeout=30)
+            ok = response.status_code == 200
+        except requests.RequestException:
+            ok = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with lock:
+            entry = results[endpoint]
+            entry["latencies"].append(elapsed_ms)
+            if not ok:
+                entry["errors"] += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(hit, range(total)))
+
+    return dict(results)
+
+
+def print_report(results: dict, wall_seconds: float, total: int, concurrency: int) -> None:
+    """Print per-endpoint and overall latency percentiles."""
+    table = Table(title=f"Darwin API load test ({total} requests, concurrency {concurrency})")
+    table.add_column("Endpoint", style="cyan")
+    table.add_column("Requests", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("max ms", justify="right")
+
+    all_latencies = []
+    all_errors = 0
+    for endpoint, entry in results.items():
+        latencies = entry["latencies"]
+        all_latencies.extend(latencies)
+        all_errors += entry["errors"]
+        table.add_row(
+            endpoint,
+            str(len(latencies)),
+            f"[red]{entry['errors']}[/red]" if entry["errors"] else "0",
+            f"{percentile(latencies, 50):.1f}",
+            f"{percentile(latencies, 95):.1f}",
+            f"{percentile(latencies, 99):.1f}",
+            f"{max(latencies):.1f}",
+        )
+
+    table.add_row(
+        "[bold]all[/bold]",
+        str(len(all_latencies)),
+        str(all_errors),
+        f"{percentile(all_latencies, 50):.1f}",
+        f"{percentile(all_latencies, 95):.1f}",
+        f"[bold]{percentile(all_latencies, 99):.1f}[/bold]",
+        f"{max(all_latencies):.1f}",
+    )
+
+    console.print(table)
+    console.print(f"Throughput: {len(all_latencies) / wall_seconds:.1f} req/s over {wall_seconds:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Darwin API read endpoints")
+    parser.add_argument("--url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent workers")
+    parser.add_argument("--requests", type=int, default=500, help="Total requests to send")
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        help="Endpoint path to test (repeatable, defaults to the main read endpoints)",
+    )
+    args = parser.parse_args()
+
+    api_key = os.getenv("DARWIN_API_KEY")
+    if not api_key:
+        console.print("[red]DARWIN_API_KEY not set[/red]")
+        sys.exit(1)
+
+    endpoints = args.endpoint or DEFAULT_ENDPOINTS
+    base_url = args.url.rstrip("/")
+
+    console.print(f"🔥 Sending {args.requests} requests to {base_url} with {args.concurrency} workers...")
+    start = time.perf_counter()
+    results = run_load_test(base_url, endpoints, args.requests, args.concurrency, api_key)
+    print_report(results, time.perf_counter() - start, args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,6 @@ Run: python scripts/setup_posthog_dashboards.py
 
 import os
 import sys
-import requests
 import json
 from datetime import datetime
 from rich.console import Console
@@ -20,6 +19,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config.settings import get_settings
+from src.tools.posthog_client import get_posthog_client
 
 console = Console()
 
@@ -29,25 +29,19 @@ class PostHogSetup:
     
     def __init__(self):
         self.settings = get_settings()
-        self.base_url = f"{self.settings.POSTHOG_HOST}/api/projects/{self.settings.POSTHOG_PROJECT_ID}"
-        self.headers = {
-            "Authorization": f"Bearer {self.settings.POSTHOG_API_KEY}",
-            "Content-Type": "application/json"
-        }
+        self.client = get_posthog_client()
         self.created_insights = []
         self.dashboard_id = None
     
     def _make_request(self, method: str, endpoint: str, data: dict = None) -> dict:
         """Make API request to PostHog."""
-        url = f"{self.base_url}/{endpoint}"
+        path = self.client.project_path(f"/{endpoint}")
         
         try:
             if method == "GET":
-                response = requests.get(url, headers=self.headers, timeout=30)
-            elif method == "POST":
-                response = requests.post(url, headers=self.headers, json=data, timeout=30)
-            elif method == "PATCH":
-                response = requests.patch(url, headers=self.headers, json=data, timeout=30)
+                response = self.client.request("GET", path)
+            elif method in ("POST", "PATCH"):
+                response = self.client.request(method, path, json=data)
             else:
                 return {"error": f"Unknown method: {method}"}
             
@@ -42,16 +42,9 @@ def test_mongodb():
 def test_posthog():
     """Test PostHog API connection."""
     try:
-        import requests
-        from src.config.settings import get_settings
-        
-        settings = get_settings()
+        from src.tools.posthog_client import get_posthog_client
         
-        response = requests.get(
-            f"{settings.POSTHOG_HOST}/api/projects/@current",
-            headers={"Authorization": f"Bearer {settings.POSTHOG_API_KEY}"},
-            timeout=10
-        )
+        response = get_posthog_client().request("GET", "/api/projects/@current", timeout=10)
         
         if response.status_code == 200:
             project = response.json()
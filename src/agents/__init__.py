@@ -4,9 +4,10 @@ Darwin Multi-Agent System - Agents
 CrewAI agents for the Darwin pipeline.
 """
 
+from src.llm import get_gemini_llm
+
 from .watcher import (
     create_watcher_agent,
-    get_gemini_llm,
     WATCHER_METADATA,
 )
 
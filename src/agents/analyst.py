@@ -9,22 +9,15 @@ from crewai import Agent, LLM
 from src.tools import (
     GitHubReadTool,
     GitHubListFilesTool,
+    GitHubFindFilesTool,
+    GitHubGrepTool,
     MongoDBReadTool,
+    MongoDBReadFieldTool,
     MongoDBWriteTool,
     MongoDBUpdateTool,
     GetUnprocessedSignalsTool,
 )
-from src.config.settings import get_settings
-
-
-def get_gemini_llm() -> LLM:
-    """Get configured Gemini LLM for CrewAI."""
-    settings = get_settings()
-    
-    return LLM(
-        model=f"gemini/{settings.GEMINI_MODEL}",
-        api_key=settings.GEMINI_API_KEY,
-    )
+from src.llm import get_gemini_llm
 
 
 def create_analyst_agent(llm: LLM = None) -> Agent:
@@ -37,6 +30,8 @@ def create_analyst_agent(llm: LLM = None) -> Agent:
     Tools:
     - GitHubReadTool: Read source code files
     - GitHubListFilesTool: Explore codebase structure
+    - GitHubFindFilesTool: Locate files by glob or name
+    - GitHubGrepTool: Search file contents
     - MongoDBReadTool: Read signals and issues
     - MongoDBWriteTool: Create UX issues
     - MongoDBUpdateTool: Update signal status
@@ -83,7 +78,10 @@ def create_analyst_agent(llm: LLM = None) -> Agent:
         tools=[
             GitHubReadTool(),
             GitHubListFilesTool(),
+            GitHubFindFilesTool(),
+            GitHubGrepTool(),
             MongoDBReadTool(),
+            MongoDBReadFieldTool(),
             MongoDBWriteTool(),
             MongoDBUpdateTool(),
             GetUnprocessedSignalsTool(),
@@ -9,23 +9,17 @@ from crewai import Agent, LLM
 from src.tools import (
     GitHubReadTool,
     GitHubPRTool,
+    GitHubBatchPRTool,
     GitHubListFilesTool,
+    GitHubFindFilesTool,
+    GitHubGrepTool,
     MongoDBReadTool,
+    MongoDBReadFieldTool,
     MongoDBWriteTool,
     MongoDBUpdateTool,
     GetPendingTasksTool,
 )
-from src.config.settings import get_settings
-
-
-def get_gemini_llm() -> LLM:
-    """Get configured Gemini LLM for CrewAI."""
-    settings = get_settings()
-    
-    return LLM(
-        model=f"gemini/{settings.GEMINI_MODEL}",
-        api_key=settings.GEMINI_API_KEY,
-    )
+from src.llm import get_gemini_llm
 
 
 def create_engineer_agent(llm: LLM = None) -> Agent:
@@ -38,7 +32,10 @@ def create_engineer_agent(llm: LLM = None) -> Agent:
     Tools:
     - GitHubReadTool: Read current file contents
     - GitHubPRTool: Create branches and PRs
+    - GitHubBatchPRTool: One PR with several patches across files
     - GitHubListFilesTool: Explore codebase
+    - GitHubFindFilesTool: Locate files by glob or name
+    - GitHubGrepTool: Search file contents
     - MongoDBReadTool: Read tasks and issues
     - MongoDBWriteTool: Save PR records
     - MongoDBUpdateTool: Update task/issue status
@@ -91,8 +88,12 @@ def create_engineer_agent(llm: LLM = None) -> Agent:
         tools=[
             GitHubReadTool(),
             GitHubPRTool(),
+            GitHubBatchPRTool(),
             GitHubListFilesTool(),
+            GitHubFindFilesTool(),
+            GitHubGrepTool(),
             MongoDBReadTool(),
+            MongoDBReadFieldTool(),
             MongoDBWriteTool(),
             MongoDBUpdateTool(),
             GetPendingTasksTool(),
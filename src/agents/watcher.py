@@ -11,18 +11,9 @@ from src.tools import (
     PostHogRecordingsTool,
     MongoDBWriteTool,
     MongoDBReadTool,
+    MongoDBReadFieldTool,
 )
-from src.config.settings import get_settings
-
-
-def get_gemini_llm() -> LLM:
-    """Get configured Gemini LLM for CrewAI."""
-    settings = get_settings()
-    
-    return LLM(
-        model=f"gemini/{settings.GEMINI_MODEL}",
-        api_key=settings.GEMINI_API_KEY,
-    )
+from src.llm import get_gemini_llm
 
 
 def create_watcher_agent(llm: LLM = None) -> Agent:
@@ -33,7 +24,7 @@ def create_watcher_agent(llm: LLM = None) -> Agent:
     Goal: Monitor PostHog analytics and detect friction signals
     
     Tools:
-    - PostHogQueryTool: Query for rage clicks, drop-offs, events
+    - PostHogQueryTool: Query for rage clicks, drop-offs, events (or all at once)
     - PostHogRecordingsTool: Fetch session recordings
     - MongoDBWriteTool: Save detected signals
     - MongoDBReadTool: Check existing signals
@@ -72,6 +63,7 @@ def create_watcher_agent(llm: LLM = None) -> Agent:
             PostHogRecordingsTool(),
             MongoDBWriteTool(),
             MongoDBReadTool(),
+            MongoDBReadFieldTool(),
         ],
         llm=llm,
         verbose=True,
@@ -27,6 +27,70 @@ class Settings(BaseSettings):
         default=289987,
         description="PostHog Project ID"
     )
+    POSTHOG_HTTP_POOL_SIZE: int = Field(
+        default=10,
+        description="Pooled keep-alive HTTP connections to the PostHog API"
+    )
+    POSTHOG_TIMEOUT_SECONDS: float = Field(
+        default=30.0,
+        description="Timeout of PostHog REST requests"
+    )
+    POSTHOG_QUERY_TIMEOUT_SECONDS: float = Field(
+        default=60.0,
+        description="Default timeout of a HogQL query (overridable per query)"
+    )
+    POSTHOG_MAX_RETRIES: int = Field(
+        default=3,
+        description="Retries of rate-limited (429) and failed (5xx, reads only) PostHog requests"
+    )
+    POSTHOG_RETRY_BASE_SECONDS: float = Field(
+        default=1.0,
+        description="Base delay of the jittered exponential PostHog retry backoff"
+    )
+    POSTHOG_RETRY_MAX_SECONDS: float = Field(
+        default=30.0,
+        description="Maximum delay between PostHog retries"
+    )
+    POSTHOG_MAX_CONCURRENT_QUERIES: int = Field(
+        default=5,
+        description="HogQL queries in flight at once (batches run up to this many in parallel)"
+    )
+    POSTHOG_INCREMENTAL_ENABLED: bool = Field(
+        default=True,
+        description="Maintain detection aggregates incrementally in MongoDB (see posthog_incremental.py)"
+    )
+    POSTHOG_INCREMENTAL_RETENTION_DAYS: int = Field(
+        default=30,
+        description="Longest window served from incremental aggregates (longer ones query PostHog directly)"
+    )
+    POSTHOG_INGESTION_LAG_SECONDS: int = Field(
+        default=300,
+        description="Most recent events left for the next incremental run (PostHog ingests with a delay)"
+    )
+    POSTHOG_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Cache HogQL query results (see posthog_cache.py)"
+    )
+    POSTHOG_CACHE_DIR: str = Field(
+        default=".darwin_cache/posthog",
+        description="Directory for cached HogQL results (empty keeps them in memory only)"
+    )
+    POSTHOG_CACHE_MEMORY_ENTRIES: int = Field(
+        default=256,
+        description="HogQL results kept in memory"
+    )
+    POSTHOG_CACHE_TTL_RATIO: float = Field(
+        default=0.01,
+        description="Cache TTL as a fraction of the query's lookback window (30 days → 7.2 h before clamping)"
+    )
+    POSTHOG_CACHE_MIN_TTL_SECONDS: float = Field(
+        default=60.0,
+        description="Minimum HogQL cache TTL (also used for queries without an INTERVAL)"
+    )
+    POSTHOG_CACHE_MAX_TTL_SECONDS: float = Field(
+        default=3600.0,
+        description="Maximum HogQL cache TTL"
+    )
     
     # ===================
     # GitHub Configuration
@@ -43,6 +107,74 @@ class Settings(BaseSettings):
         default="Luxora_ReactNative",
         description="Target repository for fixes"
     )
+    GITHUB_API_URL: str = Field(
+        default="https://api.github.com",
+        description="GitHub REST API base URL"
+    )
+    GITHUB_HTTP_POOL_SIZE: int = Field(
+        default=10,
+        description="Pooled HTTP connections to the GitHub API"
+    )
+    GITHUB_ETAG_CACHE_SIZE: int = Field(
+        default=512,
+        description="Cached GET responses revalidated with If-None-Match"
+    )
+    GITHUB_CACHE_DIR: str = Field(
+        default=".darwin_cache",
+        description="Directory for the on-disk file blob cache (empty disables it)"
+    )
+    GITHUB_BLOB_CACHE_MEMORY_MB: int = Field(
+        default=64,
+        description="In-memory file blob cache size"
+    )
+    GITHUB_BLOB_CACHE_DISK_MB: int = Field(
+        default=512,
+        description="On-disk file blob cache size"
+    )
+    GITHUB_REF_CACHE_SECONDS: int = Field(
+        default=30,
+        description="How long a branch → commit SHA resolution is reused for reads"
+    )
+    GITHUB_MAX_RETRIES: int = Field(
+        default=4,
+        description="Retries of rate-limited (403/429) and failed (5xx, reads only) GitHub requests"
+    )
+    GITHUB_RETRY_BASE_SECONDS: float = Field(
+        default=1.0,
+        description="Base delay of the jittered exponential retry backoff"
+    )
+    GITHUB_RETRY_MAX_SECONDS: float = Field(
+        default=60.0,
+        description="Maximum delay between retries (unless GitHub asks for longer)"
+    )
+    GITHUB_RATE_LIMIT_RESERVE: int = Field(
+        default=50,
+        description="Requests of the hourly quota left untouched for other clients of the token"
+    )
+    GITHUB_WRITE_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        description="Minimum spacing between write requests (avoids secondary rate limits)"
+    )
+    GITHUB_MAX_WAIT_SECONDS: float = Field(
+        default=900.0,
+        description="Fail instead of waiting longer than this for the rate limit to reset"
+    )
+    GITHUB_BACKEND: str = Field(
+        default="api",
+        description="Repository backend: api (REST only) or mirror (local bare git mirror; push + PRs via API)"
+    )
+    GITHUB_MIRROR_REMOTE: Optional[str] = Field(
+        default=None,
+        description="Git URL the mirror fetches from and pushes to (defaults to the GitHub HTTPS URL)"
+    )
+    GITHUB_MIRROR_DIR: Optional[str] = Field(
+        default=None,
+        description="Directory of the bare mirror (defaults to GITHUB_CACHE_DIR/mirrors/owner/repo.git)"
+    )
+    GITHUB_MIRROR_FETCH_SECONDS: int = Field(
+        default=60,
+        description="Minimum interval between incremental fetches of the mirror"
+    )
     
     # ===================
     # Gemini Configuration
@@ -55,6 +187,58 @@ class Settings(BaseSettings):
         default="gemini-2.0-flash",
         description="Gemini model to use"
     )
+    LLM_HTTP_POOL_SIZE: int = Field(
+        default=10,
+        description="Pooled keep-alive HTTP connections shared by all LLM calls"
+    )
+    LLM_TIMEOUT_SECONDS: float = Field(
+        default=120.0,
+        description="Timeout of one LLM completion"
+    )
+    LLM_MAX_CONCURRENT_CALLS: int = Field(
+        default=4,
+        description="LLM completions in flight at once per process"
+    )
+    LLM_REQUESTS_PER_MINUTE: float = Field(
+        default=60.0,
+        description="Requests per minute sent to each model (0 disables pacing)"
+    )
+    LLM_MODEL_REQUESTS_PER_MINUTE: str = Field(
+        default="",
+        description="Per-model overrides, e.g. 'gemini/gemini-2.0-flash=15,gemini/gemini-1.5-pro=2'"
+    )
+    LLM_MAX_RETRIES: int = Field(
+        default=3,
+        description="Retries of rate-limited (429) and failed (5xx, timeout) LLM completions"
+    )
+    LLM_RETRY_BASE_SECONDS: float = Field(
+        default=2.0,
+        description="Base delay of the jittered exponential LLM retry backoff"
+    )
+    LLM_RETRY_MAX_SECONDS: float = Field(
+        default=60.0,
+        description="Maximum delay between LLM retries"
+    )
+    LLM_CACHE_MODE: str = Field(
+        default="read_write",
+        description="LLM response cache: read_write, refresh, replay (cache only, for tests) or off"
+    )
+    LLM_CACHE_DIR: str = Field(
+        default=".darwin_cache/llm",
+        description="Directory for cached LLM responses (empty keeps them in memory only)"
+    )
+    LLM_CACHE_TTL_SECONDS: float = Field(
+        default=604800.0,
+        description="How long a cached LLM response is reused (replay mode ignores it)"
+    )
+    LLM_CACHE_MEMORY_ENTRIES: int = Field(
+        default=128,
+        description="LLM responses kept in memory"
+    )
+    LLM_CACHE_MAX_ENTRIES: int = Field(
+        default=5000,
+        description="LLM responses kept on disk (least recently used are evicted)"
+    )
     
     # ===================
     # MongoDB Configuration
@@ -67,6 +251,54 @@ class Settings(BaseSettings):
         default="darwin",
         description="MongoDB database name"
     )
+    MONGODB_MAX_POOL_SIZE: int = Field(
+        default=50,
+        description="Maximum connections per server in the MongoDB pool"
+    )
+    MONGODB_MIN_POOL_SIZE: int = Field(
+        default=5,
+        description="Connections kept open (and warmed at startup) per server"
+    )
+    MONGODB_MAX_IDLE_TIME_MS: int = Field(
+        default=300000,
+        description="Close pooled connections idle for longer than this"
+    )
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = Field(
+        default=5000,
+        description="Max time a request waits for a free pooled connection"
+    )
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = Field(
+        default=5000,
+        description="Max time to find a suitable server before failing"
+    )
+    MONGODB_CONNECT_TIMEOUT_MS: int = Field(
+        default=5000,
+        description="Timeout for establishing a new connection"
+    )
+    MONGODB_SOCKET_TIMEOUT_MS: int = Field(
+        default=30000,
+        description="Timeout for a single read/write on a connection"
+    )
+    MONGODB_COMPRESSORS: str = Field(
+        default="zlib",
+        description="Comma-separated wire compressors (zstd, snappy, zlib)"
+    )
+    MONGODB_STATS_CACHE_SECONDS: int = Field(
+        default=5,
+        description="Seconds to cache collection counts for the stats endpoint"
+    )
+    MONGODB_AUTO_INDEX: bool = Field(
+        default=True,
+        description="Create missing registered indexes at API startup"
+    )
+    MONGODB_AGENT_LOGS_TTL_DAYS: int = Field(
+        default=30,
+        description="Days to keep agent_logs entries (0 = keep forever)"
+    )
+    MONGODB_PRODUCT_METRICS_TTL_DAYS: int = Field(
+        default=90,
+        description="Days to keep product_metrics entries (0 = keep forever)"
+    )
     
     # ===================
     # Darwin Settings
@@ -79,6 +311,94 @@ class Settings(BaseSettings):
         default=False,
         description="Enable debug logging"
     )
+    DARWIN_JOB_MAX_WORKERS: int = Field(
+        default=1,
+        description="Pipeline jobs executed concurrently by the API job runner"
+    )
+    DARWIN_JOB_MAX_QUEUED: int = Field(
+        default=10,
+        description="Maximum queued + running pipeline jobs before new runs are rejected"
+    )
+    DARWIN_JOB_TIMEOUT_SECONDS: int = Field(
+        default=1800,
+        description="Cancel a pipeline job after this many seconds (0 disables)"
+    )
+    DARWIN_JOB_EVENT_BUFFER: int = Field(
+        default=500,
+        description="Progress events kept per job for replay to late SSE subscribers"
+    )
+    DARWIN_PATCH_MIN_CONFIDENCE: float = Field(
+        default=0.85,
+        description="Minimum similarity for applying a fix whose original_code does not match exactly"
+    )
+    DARWIN_TOOL_OUTPUT_FORMAT: str = Field(
+        default="compact",
+        description="Default tool output: compact (columnar JSON, see compact_output.py) or markdown"
+    )
+    DARWIN_TOOL_OUTPUT_TOP_K: int = Field(
+        default=20,
+        description="Rows kept in compact tool output (0 keeps all)"
+    )
+    DARWIN_TOOL_OUTPUT_MAX_FIELD_CHARS: int = Field(
+        default=2000,
+        description="Longest string value in compact tool output (0 disables truncation)"
+    )
+    DARWIN_CONTEXT_CALL_TOKENS: int = Field(
+        default=4000,
+        description="Estimated tokens one tool result may use (see context_budget.py)"
+    )
+    DARWIN_CONTEXT_TASK_TOKENS: int = Field(
+        default=60000,
+        description="Estimated tokens of tool results per task before results shrink (0 = no task budget)"
+    )
+    DARWIN_CONTEXT_MIN_CALL_TOKENS: int = Field(
+        default=500,
+        description="Tokens a tool result may always use, even with the task budget spent"
+    )
+    DARWIN_CONTEXT_FIELD_TOKENS: int = Field(
+        default=300,
+        description="Document fields longer than this are elided with a mongodb_read_field handle (0 = never)"
+    )
+    
+    # ===================
+    # Signal Detection
+    # ===================
+    SIGNAL_DETECTION_MODE: str = Field(
+        default="rules",
+        description="rules: detect signals with the rule-based detector; agent: let the Watcher LLM detect them"
+    )
+    SIGNAL_DETECTION_DAYS: int = Field(
+        default=7,
+        description="Lookback window of rule-based detection"
+    )
+    SIGNAL_RAGE_CLICK_MIN: int = Field(
+        default=5,
+        description="Rage clicks on a page element before it becomes a signal"
+    )
+    SIGNAL_MIN_AFFECTED_USERS: int = Field(
+        default=3,
+        description="Users that must be affected before anything becomes a signal"
+    )
+    SIGNAL_DROP_OFF_RATIO: float = Field(
+        default=0.5,
+        description="Share of users lost between two funnel steps that counts as a drop-off"
+    )
+    SIGNAL_MIN_FUNNEL_USERS: int = Field(
+        default=20,
+        description="Users entering a funnel step before its drop-off is judged"
+    )
+    SIGNAL_ERROR_RECENT_HOURS: int = Field(
+        default=24,
+        description="Recent window compared against the rest of the lookback for error spikes"
+    )
+    SIGNAL_ERROR_SPIKE_RATIO: float = Field(
+        default=3.0,
+        description="Recent error rate over baseline error rate (per hour) that counts as a spike"
+    )
+    SIGNAL_ERROR_MIN_COUNT: int = Field(
+        default=5,
+        description="Errors on a page in the recent window before a spike is reported"
+    )
     
     # ===================
     # Darwin API Settings
@@ -11,6 +11,7 @@ from .darwin_crew import (
     run_analysis_only,
     run_engineer_only,
 )
+from .pipeline import execute_pipeline
 
 
 __all__ = [
@@ -19,4 +20,5 @@ __all__ = [
     "run_full_pipeline",
     "run_analysis_only",
     "run_engineer_only",
+    "execute_pipeline",
 ]
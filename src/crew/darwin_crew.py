@@ -5,25 +5,32 @@ Main crew that orchestrates Watcher → Analyst → Engineer pipeline.
 """
 
 from crewai import Crew, Process
-from typing import Optional, Literal
+from typing import Optional, Literal, Callable, Any
 
 from src.agents import (
     create_watcher_agent,
     create_analyst_agent,
     create_engineer_agent,
-    get_gemini_llm,
 )
+from src.llm import get_gemini_llm
 from src.tasks import (
     create_detect_signals_task,
     create_analyze_issues_task,
     create_fix_and_pr_task,
 )
 from src.config.settings import get_settings
+from src.tools.progress import ProgressCallback, progress_reporter
+from src.tools.context_budget import ContextBudget, context_budget
+from src.tools.signal_detector import detect_signals, format_detection_report
+from .progress import CrewProgress
 
 
 def create_darwin_crew(
     mode: Literal["full", "analyze", "engineer"] = "full",
     verbose: bool = True,
+    step_callback: Optional[Callable[[Any], None]] = None,
+    task_callback: Optional[Callable[[Any], None]] = None,
+    detection_report: Optional[str] = None,
 ) -> Crew:
     """
     Create the Darwin crew with all agents and tasks.
@@ -36,6 +43,10 @@ def create_darwin_crew(
     Args:
         mode: Pipeline mode to run
         verbose: Enable verbose output
+        step_callback: Called after every agent step (may raise to abort the run)
+        task_callback: Called after every completed task
+        detection_report: Signals already found by the rule-based detector;
+            the Watcher then only summarizes them
     
     Returns:
         Configured Crew ready to kickoff
@@ -55,7 +66,7 @@ def create_darwin_crew(
         analyst = create_analyst_agent(llm)
         engineer = create_engineer_agent(llm)
         
-        task1 = create_detect_signals_task(watcher)
+        task1 = create_detect_signals_task(watcher, detection_report)
         task2 = create_analyze_issues_task(analyst, context_tasks=[task1])
         task3 = create_fix_and_pr_task(engineer, context_tasks=[task2])
         
@@ -68,7 +79,7 @@ def create_darwin_crew(
         watcher = create_watcher_agent(llm)
         analyst = create_analyst_agent(llm)
         
-        task1 = create_detect_signals_task(watcher)
+        task1 = create_detect_signals_task(watcher, detection_report)
         task2 = create_analyze_issues_task(analyst, context_tasks=[task1])
         
         agents = [watcher, analyst]
@@ -82,6 +93,13 @@ def create_darwin_crew(
         agents = [engineer]
         tasks = [task3]
     
+    # Optional progress/cancellation hooks (used by the API job runner)
+    callbacks = {}
+    if step_callback:
+        callbacks["step_callback"] = step_callback
+    if task_callback:
+        callbacks["task_callback"] = task_callback
+    
     # Create and return the crew
     crew = Crew(
         agents=agents,
@@ -90,6 +108,7 @@ def create_darwin_crew(
         verbose=verbose,
         memory=False,  # Disable memory for simpler execution
         full_output=True,  # Get detailed output
+        **callbacks,
     )
     
     return crew
@@ -98,6 +117,9 @@ def create_darwin_crew(
 def run_darwin(
     mode: Literal["full", "analyze", "engineer"] = "full",
     verbose: bool = True,
+    step_callback: Optional[Callable[[Any], None]] = None,
+    task_callback: Optional[Callable[[Any], None]] = None,
+    on_event: Optional[ProgressCallback] = None,
 ) -> dict:
     """
     Run the Darwin pipeline.
@@ -105,6 +127,9 @@ def run_darwin(
     Args:
         mode: Pipeline mode (full, analyze, engineer)
         verbose: Enable verbose output
+        step_callback: Called after every agent step
+        task_callback: Called after every completed task
+        on_event: Receives structured progress events (event_type, data)
     
     Returns:
         Dictionary with execution results
@@ -130,9 +155,31 @@ def run_darwin(
     console.print()
     
     try:
+        # Rule-based detection: signals are found without the LLM
+        detection = None
+        if mode in ("full", "analyze") and get_settings().SIGNAL_DETECTION_MODE == "rules":
+            detection = _run_detection(console, on_event)
+        
         # Create crew
         console.print("[yellow]Creating Darwin crew...[/yellow]")
-        crew = create_darwin_crew(mode=mode, verbose=verbose)
+        progress = CrewProgress(on_event, step_callback, task_callback) if on_event else None
+        
+        # Tool results are budgeted per task: start a new budget after each one
+        budget = ContextBudget.from_settings()
+        on_task = progress.task_callback if progress else task_callback
+        
+        def budgeted_task_callback(output: Any) -> None:
+            budget.next_task()
+            if on_task:
+                on_task(output)
+        
+        crew = create_darwin_crew(
+            mode=mode,
+            verbose=verbose,
+            step_callback=progress.step_callback if progress else step_callback,
+            task_callback=budgeted_task_callback,
+            detection_report=format_detection_report(detection) if detection else None,
+        )
         console.print(f"[green]✅ Crew created with {len(crew.agents)} agent(s) and {len(crew.tasks)} task(s)[/green]")
         console.print()
         
@@ -140,7 +187,10 @@ def run_darwin(
         console.print("[yellow]🚀 Starting Darwin pipeline...[/yellow]")
         console.print("-" * 50)
         
-        result = crew.kickoff()
+        if progress:
+            progress.start(crew.tasks)
+        with progress_reporter(on_event), context_budget(budget):
+            result = crew.kickoff()
         
         console.print("-" * 50)
         console.print()
@@ -152,6 +202,8 @@ def run_darwin(
             "result": result,
             "agents_used": len(crew.agents),
             "tasks_completed": len(crew.tasks),
+            "signals_detected": len(detection["signals"]) if detection else None,
+            "context": budget.get_stats(),
         }
         
     except Exception as e:
@@ -163,6 +215,34 @@ def run_darwin(
         }
 
 
+def _run_detection(console, on_event: Optional[ProgressCallback]) -> Optional[dict]:
+    """
+    Run the rule-based signal detector before the crew.
+    
+    Returns:
+        Detection report, or None to let the Watcher detect signals itself
+    """
+    console.print("[yellow]🔎 Detecting signals (rule-based)...[/yellow]")
+    try:
+        report = detect_signals()
+    except Exception as e:
+        console.print(f"[red]⚠️ Rule-based detection failed, the Watcher will detect signals: {str(e)}[/red]")
+        return None
+    
+    console.print(
+        f"[green]✅ {len(report['signals'])} signal(s) detected in {report['duration_seconds']}s "
+        f"({report['inserted']} new, {report['updated']} updated)[/green]"
+    )
+    if on_event:
+        on_event("signals_detected", {
+            "count": len(report["signals"]),
+            "inserted": report["inserted"],
+            "updated": report["updated"],
+            "duration_seconds": report["duration_seconds"],
+        })
+    return report
+
+
 # Convenience functions for specific modes
 def run_full_pipeline(verbose: bool = True) -> dict:
     """Run the complete Darwin pipeline."""
@@ -0,0 +1,360 @@
+"""
+Darwin Multi-Agent System - Pipeline Execution
+==============================================
+Runs a Darwin crew and records its outcome: agent logs, insights and
+product metrics. Shared by the CLI (`scripts/run_darwin.py`) and the
+API job runner.
+"""
+
+from typing import Optional, Callable, Any
+
+from src.tools.github_client import get_github_client
+from src.tools.posthog_client import get_posthog_client
+from src.llm import get_llm_cache, get_llm_provider
+from src.tools.progress import ProgressCallback
+from .darwin_crew import run_darwin
+
+
+def execute_pipeline(
+    mode: str,
+    verbose: bool = True,
+    step_callback: Optional[Callable[[Any], None]] = None,
+    task_callback: Optional[Callable[[Any], None]] = None,
+    on_event: Optional[ProgressCallback] = None,
+) -> dict:
+    """
+    Run the Darwin pipeline and persist its logs, insights and metrics.
+    
+    Args:
+        mode: Pipeline mode (full, analyze, engineer)
+        verbose: Enable verbose crew output
+        step_callback: Called after every agent step
+        task_callback: Called after every completed task
+        on_event: Receives structured progress events (event_type, data)
+    
+    Returns:
+        Result dictionary from run_darwin()
+    """
+    from src.db import log_agent_action
+    
+    # Log pipeline start
+    log_agent_action(
+        agent_name="Darwin Pipeline",
+        action="pipeline_started",
+        details={"mode": mode, "verbose": verbose},
+        status="started"
+    )
+    
+    github_before = get_github_client().scheduler.get_stats()
+    posthog_before = get_posthog_client().get_stats()
+    llm_before = _llm_stats()
+    
+    result = run_darwin(
+        mode=mode,
+        verbose=verbose,
+        step_callback=step_callback,
+        task_callback=task_callback,
+        on_event=on_event,
+    )
+    
+    if result.get("success"):
+        # Log success
+        log_agent_action(
+            agent_name="Darwin Pipeline",
+            action="pipeline_completed",
+            details={
+                "mode": result.get('mode'),
+                "agents_used": result.get('agents_used'),
+                "tasks_completed": result.get('tasks_completed')
+            },
+            status="success"
+        )
+        
+        # Save insights based on mode
+        if mode == "analyze":
+            _save_analysis_insights()
+        elif mode == "engineer":
+            _save_engineering_insights()
+        
+        # Save product metrics
+        _save_pipeline_metrics(mode, result, github_before, posthog_before, llm_before)
+    else:
+        # Log failure
+        log_agent_action(
+            agent_name="Darwin Pipeline",
+            action="pipeline_failed",
+            details={"mode": mode, "error": result.get('error', 'Unknown')},
+            status="failed"
+        )
+    
+    return result
+
+
+def _save_analysis_insights():
+    """Save insights after analysis mode."""
+    from src.db import save_insight, find_many, create_task
+    
+    # Count signals by type
+    signals = find_many("signals", {}, limit=100)
+    signal_types = {}
+    for sig in signals:
+        sig_type = sig.get("type", "unknown")
+        signal_types[sig_type] = signal_types.get(sig_type, 0) + 1
+    
+    if signal_types:
+        save_insight(
+            insight_type="signal_distribution",
+            title="Friction Signal Distribution",
+            description=f"Distribution of {len(signals)} detected friction signals by type",
+            data={"signal_counts": signal_types, "total_signals": len(signals)},
+            severity="info"
+        )
+    
+    # Count issues by priority
+    issues = find_many("ux_issues", {}, limit=100)
+    priority_counts = {}
+    for issue in issues:
+        priority = issue.get("priority", "unknown")
+        priority_counts[priority] = priority_counts.get(priority, 0) + 1
+    
+    if priority_counts:
+        save_insight(
+            insight_type="issue_priority_distribution",
+            title="UX Issue Priority Distribution",
+            description=f"Distribution of {len(issues)} UX issues by priority",
+            data={"priority_counts": priority_counts, "total_issues": len(issues)},
+            severity="info"
+        )
+    
+    # High severity insight
+    high_priority = priority_counts.get("high", 0) + priority_counts.get("critical", 0)
+    if high_priority > 0:
+        save_insight(
+            insight_type="high_priority_alert",
+            title=f"{high_priority} High Priority Issues Detected",
+            description="These issues should be addressed immediately to improve user experience",
+            data={"high_priority_count": high_priority},
+            severity="warning"
+        )
+    
+    # Create tasks for diagnosed issues
+    diagnosed_issues = find_many("ux_issues", {"status": "diagnosed"}, limit=50)
+    for issue in diagnosed_issues:
+        create_task(
+            task_type="review_fix",
+            title=f"Review: {issue.get('title', 'Untitled')[:50]}",
+            description="Review and approve the recommended fix for this UX issue",
+            priority=issue.get("priority", "medium"),
+            assigned_agent="Human Reviewer",
+            related_issue_id=issue.get("_id")
+        )
+    
+    # Create tasks for approved issues waiting for PR
+    approved_issues = find_many("ux_issues", {"status": "approved"}, limit=50)
+    for issue in approved_issues:
+        create_task(
+            task_type="create_pr",
+            title=f"Create PR: {issue.get('title', 'Untitled')[:50]}",
+            description="Create a GitHub Pull Request for this approved fix",
+            priority="high",
+            assigned_agent="Engineer Agent",
+            related_issue_id=issue.get("_id")
+        )
+
+
+def _save_engineering_insights():
+    """Save insights after engineering mode."""
+    from src.db import save_insight, find_many, save_code_fix
+    
+    # Get recent PRs
+    prs = find_many("pull_requests", {}, limit=10)
+    
+    if prs:
+        save_insight(
+            insight_type="pr_activity",
+            title=f"{len(prs)} Pull Requests Created",
+            description="Darwin has automatically generated code fixes",
+            data={
+                "pr_count": len(prs),
+                "pr_urls": [pr.get("pr_url") for pr in prs]
+            },
+            severity="info"
+        )
+    
+    # Save code fixes from issues that have PRs
+    issues_with_prs = find_many("ux_issues", {"status": "pr_created"}, limit=50)
+    for issue in issues_with_prs:
+        rec_fix = issue.get("recommended_fix", {})
+        if isinstance(rec_fix, list):
+            rec_fix = rec_fix[0] if rec_fix else {}
+        
+        if rec_fix.get("original_code") and rec_fix.get("suggested_code"):
+            save_code_fix(
+                issue_id=issue.get("_id"),
+                file_path=rec_fix.get("file_path", issue.get("file_path", "unknown")),
+                original_code=rec_fix.get("original_code", ""),
+                fixed_code=rec_fix.get("suggested_code", ""),
+                fix_type=issue.get("root_cause", "ux_improvement")[:50],
+                pr_number=None  # Would need to link from pull_requests
+            )
+
+
+def _llm_stats() -> dict:
+    return {"cache": get_llm_cache().get_stats(), "provider": get_llm_provider().get_stats()}
+
+
+def _posthog_cache_hits(stats: dict) -> int:
+    cache = stats.get("cache")
+    return cache["memory_hits"] + cache["disk_hits"] if cache else 0
+
+
+def _save_pipeline_metrics(
+    mode: str,
+    result: dict,
+    github_before: dict,
+    posthog_before: dict,
+    llm_before: dict,
+):
+    """Save product metrics after pipeline run."""
+    from src.db import save_product_metric, count
+    
+    # GitHub API usage of this run (scheduler counters are process-wide)
+    github_after = get_github_client().scheduler.get_stats()
+    for metric_name, key, unit in [
+        ("github_requests", "requests", "count"),
+        ("github_retries", "retries", "count"),
+        ("github_rate_limited", "rate_limited", "count"),
+        ("github_rate_limit_wait", "wait_seconds", "seconds"),
+    ]:
+        save_product_metric(
+            metric_name=metric_name,
+            value=round(github_after[key] - github_before[key], 3),
+            unit=unit,
+            dimensions={"mode": mode}
+        )
+    
+    # PostHog queries sent vs. answered from the HogQL cache
+    posthog_after = get_posthog_client().get_stats()
+    for metric_name, value in [
+        ("posthog_queries", posthog_after["queries"] - posthog_before["queries"]),
+        ("posthog_cache_hits", _posthog_cache_hits(posthog_after) - _posthog_cache_hits(posthog_before)),
+    ]:
+        save_product_metric(
+            metric_name=metric_name,
+            value=value,
+            unit="count",
+            dimensions={"mode": mode}
+        )
+    
+    # LLM calls answered from the response cache
+    llm_after = _llm_stats()
+    cache_before, cache_after = llm_before["cache"], llm_after["cache"]
+    hits = cache_after["hits"] - cache_before["hits"]
+    calls = hits + (cache_after["misses"] - cache_before["misses"]) + (cache_after["bypassed"] - cache_before["bypassed"])
+    for metric_name, value, unit in [
+        ("llm_calls", calls, "count"),
+        ("llm_cache_hits", hits, "count"),
+        ("llm_cache_hit_rate", round(hits / calls, 3) if calls else 0.0, "ratio"),
+    ]:
+        save_product_metric(
+            metric_name=metric_name,
+            value=value,
+            unit=unit,
+            dimensions={"mode": mode, "cache_mode": cache_after["mode"]}
+        )
+    
+    # Completions sent to the model by the LLM provider
+    provider_before, provider_after = llm_before["provider"], llm_after["provider"]
+    requests = provider_after["calls"] - provider_before["calls"]
+    latency = provider_after["latency_seconds"] - provider_before["latency_seconds"]
+    for metric_name, value, unit in [
+        ("llm_requests", requests, "count"),
+        ("llm_avg_latency", round(latency / requests, 3) if requests else 0.0, "seconds"),
+        ("llm_prompt_tokens", provider_after["prompt_tokens"] - provider_before["prompt_tokens"], "tokens"),
+        ("llm_completion_tokens", provider_after["completion_tokens"] - provider_before["completion_tokens"], "tokens"),
+        ("llm_retries", provider_after["retries"] - provider_before["retries"], "count"),
+        ("llm_throttle_wait", round(provider_after["throttle_wait_seconds"] - provider_before["throttle_wait_seconds"], 3), "seconds"),
+    ]:
+        save_product_metric(
+            metric_name=metric_name,
+            value=value,
+            unit=unit,
+            dimensions={"mode": mode}
+        )
+    
+    # Signals found by the rule-based detector
+    if result.get("signals_detected") is not None:
+        save_product_metric(
+            metric_name="signals_detected",
+            value=result["signals_detected"],
+            unit="count",
+            dimensions={"mode": mode, "detector": "rules"}
+        )
+    
+    # Tool output sent to the agents (context budget)
+    context = result.get("context")
+    if context:
+        save_product_metric(
+            metric_name="tool_output_tokens",
+            value=context["tokens"],
+            unit="tokens",
+            dimensions={"mode": mode, "tool_calls": context["calls"]}
+        )
+        save_product_metric(
+            metric_name="tool_outputs_trimmed",
+            value=context["trimmed_calls"],
+            unit="count",
+            dimensions={"mode": mode}
+        )
+        save_product_metric(
+            metric_name="tool_fields_elided",
+            value=context["elided_fields"],
+            unit="count",
+            dimensions={"mode": mode}
+        )
+    
+    # Pipeline execution metric
+    save_product_metric(
+        metric_name="pipeline_execution",
+        value=1,
+        unit="count",
+        dimensions={"mode": mode, "success": result.get("success", False)}
+    )
+    
+    # Collection counts
+    save_product_metric(
+        metric_name="total_signals",
+        value=count("signals", {}),
+        unit="count",
+        dimensions={"collection": "signals"}
+    )
+    
+    save_product_metric(
+        metric_name="total_ux_issues",
+        value=count("ux_issues", {}),
+        unit="count",
+        dimensions={"collection": "ux_issues"}
+    )
+    
+    save_product_metric(
+        metric_name="total_pull_requests",
+        value=count("pull_requests", {}),
+        unit="count",
+        dimensions={"collection": "pull_requests"}
+    )
+    
+    # Issues by status
+    from src.db import find_many
+    issues = find_many("ux_issues", {}, limit=1000)
+    status_counts = {}
+    for issue in issues:
+        status = issue.get("status", "unknown")
+        status_counts[status] = status_counts.get(status, 0) + 1
+    
+    for status, cnt in status_counts.items():
+        save_product_metric(
+            metric_name=f"issues_{status}",
+            value=cnt,
+            unit="count",
+            dimensions={"status": status}
+        )
@@ -0,0 +1,110 @@
+"""
+Darwin Multi-Agent System - Crew Progress Events
+================================================
+Turns CrewAI step and task callbacks into structured progress events:
+agent started, agent step, task finished.
+
+Tool calls and document writes are reported by the tools themselves
+(see `src.tools.progress`) through the same event callback.
+"""
+
+from typing import Optional, Callable, Any, List
+
+from src.tools.progress import ProgressCallback
+
+
+# Longest free-text value (thoughts, task descriptions) included in an event
+_PREVIEW_CHARS = 200
+
+
+def _preview(text: Any) -> Optional[str]:
+    """Shorten free text for event payloads."""
+    if text is None:
+        return None
+    text = str(text).strip()
+    return text[:_PREVIEW_CHARS] + "…" if len(text) > _PREVIEW_CHARS else text
+
+
+class CrewProgress:
+    """
+    Emit progress events for a sequential crew run.
+
+    Wraps optional raw step/task callbacks, which are still invoked
+    after each event (and may raise to abort the run).
+    """
+
+    def __init__(
+        self,
+        on_event: ProgressCallback,
+        step_callback: Optional[Callable[[Any], None]] = None,
+        task_callback: Optional[Callable[[Any], None]] = None,
+    ):
+        self.on_event = on_event
+        self._step_callback = step_callback
+        self._task_callback = task_callback
+        self._tasks: List[Any] = []
+        self._index = 0
+
+    def _emit(self, event_type: str, **data: Any) -> None:
+        try:
+            self.on_event(event_type, data)
+        except Exception:
+            pass
+
+    def _agent_role(self, index: int) -> Optional[str]:
+        if 0 <= index < len(self._tasks):
+            agent = getattr(self._tasks[index], "agent", None)
+            return getattr(agent, "role", None)
+        return None
+
+    def _agent_started(self) -> None:
+        if self._index < len(self._tasks):
+            task = self._tasks[self._index]
+            self._emit(
+                "agent_started",
+                agent=self._agent_role(self._index),
+                task_index=self._index,
+                task=_preview(getattr(task, "name", None) or getattr(task, "description", None)),
+            )
+
+    def start(self, tasks: List[Any]) -> None:
+        """Bind the crew's tasks (in execution order) and announce the first agent."""
+        self._tasks = list(tasks)
+        self._index = 0
+        self._agent_started()
+
+    def step_callback(self, step: Any) -> None:
+        """Crew step callback: report the agent's action, then chain."""
+        steps = step if isinstance(step, list) else [step]
+        for item in steps:
+            # Older CrewAI versions pass (AgentAction, observation) tuples
+            action = item[0] if isinstance(item, tuple) and item else item
+            tool = getattr(action, "tool", None)
+            self._emit(
+                "agent_step",
+                agent=self._agent_role(self._index),
+                task_index=self._index,
+                tool=tool,
+                final=tool is None and hasattr(action, "output"),
+                thought=_preview(getattr(action, "thought", None)),
+            )
+
+        if self._step_callback:
+            self._step_callback(step)
+
+    def task_callback(self, output: Any) -> None:
+        """Crew task callback: report the finished task, announce the next agent, then chain."""
+        raw = getattr(output, "raw", None)
+        self._emit(
+            "task_finished",
+            agent=getattr(output, "agent", None) or self._agent_role(self._index),
+            task_index=self._index,
+            task=_preview(getattr(output, "name", None) or getattr(output, "description", None)),
+            output_chars=len(raw) if isinstance(raw, str) else None,
+        )
+
+        self._index += 1
+        self._agent_started()
+
+        if self._task_callback:
+            self._task_callback(output)
@@ -7,10 +7,13 @@ MongoDB client and helpers.
 from .mongodb import (
     # Connection
     get_client,
+    get_client_options,
+    warm_up_pool,
+    close_client,
+    get_pool_stats,
     get_database,
     get_collection,
     test_connection,
-    get_stats,
     # Collection shortcuts
     signals_collection,
     ux_issues_collection,
@@ -20,6 +23,7 @@ from .mongodb import (
     code_fixes_collection,
     insights_collection,
     product_metrics_collection,
+    pipeline_jobs_collection,
     # Serialization
     serialize_doc,
     serialize_docs,
@@ -34,6 +38,7 @@ from .mongodb import (
     delete_one,
     delete_by_id,
     count,
+    aggregate,
     # Specialized queries
     get_unprocessed_signals,
     get_pending_tasks,
@@ -46,12 +51,51 @@ from .mongodb import (
     create_task,
 )
 
+from .stats import (
+    get_stats,
+    clear_stats_cache,
+)
+
+from .aggregations import (
+    count_by,
+    dashboard_breakdowns,
+)
+
+from .joins import (
+    fetch_related,
+    attach_related,
+    attach_pull_requests,
+    attach_ux_issues,
+)
+
+from .pagination import (
+    find_page,
+    parse_fields,
+    encode_cursor,
+    decode_cursor,
+)
+
+from .indexes import (
+    INDEX_REGISTRY,
+    ensure_indexes,
+    check_index_drift,
+    has_drift,
+)
+
+# Async mirror of the CRUD and page helpers, used by the API routes
+from . import async_mongodb
+
 __all__ = [
     "get_client",
+    "get_client_options",
+    "warm_up_pool",
+    "close_client",
+    "get_pool_stats",
     "get_database",
     "get_collection",
     "test_connection",
     "get_stats",
+    "clear_stats_cache",
     "signals_collection",
     "ux_issues_collection",
     "tasks_collection",
@@ -60,6 +104,7 @@ __all__ = [
     "code_fixes_collection",
     "insights_collection",
     "product_metrics_collection",
+    "pipeline_jobs_collection",
     "serialize_doc",
     "serialize_docs",
     "to_object_id",
@@ -72,6 +117,7 @@ __all__ = [
     "delete_one",
     "delete_by_id",
     "count",
+    "aggregate",
     "get_unprocessed_signals",
     "get_pending_tasks",
     "get_issues_for_review",
@@ -80,4 +126,19 @@ __all__ = [
     "save_insight",
     "save_product_metric",
     "create_task",
+    "count_by",
+    "dashboard_breakdowns",
+    "fetch_related",
+    "attach_related",
+    "attach_pull_requests",
+    "attach_ux_issues",
+    "find_page",
+    "parse_fields",
+    "encode_cursor",
+    "decode_cursor",
+    "INDEX_REGISTRY",
+    "ensure_indexes",
+    "check_index_drift",
+    "has_drift",
+    "async_mongodb",
 ]
@@ -0,0 +1,130 @@
+"""
+Darwin Multi-Agent System - Aggregations
+========================================
+Server-side breakdowns for the dashboard and summary endpoints.
+
+Each helper is split into a pipeline builder and a result shaper so the
+same pipelines can run on any client; the public functions execute them
+in a single round trip with exact counts at any collection size.
+"""
+
+from typing import Dict, List, Any, Optional
+
+from .mongodb import aggregate
+
+
+# Keys reported (as zero when absent) by the dashboard breakdowns
+SIGNAL_SEVERITIES = ["critical", "high", "medium", "low"]
+ISSUE_STATUSES = ["diagnosed", "approved", "rejected", "pr_created"]
+PR_STATUSES = ["open", "merged", "closed"]
+
+
+def _key(value: Any) -> str:
+    """Turn a group key into a dict key; missing values become 'unknown'."""
+    if value is None:
+        return "unknown"
+    return value if isinstance(value, str) else str(value)
+
+
+def shape_counts(
+    rows: List[Dict[str, Any]],
+    keys: Optional[List[str]] = None,
+    include_other: bool = True,
+) -> Dict[str, int]:
+    """
+    Convert `{_id, count}` group results into a `{value: count}` dict.
+
+    Args:
+        rows: Output of a count pipeline
+        keys: Keys always present in the result (zero when absent)
+        include_other: Keep values that are not listed in `keys`
+    """
+    counts = {key: 0 for key in keys or []}
+    for row in rows:
+        key = _key(row.get("_id"))
+        if key in counts or include_other:
+            counts[key] = counts.get(key, 0) + row.get("count", 0)
+    return counts
+
+
+# ===================
+# Count By Field
+# ===================
+
+def count_by_pipeline(field: str, query: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Build a pipeline counting documents per value of `field`."""
+    pipeline = []
+    if query:
+        pipeline.append({"$match": query})
+    pipeline.append({"$group": {"_id": f"${field}", "count": {"$sum": 1}}})
+    return pipeline
+
+
+def count_by(
+    collection_name: str,
+    field: str,
+    query: Optional[Dict[str, Any]] = None,
+    keys: Optional[List[str]] = None,
+    include_other: bool = True,
+) -> Dict[str, int]:
+    """Count documents in a collection grouped by a field."""
+    rows = aggregate(collection_name, count_by_pipeline(field, query))
+    return shape_counts(rows, keys, include_other)
+
+
+# ===================
+# Dashboard Breakdowns
+# ===================
+
+def dashboard_breakdowns_pipeline() -> List[Dict[str, Any]]:
+    """
+    Build one pipeline (run on `signals`) covering all dashboard breakdowns.
+
+    Signals, UX issues and pull requests are projected down to their
+    breakdown key and unioned, then grouped once by (collection, key).
+    """
+    return [
+        {"$project": {
+            "_id": 0,
+            "c": {"$literal": "signals"},
+            "k": "$severity",
+            "p": {"$ifNull": ["$processed", False]},
+        }},
+        {"$unionWith": {
+            "coll": "ux_issues",
+            "pipeline": [{"$project": {"_id": 0, "c": {"$literal": "ux_issues"}, "k": "$status"}}],
+        }},
+        {"$unionWith": {
+            "coll": "pull_requests",
+            "pipeline": [{"$project": {"_id": 0, "c": {"$literal": "pull_requests"}, "k": "$status"}}],
+        }},
+        {"$group": {
+            "_id": {"c": "$c", "k": "$k"},
+            "count": {"$sum": 1},
+            "unprocessed": {"$sum": {"$cond": [{"$eq": ["$p", True]}, 0, 1]}},
+        }},
+    ]
+
+
+def shape_dashboard_breakdowns(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert dashboard pipeline output into per-collection breakdowns."""
+    grouped = {"signals": [], "ux_issues": [], "pull_requests": []}
+    signals_unprocessed = 0
+
+    for row in rows:
+        collection = row["_id"].get("c")
+        grouped[collection].append({"_id": row["_id"].get("k"), "count": row["count"]})
+        if collection == "signals":
+            signals_unprocessed += row.get("unprocessed", 0)
+
+    return {
+        "signals_by_severity": shape_counts(grouped["signals"], SIGNAL_SEVERITIES, include_other=False),
+        "issues_by_status": shape_counts(grouped["ux_issues"], ISSUE_STATUSES, include_other=False),
+        "prs_by_status": shape_counts(grouped["pull_requests"], PR_STATUSES, include_other=False),
+        "signals_unprocessed": signals_unprocessed,
+    }
+
+
+def dashboard_breakdowns() -> Dict[str, Any]:
+    """Get signal, issue and PR breakdowns for the dashboard in one query."""
+    return shape_dashboard_breakdowns(aggregate("signals", dashboard_breakdowns_pipeline()))
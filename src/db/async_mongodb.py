@@ -0,0 +1,225 @@
+"""
+Darwin Multi-Agent System - Async MongoDB Client
+================================================
+Non-blocking data access for the FastAPI routes, built on pymongo's
+native AsyncMongoClient.
+
+Mirrors the CRUD API of `src.db.mongodb` (same names, same return
+shapes) and the page/aggregation/join helpers, reusing their pipeline
+builders so sync and async callers run identical queries.
+"""
+
+from typing import Optional, List, Dict, Any, Tuple
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
+from bson import ObjectId
+
+from src.config.settings import get_settings
+from .mongodb import get_client_options, serialize_doc, serialize_docs
+from .pagination import PAGE_SORT, page_query, finish_page
+from .aggregations import (
+    count_by_pipeline,
+    shape_counts,
+    dashboard_breakdowns_pipeline,
+    shape_dashboard_breakdowns,
+)
+from .joins import (
+    PR_LINK_FIELDS,
+    related_values,
+    related_query,
+    related_projection,
+    index_related,
+    apply_pull_request_links,
+)
+
+
+# Global async client instance (bound to the API's event loop)
+_client: Optional[AsyncMongoClient] = None
+_db: Optional[AsyncDatabase] = None
+
+
+def get_client() -> AsyncMongoClient:
+    """Get or create the pooled async MongoDB client."""
+    global _client
+    if _client is None:
+        settings = get_settings()
+        _client = AsyncMongoClient(settings.MONGODB_URI, **get_client_options())
+    return _client
+
+
+def get_database() -> AsyncDatabase:
+    """Get the Darwin database."""
+    global _db
+    if _db is None:
+        settings = get_settings()
+        _db = get_client()[settings.MONGODB_DATABASE]
+    return _db
+
+
+def get_collection(name: str) -> AsyncCollection:
+    """Get a collection by name."""
+    return get_database()[name]
+
+
+async def warm_up_pool() -> bool:
+    """Open the async pool ahead of the first request."""
+    try:
+        await get_client().admin.command("ping")
+        return True
+    except Exception:
+        return False
+
+
+async def close_client() -> None:
+    """Close the async client and release its pooled connections."""
+    global _client, _db
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _db = None
+
+
+# ===================
+# CRUD Operations
+# ===================
+
+async def insert_one(collection_name: str, document: Dict[str, Any]) -> str:
+    """Insert a document and return its ID."""
+    result = await get_collection(collection_name).insert_one(document)
+    return str(result.inserted_id)
+
+
+async def find_one(collection_name: str, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Find a single document."""
+    doc = await get_collection(collection_name).find_one(query)
+    return serialize_doc(doc) if doc else None
+
+
+async def find_by_id(collection_name: str, doc_id: str) -> Optional[Dict[str, Any]]:
+    """Find a document by its ID."""
+    return await find_one(collection_name, {"_id": ObjectId(doc_id)})
+
+
+async def find_many(
+    collection_name: str,
+    query: Dict[str, Any],
+    limit: int = 100,
+    sort: Optional[List[tuple]] = None,
+    projection: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Find multiple documents (limit=0 returns all matches)."""
+    cursor = get_collection(collection_name).find(query, projection)
+
+    if sort:
+        cursor = cursor.sort(sort)
+
+    cursor = cursor.limit(limit)
+    return serialize_docs(await cursor.to_list())
+
+
+async def update_one(
+    collection_name: str,
+    query: Dict[str, Any],
+    update: Dict[str, Any],
+    upsert: bool = False
+) -> bool:
+    """Update a single document."""
+    result = await get_collection(collection_name).update_one(query, {"$set": update}, upsert=upsert)
+    return result.modified_count > 0 or result.upserted_id is not None
+
+
+async def update_by_id(collection_name: str, doc_id: str, update: Dict[str, Any]) -> bool:
+    """Update a document by its ID."""
+    return await update_one(collection_name, {"_id": ObjectId(doc_id)}, update)
+
+
+async def delete_one(collection_name: str, query: Dict[str, Any]) -> bool:
+    """Delete a single document."""
+    result = await get_collection(collection_name).delete_one(query)
+    return result.deleted_count > 0
+
+
+async def delete_by_id(collection_name: str, doc_id: str) -> bool:
+    """Delete a document by its ID."""
+    return await delete_one(collection_name, {"_id": ObjectId(doc_id)})
+
+
+async def count(collection_name: str, query: Dict[str, Any] = None) -> int:
+    """Count documents matching a query."""
+    return await get_collection(collection_name).count_documents(query or {})
+
+
+async def aggregate(collection_name: str, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run an aggregation pipeline and return all result documents."""
+    cursor = await get_collection(collection_name).aggregate(pipeline)
+    return await cursor.to_list()
+
+
+# ===================
+# Pages, Aggregations & Joins
+# ===================
+
+async def find_page(
+    collection_name: str,
+    query: Dict[str, Any],
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Fetch one page of documents, newest first (see pagination.find_page)."""
+    docs = await (
+        get_collection(collection_name)
+        .find(page_query(query, cursor), projection)
+        .sort(PAGE_SORT)
+        .limit(limit + 1)
+        .to_list()
+    )
+    return finish_page(docs, limit)
+
+
+async def count_by(
+    collection_name: str,
+    field: str,
+    query: Optional[Dict[str, Any]] = None,
+    keys: Optional[List[str]] = None,
+    include_other: bool = True,
+) -> Dict[str, int]:
+    """Count documents in a collection grouped by a field."""
+    rows = await aggregate(collection_name, count_by_pipeline(field, query))
+    return shape_counts(rows, keys, include_other)
+
+
+async def dashboard_breakdowns() -> Dict[str, Any]:
+    """Get signal, issue and PR breakdowns for the dashboard in one query."""
+    rows = await aggregate("signals", dashboard_breakdowns_pipeline())
+    return shape_dashboard_breakdowns(rows)
+
+
+async def fetch_related(
+    docs: List[Dict[str, Any]],
+    collection_name: str,
+    local_field: str,
+    foreign_field: str,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch documents related to `docs` in one query (see joins.fetch_related)."""
+    values = related_values(docs, local_field)
+    if not values:
+        return {}
+
+    rows = await find_many(
+        collection_name,
+        related_query(values, foreign_field),
+        limit=0,
+        projection=related_projection(fields, foreign_field),
+    )
+    return index_related(rows, foreign_field)
+
+
+async def attach_pull_requests(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add pr_url and pr_number to every issue with status 'pr_created'."""
+    with_prs = [issue for issue in issues if issue.get("status") == "pr_created"]
+    prs_by_issue = await fetch_related(with_prs, "pull_requests", "_id", "issue_id", PR_LINK_FIELDS)
+    apply_pull_request_links(with_prs, prs_by_issue)
+    return issues
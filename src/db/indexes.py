@@ -0,0 +1,177 @@
+"""
+Darwin Multi-Agent System - Index Registry
+==========================================
+Declarative index definitions for every Darwin collection, plus helpers
+to create them at startup and report drift against the live database.
+"""
+
+from typing import Dict, List, Any, Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from .mongodb import get_database
+
+
+# ===================
+# Registry
+# ===================
+
+# Every index is named explicitly so drift can be detected by name.
+# TTL indexes use expireAfterSeconds=0 on an `expires_at` date field, so the
+# retention period is chosen per document at write time (see mongodb.py).
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "signals": [
+        # get_unprocessed_signals: {processed, status} sorted by (severity, created_at)
+        IndexModel(
+            [("processed", ASCENDING), ("status", ASCENDING),
+             ("severity", DESCENDING), ("created_at", ASCENDING)],
+            name="processed_status_severity_created",
+        ),
+        # List endpoint keyset pagination
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_id_page"),
+        # Signal detector upsert: unprocessed signal by (type, page, metric)
+        IndexModel(
+            [("type", ASCENDING), ("page", ASCENDING), ("metric_name", ASCENDING), ("processed", ASCENDING)],
+            name="type_page_metric_processed",
+        ),
+    ],
+    "tasks": [
+        # get_pending_tasks: {status} sorted by (priority, created_at)
+        IndexModel(
+            [("status", ASCENDING), ("priority", DESCENDING), ("created_at", ASCENDING)],
+            name="status_priority_created",
+        ),
+    ],
+    "ux_issues": [
+        # get_issues_for_review: {status: $in} sorted by (priority, created_at)
+        IndexModel(
+            [("status", ASCENDING), ("priority", DESCENDING), ("created_at", ASCENDING)],
+            name="status_priority_created",
+        ),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_id_page"),
+    ],
+    "pull_requests": [
+        # ux_issues route: PR lookup by issue_id
+        IndexModel([("issue_id", ASCENDING)], name="issue_id"),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_id_page"),
+    ],
+    "agent_logs": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "product_metrics": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "posthog_aggregates": [
+        # Incremental merge: one bucket per (query, group key, hour)
+        IndexModel(
+            [("query", ASCENDING), ("key", ASCENDING), ("bucket", ASCENDING)],
+            name="query_key_bucket",
+            unique=True,
+        ),
+        # Rolling window reads and pruning
+        IndexModel([("query", ASCENDING), ("bucket", ASCENDING)], name="query_bucket"),
+    ],
+    "pipeline_jobs": [
+        # Job runner: active jobs by status; job list endpoint pagination
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created"),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_id_page"),
+    ],
+}
+
+# Index options that are compared when checking for drift
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+
+def _spec_of(index: IndexModel) -> Dict[str, Any]:
+    """Normalize an IndexModel into a comparable dict."""
+    doc = dict(index.document)
+    return {
+        "key": [(field, direction) for field, direction in doc["key"].items()],
+        **{opt: doc[opt] for opt in _COMPARED_OPTIONS if opt in doc},
+    }
+
+
+def _spec_of_live(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize an entry from index_information() into a comparable dict."""
+    return {
+        "key": [(field, int(direction) if isinstance(direction, (int, float)) else direction)
+                for field, direction in info["key"]],
+        **{opt: info[opt] for opt in _COMPARED_OPTIONS if opt in info},
+    }
+
+
+# ===================
+# Drift Detection
+# ===================
+
+def check_index_drift(collections: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Compare registered indexes with the live database.
+
+    Returns, per collection, the registered indexes that are missing,
+    those whose key or options differ, and unregistered extra indexes.
+    """
+    db = get_database()
+    report = {}
+
+    for col_name in collections or INDEX_REGISTRY:
+        expected = {idx.document["name"]: _spec_of(idx) for idx in INDEX_REGISTRY.get(col_name, [])}
+        live = {
+            name: _spec_of_live(info)
+            for name, info in db[col_name].index_information().items()
+            if name != "_id_"
+        }
+
+        report[col_name] = {
+            "missing": sorted(name for name in expected if name not in live),
+            "changed": sorted(
+                name for name in expected
+                if name in live and live[name] != expected[name]
+            ),
+            "extra": sorted(name for name in live if name not in expected),
+        }
+
+    return report
+
+
+def has_drift(report: Dict[str, Any]) -> bool:
+    """Check whether a drift report contains missing or changed indexes."""
+    return any(entry["missing"] or entry["changed"] for entry in report.values())
+
+
+# ===================
+# Index Creation
+# ===================
+
+def ensure_indexes(collections: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Create all registered indexes that do not exist yet.
+
+    Indexes whose definition changed are reported but never dropped
+    automatically; rebuilding a large index is an operator decision.
+
+    Returns:
+        Dictionary with created index names and the remaining drift report
+    """
+    db = get_database()
+    drift = check_index_drift(collections)
+    created = {}
+    errors = {}
+
+    for col_name, entry in drift.items():
+        to_create = [
+            idx for idx in INDEX_REGISTRY.get(col_name, [])
+            if idx.document["name"] in entry["missing"]
+        ]
+        if not to_create:
+            continue
+        try:
+            created[col_name] = db[col_name].create_indexes(to_create)
+        except OperationFailure as e:
+            errors[col_name] = str(e)
+
+    return {
+        "created": created,
+        "errors": errors,
+        "drift": check_index_drift(collections) if created else drift,
+    }
@@ -0,0 +1,136 @@
+"""
+Darwin Multi-Agent System - Batched Joins
+=========================================
+Enrich a page of documents with related documents from another
+collection using a single `$in` query, joined in memory.
+
+Replaces per-document `find_one` lookups (N+1 round trips) for the
+issue → pull request and signal → UX issue relations.
+"""
+
+from typing import Dict, List, Any, Optional
+from bson import ObjectId
+
+from .mongodb import find_many
+
+
+def related_values(docs: List[Dict[str, Any]], local_field: str) -> List[Any]:
+    """Collect the distinct, non-empty join values from a list of documents."""
+    values = []
+    seen = set()
+    for doc in docs:
+        value = doc.get(local_field)
+        if value is None or str(value) in seen:
+            continue
+        seen.add(str(value))
+        values.append(value)
+    return values
+
+
+def related_query(values: List[Any], foreign_field: str) -> Dict[str, Any]:
+    """Build the `$in` query matching all join values in the foreign collection."""
+    if foreign_field == "_id":
+        values = [ObjectId(v) if isinstance(v, str) and ObjectId.is_valid(v) else v for v in values]
+    return {foreign_field: {"$in": values}}
+
+
+def related_projection(fields: Optional[List[str]], foreign_field: str) -> Optional[Dict[str, int]]:
+    """Build a projection keeping `fields` plus the join key."""
+    if not fields:
+        return None
+    return {field: 1 for field in [*fields, foreign_field]}
+
+
+def index_related(rows: List[Dict[str, Any]], foreign_field: str) -> Dict[str, Dict[str, Any]]:
+    """Key foreign documents by their join value; the first match wins."""
+    index = {}
+    for row in rows:
+        key = row.get(foreign_field)
+        if key is not None:
+            index.setdefault(str(key), row)
+    return index
+
+
+def fetch_related(
+    docs: List[Dict[str, Any]],
+    collection_name: str,
+    local_field: str,
+    foreign_field: str,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch documents related to `docs` in one query.
+
+    Args:
+        docs: Documents to enrich
+        collection_name: Collection holding the related documents
+        local_field: Field in `docs` holding the join value
+        foreign_field: Field in the related collection to match on
+        fields: Optional list of related fields to return
+
+    Returns:
+        Related documents keyed by the string form of the join value
+    """
+    values = related_values(docs, local_field)
+    if not values:
+        return {}
+
+    rows = find_many(
+        collection_name,
+        related_query(values, foreign_field),
+        limit=0,
+        projection=related_projection(fields, foreign_field),
+    )
+    return index_related(rows, foreign_field)
+
+
+def attach_related(
+    docs: List[Dict[str, Any]],
+    collection_name: str,
+    local_field: str,
+    foreign_field: str,
+    as_field: str,
+    fields: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Set `doc[as_field]` to the related document (or None) for every doc."""
+    related = fetch_related(docs, collection_name, local_field, foreign_field, fields)
+    for doc in docs:
+        value = doc.get(local_field)
+        doc[as_field] = related.get(str(value)) if value is not None else None
+    return docs
+
+
+# ===================
+# Darwin Relations
+# ===================
+
+PR_LINK_FIELDS = ["pr_url", "pr_number"]
+
+
+def apply_pull_request_links(
+    issues: List[Dict[str, Any]],
+    prs_by_issue: Dict[str, Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Copy pr_url / pr_number from matched pull requests onto their issues."""
+    for issue in issues:
+        pr = prs_by_issue.get(str(issue.get("_id")))
+        if pr:
+            for field in PR_LINK_FIELDS:
+                issue[field] = pr.get(field)
+    return issues
+
+
+def attach_pull_requests(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add pr_url and pr_number to every issue with status 'pr_created'."""
+    with_prs = [issue for issue in issues if issue.get("status") == "pr_created"]
+    prs_by_issue = fetch_related(with_prs, "pull_requests", "_id", "issue_id", PR_LINK_FIELDS)
+    apply_pull_request_links(with_prs, prs_by_issue)
+    return issues
+
+
+def attach_ux_issues(
+    signals: List[Dict[str, Any]],
+    fields: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Attach the UX issue diagnosed from each signal as `ux_issue`."""
+    return attach_related(signals, "ux_issues", "_id", "signal_id", "ux_issue", fields)
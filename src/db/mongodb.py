@@ -4,8 +4,9 @@ Darwin Multi-Agent System - MongoDB Client
 Centralized MongoDB connection and collection access.
 """
 
+import threading
 from typing import Optional, List, Dict, Any
-from pymongo import MongoClient
+from pymongo import MongoClient, monitoring
 from pymongo.database import Database
 from pymongo.collection import Collection
 from bson import ObjectId
@@ -16,17 +17,156 @@ from src.config.settings import get_settings
 # Global client instance
 _client: Optional[MongoClient] = None
 _db: Optional[Database] = None
+_client_lock = threading.Lock()
+
+
+# ===================
+# Connection Pool
+# ===================
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Collects checkout counts and wait times from the pymongo pools."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        """Clear all collected metrics."""
+        with self._lock:
+            self.connections_created = 0
+            self.connections_closed = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.checkout_failures = 0
+            self.total_wait_ms = 0.0
+            self.max_wait_ms = 0.0
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+    
+    def connection_check_out_started(self, event):
+        pass
+    
+    def connection_checked_out(self, event):
+        waited = (event.duration or 0.0) * 1000
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += waited
+            self.max_wait_ms = max(self.max_wait_ms, waited)
+    
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checkins += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current metrics as a plain dict."""
+        with self._lock:
+            return {
+                "connections_created": self.connections_created,
+                "connections_closed": self.connections_closed,
+                "connections_open": self.connections_created - self.connections_closed,
+                "checkouts": self.checkouts,
+                "checked_out": self.checkouts - self.checkins,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
+
+
+pool_metrics = PoolMetricsListener()
+
+
+def get_client_options() -> Dict[str, Any]:
+    """Build MongoClient keyword arguments from settings."""
+    settings = get_settings()
+    options = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS,
+        "event_listeners": [pool_metrics],
+    }
+    compressors = [c.strip() for c in settings.MONGODB_COMPRESSORS.split(",") if c.strip()]
+    if compressors:
+        options["compressors"] = compressors
+    return options
 
 
 def get_client() -> MongoClient:
-    """Get or create MongoDB client."""
+    """Get or create the pooled MongoDB client."""
     global _client
     if _client is None:
-        settings = get_settings()
-        _client = MongoClient(settings.MONGODB_URI)
+        with _client_lock:
+            if _client is None:
+                settings = get_settings()
+                _client = MongoClient(settings.MONGODB_URI, **get_client_options())
     return _client
 
 
+def warm_up_pool() -> bool:
+    """
+    Open the pool ahead of the first request.
+    
+    Forces server selection and the first connection; pymongo then fills
+    the pool up to MONGODB_MIN_POOL_SIZE in the background.
+    """
+    try:
+        get_client().admin.command("ping")
+        return True
+    except Exception:
+        return False
+
+
+def close_client() -> None:
+    """Close the MongoDB client and release all pooled connections."""
+    global _client, _db
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _db = None
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get connection pool configuration and checkout metrics."""
+    settings = get_settings()
+    return {
+        "connected": _client is not None,
+        "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGODB_MIN_POOL_SIZE,
+        "max_idle_time_ms": settings.MONGODB_MAX_IDLE_TIME_MS,
+        **pool_metrics.snapshot(),
+    }
+
+
 def get_database() -> Database:
     """Get the Darwin database."""
     global _db
@@ -85,6 +225,11 @@ def product_metrics_collection() -> Collection:
     return get_collection("product_metrics")
 
 
+def pipeline_jobs_collection() -> Collection:
+    """Get the pipeline_jobs collection."""
+    return get_collection("pipeline_jobs")
+
+
 # ===================
 # Helper Functions
 # ===================
@@ -137,11 +282,12 @@ def find_many(
     collection_name: str,
     query: Dict[str, Any],
     limit: int = 100,
-    sort: Optional[List[tuple]] = None
+    sort: Optional[List[tuple]] = None,
+    projection: Optional[Dict[str, Any]] = None
 ) -> List[Dict[str, Any]]:
-    """Find multiple documents."""
+    """Find multiple documents (limit=0 returns all matches)."""
     collection = get_collection(collection_name)
-    cursor = collection.find(query)
+    cursor = collection.find(query, projection)
     
     if sort:
         cursor = cursor.sort(sort)
@@ -185,6 +331,12 @@ def count(collection_name: str, query: Dict[str, Any] = None) -> int:
     return collection.count_documents(query or {})
 
 
+def aggregate(collection_name: str, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run an aggregation pipeline and return all result documents."""
+    collection = get_collection(collection_name)
+    return list(collection.aggregate(pipeline))
+
+
 # ===================
 # Specialized Queries
 # ===================
@@ -233,29 +385,18 @@ def test_connection() -> bool:
         return False
 
 
-def get_stats() -> Dict[str, Any]:
-    """Get database statistics."""
-    db = get_database()
-    collections = db.list_collection_names()
-    
-    stats = {
-        "database": db.name,
-        "collections": {},
-        "total_documents": 0
-    }
-    
-    for col_name in collections:
-        col_count = db[col_name].count_documents({})
-        stats["collections"][col_name] = col_count
-        stats["total_documents"] += col_count
-    
-    return stats
-
-
 # ===================
 # Logging Functions
 # ===================
 
+def _set_expiry(document: Dict[str, Any], ttl_days: int) -> None:
+    """Set the `expires_at` date used by the collection's TTL index."""
+    from datetime import datetime, timedelta
+    
+    if ttl_days > 0:
+        document["expires_at"] = datetime.utcnow() + timedelta(days=ttl_days)
+
+
 def log_agent_action(
     agent_name: str,
     action: str,
@@ -272,6 +413,7 @@ def log_agent_action(
         "status": status,
         "timestamp": datetime.utcnow().isoformat(),
     }
+    _set_expiry(log_entry, get_settings().MONGODB_AGENT_LOGS_TTL_DAYS)
     return insert_one("agent_logs", log_entry)
 
 
@@ -336,6 +478,7 @@ def save_product_metric(
         "dimensions": dimensions or {},
         "recorded_at": datetime.utcnow().isoformat(),
     }
+    _set_expiry(metric_entry, get_settings().MONGODB_PRODUCT_METRICS_TTL_DAYS)
     return insert_one("product_metrics", metric_entry)
 
 
@@ -0,0 +1,145 @@
+"""
+Darwin Multi-Agent System - Pagination
+======================================
+Keyset pagination over `(created_at, _id)` with opaque cursors, plus
+field projection for the list endpoints.
+
+Pages are ordered newest first. A cursor encodes the sort key of the
+last document returned, so fetching the next page is an index range
+scan instead of a growing skip.
+"""
+
+import base64
+import re
+from typing import Dict, List, Any, Optional, Tuple
+from bson import json_util
+from pymongo import DESCENDING
+
+from .mongodb import get_collection, serialize_docs
+
+
+PAGE_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# Fields always returned so the next cursor can be built
+_CURSOR_FIELDS = ("created_at",)
+
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z0-9_]+)*$")
+
+
+# ===================
+# Cursors
+# ===================
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """Encode the sort key of a raw (unserialized) document as a cursor."""
+    raw = json_util.dumps([doc.get("created_at"), doc["_id"]])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    """
+    Decode a cursor back into its `(created_at, _id)` sort key.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, doc_id = json_util.loads(base64.urlsafe_b64decode(padded).decode("utf-8"))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return created_at, doc_id
+
+
+def page_query(query: Dict[str, Any], cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Restrict a query to documents that sort after the cursor."""
+    if not cursor:
+        return query
+
+    created_at, doc_id = decode_cursor(cursor)
+
+    if created_at is None:
+        # Documents without created_at sort last; page through them by _id
+        after = {"created_at": None, "_id": {"$lt": doc_id}}
+    else:
+        after = {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": doc_id}},
+            {"created_at": None},
+        ]}
+
+    return {"$and": [query, after]} if query else after
+
+
+# ===================
+# Projection
+# ===================
+
+def parse_fields(fields: Optional[str]) -> Optional[Dict[str, int]]:
+    """
+    Turn a comma-separated `fields=` parameter into a projection.
+
+    Raises:
+        ValueError: If a field name is not a plain (dotted) field path
+    """
+    if not fields:
+        return None
+
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    invalid = [name for name in names if not _FIELD_NAME.match(name)]
+    if invalid:
+        raise ValueError(f"Invalid field name(s): {', '.join(invalid)}")
+
+    projection = {name: 1 for name in names}
+    for name in _CURSOR_FIELDS:
+        projection[name] = 1
+    return projection
+
+
+# ===================
+# Page Fetching
+# ===================
+
+def finish_page(
+    raw_docs: List[Dict[str, Any]],
+    limit: int,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Split a `limit + 1` fetch into the page and the next cursor.
+
+    Returns:
+        Serialized documents and the cursor for the next page (None at the end)
+    """
+    has_more = len(raw_docs) > limit
+    page = raw_docs[:limit]
+    next_cursor = encode_cursor(page[-1]) if has_more and page else None
+    return serialize_docs(page), next_cursor
+
+
+def find_page(
+    collection_name: str,
+    query: Dict[str, Any],
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page of documents, newest first.
+
+    Args:
+        collection_name: Collection to read
+        query: Filter applied before paging
+        limit: Page size
+        cursor: Cursor returned with the previous page
+        projection: Optional projection from parse_fields()
+
+    Returns:
+        Documents for this page and the cursor for the next one
+    """
+    collection = get_collection(collection_name)
+    docs = list(
+        collection.find(page_query(query, cursor), projection)
+        .sort(PAGE_SORT)
+        .limit(limit + 1)
+    )
+    return finish_page(docs, limit)
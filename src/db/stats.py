@@ -0,0 +1,85 @@
+"""
+Darwin Multi-Agent System - Database Statistics
+===============================================
+Per-collection document counts for the dashboard.
+
+By default counts come from collection metadata
+(`estimated_document_count`), which is O(1) regardless of collection
+size. Exact mode runs `count_documents` on all collections concurrently.
+Results are cached for MONGODB_STATS_CACHE_SECONDS.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Tuple
+
+from src.config.settings import get_settings
+from .mongodb import get_database
+
+
+# Cached results keyed by exact mode: (monotonic timestamp, stats)
+_cache: Dict[bool, Tuple[float, Dict[str, Any]]] = {}
+_cache_lock = threading.Lock()
+
+# Upper bound on concurrent count requests
+_MAX_COUNT_WORKERS = 8
+
+
+def _count_collections(names: list, exact: bool) -> Dict[str, int]:
+    """Count documents in each collection concurrently."""
+    db = get_database()
+
+    def count_one(name: str) -> int:
+        collection = db[name]
+        if exact:
+            return collection.count_documents({})
+        return collection.estimated_document_count()
+
+    if not names:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(len(names), _MAX_COUNT_WORKERS)) as pool:
+        return dict(zip(names, pool.map(count_one, names)))
+
+
+def get_stats(exact: bool = False, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Get database statistics.
+
+    Args:
+        exact: Run exact counts instead of reading collection metadata
+        use_cache: Serve a recent cached result if one is available
+
+    Returns:
+        Dictionary with database name, per-collection counts and total
+    """
+    ttl = get_settings().MONGODB_STATS_CACHE_SECONDS
+    now = time.monotonic()
+
+    if use_cache and ttl > 0:
+        with _cache_lock:
+            cached = _cache.get(exact)
+        if cached and now - cached[0] < ttl:
+            return cached[1]
+
+    db = get_database()
+    counts = _count_collections(sorted(db.list_collection_names()), exact)
+
+    stats = {
+        "database": db.name,
+        "collections": counts,
+        "total_documents": sum(counts.values()),
+        "exact": exact,
+    }
+
+    with _cache_lock:
+        _cache[exact] = (now, stats)
+
+    return stats
+
+
+def clear_stats_cache() -> None:
+    """Drop cached statistics so the next call hits the database."""
+    with _cache_lock:
+        _cache.clear()
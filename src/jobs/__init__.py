@@ -0,0 +1,39 @@
+"""
+Darwin Multi-Agent System - Jobs
+================================
+Background execution of Darwin pipeline runs for the API.
+"""
+
+from .runner import (
+    JOBS_COLLECTION,
+    ACTIVE_STATUSES,
+    JobRunner,
+    JobCancelled,
+    JobQueueFull,
+    get_job_runner,
+    shutdown_job_runner,
+    recover_stale_jobs,
+)
+
+from .events import (
+    JOB_FINISHED,
+    JobEventStream,
+    JobEventBus,
+    get_event_bus,
+)
+
+
+__all__ = [
+    "JOBS_COLLECTION",
+    "ACTIVE_STATUSES",
+    "JobRunner",
+    "JobCancelled",
+    "JobQueueFull",
+    "get_job_runner",
+    "shutdown_job_runner",
+    "recover_stale_jobs",
+    "JOB_FINISHED",
+    "JobEventStream",
+    "JobEventBus",
+    "get_event_bus",
+]
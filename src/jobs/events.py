@@ -0,0 +1,161 @@
+"""
+Darwin Multi-Agent System - Job Event Streams
+=============================================
+In-memory progress event streams for pipeline jobs.
+
+Worker threads publish events; API handlers subscribe from the event
+loop. Each job keeps a bounded replay buffer so a client can connect
+late (or reconnect with `Last-Event-ID`) and still receive the events
+it missed. Streams of finished jobs are kept for a while, then dropped.
+"""
+
+import asyncio
+import threading
+from collections import deque, OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, AsyncIterator
+
+from src.config.settings import get_settings
+
+
+# Event type that ends a job's stream
+JOB_FINISHED = "job_finished"
+
+# Finished job streams kept in memory for late subscribers
+_RETAINED_STREAMS = 20
+
+
+class _Subscriber:
+    """An event-loop-side queue fed from worker threads."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        # Unbounded: one job emits at most a few hundred events
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def push(self, event: Dict[str, Any]) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+        except RuntimeError:
+            pass  # Event loop already closed
+
+
+class JobEventStream:
+    """Ordered, replayable progress events of a single job."""
+
+    def __init__(self, job_id: str, max_events: int):
+        self.job_id = job_id
+        self._events: deque = deque(maxlen=max_events)
+        self._next_id = 1
+        self._subscribers: set = set()
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def publish(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Append an event and push it to all subscribers (thread-safe).
+
+        Publishing JOB_FINISHED closes the stream; later events are dropped.
+        """
+        with self._lock:
+            if self.closed:
+                return None
+            event = {
+                "id": self._next_id,
+                "type": event_type,
+                "job_id": self.job_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "data": data or {},
+            }
+            self._next_id += 1
+            self._events.append(event)
+            if event_type == JOB_FINISHED:
+                self.closed = True
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            subscriber.push(event)
+        return event
+
+    async def subscribe(
+        self,
+        after_id: int = 0,
+        heartbeat_seconds: Optional[float] = None,
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield buffered events after `after_id`, then live events until the
+        job finishes. Yields None every `heartbeat_seconds` of silence.
+        """
+        subscriber = _Subscriber(asyncio.get_running_loop())
+
+        with self._lock:
+            backlog = [event for event in self._events if event["id"] > after_id]
+            closed = self.closed
+            if not closed:
+                self._subscribers.add(subscriber)
+
+        try:
+            for event in backlog:
+                yield event
+            if closed:
+                return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield event
+                if event["type"] == JOB_FINISHED:
+                    return
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+
+class JobEventBus:
+    """Registry of job event streams."""
+
+    def __init__(self, max_events: Optional[int] = None):
+        self.max_events = max_events or get_settings().DARWIN_JOB_EVENT_BUFFER
+        self._streams: "OrderedDict[str, JobEventStream]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, job_id: str) -> JobEventStream:
+        """Create the stream for a new job and prune old finished streams."""
+        with self._lock:
+            stream = JobEventStream(job_id, self.max_events)
+            self._streams[job_id] = stream
+
+            finished = [jid for jid, s in self._streams.items() if s.closed]
+            for jid in finished[:max(0, len(finished) - _RETAINED_STREAMS)]:
+                del self._streams[jid]
+
+        return stream
+
+    def get(self, job_id: str) -> Optional[JobEventStream]:
+        """Get a job's stream if it is still held in memory."""
+        with self._lock:
+            return self._streams.get(job_id)
+
+    def publish(self, job_id: str, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Publish an event to a job's stream, if it exists."""
+        stream = self.get(job_id)
+        if stream is not None:
+            stream.publish(event_type, data)
+
+
+# Global event bus instance
+_bus: Optional[JobEventBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> JobEventBus:
+    """Get or create the job event bus."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = JobEventBus()
+    return _bus
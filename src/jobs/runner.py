@@ -0,0 +1,336 @@
+"""
+Darwin Multi-Agent System - Pipeline Job Runner
+===============================================
+Runs Darwin pipelines in the background of the API process.
+
+A run is submitted as a job and its ID is returned immediately. Jobs
+execute in-process on a bounded thread pool, so CrewAI and the MongoDB
+pool stay warm between runs. Every job is persisted in the
+`pipeline_jobs` collection. Running jobs are cancelled cooperatively:
+the crew's step and task callbacks check the job's cancel flag (and its
+timeout) and abort the run at the next agent step. Progress events are
+published to the job's stream on the event bus (see events.py).
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable
+
+from src.config.settings import get_settings
+from src.db import insert_one, update_by_id, find_by_id, get_collection
+from src.models.enums import JobStatus
+from .events import JOB_FINISHED, get_event_bus
+
+
+JOBS_COLLECTION = "pipeline_jobs"
+
+# Statuses of jobs that still occupy a queue slot
+ACTIVE_STATUSES = [JobStatus.QUEUED.value, JobStatus.RUNNING.value]
+
+# Tail of the crew output kept on the job record
+_OUTPUT_CHARS = 2000
+
+
+class JobCancelled(Exception):
+    """Raised from crew callbacks to abort a cancelled or timed-out job."""
+
+
+class JobQueueFull(Exception):
+    """Raised when the runner already holds the maximum number of jobs."""
+
+
+class _JobHandle:
+    """In-memory state of a job owned by this process."""
+
+    def __init__(self, job_id: str, mode: str):
+        self.job_id = job_id
+        self.mode = mode
+        self.cancel_event = threading.Event()
+        self.cancel_reason: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.future: Optional[Future] = None
+
+
+class JobRunner:
+    """Bounded background executor for Darwin pipeline runs."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        timeout_seconds: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self.max_workers = max(1, max_workers or settings.DARWIN_JOB_MAX_WORKERS)
+        self.max_queued = max(1, max_queued or settings.DARWIN_JOB_MAX_QUEUED)
+        self.timeout_seconds = (
+            settings.DARWIN_JOB_TIMEOUT_SECONDS if timeout_seconds is None else timeout_seconds
+        )
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="darwin-job",
+        )
+        self._handles: Dict[str, _JobHandle] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    # ===================
+    # Submission
+    # ===================
+
+    def submit(self, mode: str) -> Dict[str, Any]:
+        """
+        Queue a pipeline run.
+
+        Returns:
+            The persisted job record
+
+        Raises:
+            JobQueueFull: If max_queued jobs are already queued or running
+            RuntimeError: If the runner has been shut down
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Job runner is shut down")
+            if len(self._handles) >= self.max_queued:
+                raise JobQueueFull(
+                    f"{len(self._handles)} pipeline job(s) already queued or running"
+                )
+
+            now = datetime.utcnow().isoformat()
+            job_id = insert_one(JOBS_COLLECTION, {
+                "mode": mode,
+                "status": JobStatus.QUEUED.value,
+                "cancel_requested": False,
+                "error": None,
+                "result": None,
+                "created_at": now,
+                "updated_at": now,
+                "started_at": None,
+                "finished_at": None,
+                "duration_seconds": None,
+            })
+
+            handle = _JobHandle(job_id, mode)
+            self._handles[job_id] = handle
+            get_event_bus().open(job_id).publish("job_queued", {"mode": mode})
+            handle.future = self._executor.submit(self._run, handle)
+
+        return find_by_id(JOBS_COLLECTION, job_id)
+
+    # ===================
+    # Cancellation
+    # ===================
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job.
+
+        Queued jobs are cancelled immediately; running jobs stop at the
+        next agent step. Finished jobs are returned unchanged.
+
+        Returns:
+            The job record, or None if the job does not exist
+        """
+        with self._lock:
+            handle = self._handles.get(job_id)
+
+        if handle is None:
+            return find_by_id(JOBS_COLLECTION, job_id)
+
+        handle.cancel_reason = handle.cancel_reason or "Cancelled by operator"
+        handle.cancel_event.set()
+        update_by_id(JOBS_COLLECTION, job_id, {
+            "cancel_requested": True,
+            "updated_at": datetime.utcnow().isoformat(),
+        })
+        get_event_bus().publish(job_id, "cancel_requested", {"reason": handle.cancel_reason})
+
+        if handle.future is not None and handle.future.cancel():
+            # Never started: finalize here since _run will not execute
+            self._finish(handle, JobStatus.CANCELLED, error=handle.cancel_reason)
+
+        return find_by_id(JOBS_COLLECTION, job_id)
+
+    def check_cancelled(self, handle: _JobHandle) -> None:
+        """
+        Abort the current job if it was cancelled or ran past its timeout.
+
+        Raises:
+            JobCancelled: If the job must stop
+        """
+        if (
+            self.timeout_seconds
+            and handle.started_at is not None
+            and time.monotonic() - handle.started_at > self.timeout_seconds
+            and not handle.cancel_event.is_set()
+        ):
+            handle.cancel_reason = f"Timed out after {self.timeout_seconds}s"
+            handle.cancel_event.set()
+
+        if handle.cancel_event.is_set():
+            raise JobCancelled(handle.cancel_reason or "Cancelled")
+
+    def make_callback(self, handle: _JobHandle) -> Callable[[Any], None]:
+        """Build a crew step/task callback that enforces cancellation."""
+        def callback(_output: Any) -> None:
+            self.check_cancelled(handle)
+        return callback
+
+    # ===================
+    # Execution
+    # ===================
+
+    def _run(self, handle: _JobHandle) -> None:
+        """Execute one job on a worker thread."""
+        handle.started_at = time.monotonic()
+
+        try:
+            update_by_id(JOBS_COLLECTION, handle.job_id, {
+                "status": JobStatus.RUNNING.value,
+                "started_at": datetime.utcnow().isoformat(),
+                "updated_at": datetime.utcnow().isoformat(),
+            })
+
+            bus = get_event_bus()
+            bus.publish(handle.job_id, "job_started", {"mode": handle.mode})
+
+            # Imported lazily so the API can start without loading CrewAI
+            from src.crew import execute_pipeline
+
+            self.check_cancelled(handle)
+            callback = self.make_callback(handle)
+            result = execute_pipeline(
+                mode=handle.mode,
+                verbose=False,
+                step_callback=callback,
+                task_callback=callback,
+                on_event=lambda event_type, data: bus.publish(handle.job_id, event_type, data),
+            )
+        except JobCancelled:
+            result = {"success": False}
+        except Exception as e:
+            self._finish(handle, JobStatus.FAILED, error=str(e))
+            return
+
+        if handle.cancel_event.is_set():
+            # run_darwin reports a JobCancelled raised in a callback as a failure
+            timed_out = (handle.cancel_reason or "").startswith("Timed out")
+            status = JobStatus.FAILED if timed_out else JobStatus.CANCELLED
+            self._finish(handle, status, error=handle.cancel_reason)
+        elif result.get("success"):
+            output = str(result.get("result") or "")
+            self._finish(handle, JobStatus.COMPLETED, result={
+                "agents_used": result.get("agents_used"),
+                "tasks_completed": result.get("tasks_completed"),
+                "output": output[-_OUTPUT_CHARS:],
+            })
+        else:
+            self._finish(handle, JobStatus.FAILED, error=result.get("error", "Unknown error"))
+
+    def _finish(
+        self,
+        handle: _JobHandle,
+        status: JobStatus,
+        error: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Persist the final state of a job and release its slot."""
+        now = datetime.utcnow().isoformat()
+        duration = time.monotonic() - handle.started_at if handle.started_at else None
+
+        duration = round(duration, 2) if duration is not None else None
+
+        update_by_id(JOBS_COLLECTION, handle.job_id, {
+            "status": status.value,
+            "error": error,
+            "result": result,
+            "finished_at": now,
+            "updated_at": now,
+            "duration_seconds": duration,
+        })
+        get_event_bus().publish(handle.job_id, JOB_FINISHED, {
+            "status": status.value,
+            "error": error,
+            "duration_seconds": duration,
+        })
+
+        with self._lock:
+            self._handles.pop(handle.job_id, None)
+
+    # ===================
+    # Lifecycle
+    # ===================
+
+    def active_jobs(self) -> int:
+        """Number of queued or running jobs owned by this runner."""
+        with self._lock:
+            return len(self._handles)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting jobs and cancel everything still queued or running."""
+        with self._lock:
+            self._closed = True
+            handles = list(self._handles.values())
+
+        for handle in handles:
+            handle.cancel_reason = "Interrupted: API shutting down"
+            handle.cancel_event.set()
+            if handle.future is not None and handle.future.cancel():
+                self._finish(handle, JobStatus.FAILED, error=handle.cancel_reason)
+
+        self._executor.shutdown(wait=wait)
+
+
+# ===================
+# Recovery
+# ===================
+
+def recover_stale_jobs() -> int:
+    """
+    Mark jobs left queued or running by a previous API process as failed.
+
+    Jobs only live in the process that accepted them, so any active job
+    found at startup can no longer make progress.
+
+    Returns:
+        Number of jobs marked as failed
+    """
+    now = datetime.utcnow().isoformat()
+    result = get_collection(JOBS_COLLECTION).update_many(
+        {"status": {"$in": ACTIVE_STATUSES}},
+        {"$set": {
+            "status": JobStatus.FAILED.value,
+            "error": "Interrupted: API restarted before the job finished",
+            "finished_at": now,
+            "updated_at": now,
+        }},
+    )
+    return result.modified_count
+
+
+# Global runner instance
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Get or create the job runner."""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = JobRunner()
+    return _runner
+
+
+def shutdown_job_runner() -> None:
+    """Shut down the job runner if it was started."""
+    global _runner
+    with _runner_lock:
+        if _runner is not None:
+            _runner.shutdown()
+        _runner = None
@@ -0,0 +1,42 @@
+"""
+Darwin Multi-Agent System - LLM
+===============================
+LLM access shared by the agents: one provider (connection pooling,
+concurrency and rate limits, retries, metrics) behind a response cache.
+"""
+
+from .cache import (
+    CachedLLM,
+    LLMCacheMiss,
+    ResponseCache,
+    get_llm_cache,
+    normalize_messages,
+    normalize_text,
+    prompt_key,
+)
+
+from .provider import (
+    LLMProvider,
+    ManagedLLM,
+    get_llm_provider,
+    close_llm_provider,
+    get_gemini_llm,
+)
+
+
+__all__ = [
+    # Provider
+    "LLMProvider",
+    "ManagedLLM",
+    "get_llm_provider",
+    "close_llm_provider",
+    "get_gemini_llm",
+    # Response cache
+    "CachedLLM",
+    "LLMCacheMiss",
+    "ResponseCache",
+    "get_llm_cache",
+    "normalize_messages",
+    "normalize_text",
+    "prompt_key",
+]
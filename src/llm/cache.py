@@ -0,0 +1,291 @@
+"""
+Darwin Multi-Agent System - LLM Response Cache
+==============================================
+Cache of LLM completions, so repeated runs over unchanged inputs (the
+same signal, the same file) do not pay for the same answer again.
+
+- Keyed by model, temperature, stop words and the prompt messages with
+  line endings, trailing whitespace and blank-line runs normalized.
+  Indentation is significant (prompts contain code) and is kept.
+- Two tiers like the HogQL cache: an in-memory LRU and JSON files on
+  disk that carry over between runs. Entries expire after
+  LLM_CACHE_TTL_SECONDS; the disk tier is also held to
+  LLM_CACHE_MAX_ENTRIES, evicting the least recently used files.
+- Only plain text completions are cached. Calls with native function
+  calling (tools / available_functions) always go to the model, since
+  answering them may run a tool.
+
+LLM_CACHE_MODE:
+    read_write  Serve hits, store misses (default)
+    refresh     Always call the model, store the fresh answer
+    replay      Serve from the cache only; a miss raises LLMCacheMiss
+                and nothing expires. For deterministic tests: record a
+                run once, then replay it without network access.
+    off         No caching
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+from crewai import LLM
+
+from src.config.settings import get_settings
+
+
+CACHE_MODES = ("read_write", "refresh", "replay", "off")
+
+# Puts between evictions from the disk tier
+_SWEEP_EVERY = 50
+
+# CrewAI >= 1.0 builds its own native SDK client instead of the LLM class
+# asked for when it knows the model (gemini/..., openai/...), unless told
+# to stay on LiteLLM
+_NATIVE_ROUTING = "is_litellm" in inspect.signature(LLM.__init__).parameters
+
+
+class LLMCacheMiss(RuntimeError):
+    """A prompt had no cached response in replay mode."""
+
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Text with line endings unified, trailing whitespace stripped from
+    each line and runs of blank lines collapsed. Leading indentation is
+    kept: prompts contain code, where it matters.
+    """
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    text = "\n".join(line.rstrip() for line in lines)
+    return _BLANK_LINES.sub("\n\n", text).strip("\n")
+
+
+def normalize_messages(messages: Union[str, List[Dict[str, Any]]]) -> str:
+    """Prompt messages as one string, each normalized with normalize_text()."""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, default=str)
+        parts.append(json.dumps([message.get("role", "user"), normalize_text(content)]))
+    return "\n".join(parts)
+
+
+def prompt_key(model: str, messages: Union[str, List[Dict[str, Any]]], **params: Any) -> str:
+    """Cache key of a completion request."""
+    options = json.dumps(params, sort_keys=True, default=str)
+    raw = f"{model}\n{options}\n{normalize_messages(messages)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-level (memory + disk) TTL cache of LLM responses."""
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        mode: str = "read_write",
+        ttl_seconds: float = 7 * 86400,
+        max_memory_entries: int = 128,
+        max_disk_entries: int = 5000,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}. Use one of: {list(CACHE_MODES)}")
+        self.directory = Path(directory) if directory else None
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        # key -> (expires_at, response), least recently used first
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "stores": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, expires_at: float, response: str) -> None:
+        """Insert into the memory LRU (caller holds the lock)."""
+        self._memory[key] = (expires_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _fresh(self, expires_at: float, now: float) -> bool:
+        return self.mode == "replay" or expires_at > now
+
+    def count_bypass(self) -> None:
+        with self._lock:
+            self.stats["bypassed"] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for the key, or None."""
+        now = time.time()
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and self._fresh(cached[0], now):
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return cached[1]
+
+        path = self._disk_path(key)
+        if path is not None and path.exists():
+            try:
+                stored = json.loads(path.read_text(encoding="utf-8"))
+                if self._fresh(stored["expires_at"], now):
+                    os.utime(path)  # Recently used: evicted last
+                    with self._lock:
+                        self._remember(key, stored["expires_at"], stored["response"])
+                        self.stats["disk_hits"] += 1
+                    return stored["response"]
+            except (ValueError, KeyError, OSError):
+                pass
+            if self.mode != "replay":
+                path.unlink(missing_ok=True)  # Expired or corrupt
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, response: str, model: str = "") -> None:
+        """Store a response for the TTL (replay mode never writes)."""
+        if self.mode == "replay":
+            return
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, expires_at, response)
+            self.stats["stores"] += 1
+            self._puts += 1
+            sweep = self._puts % _SWEEP_EVERY == 0
+
+        path = self._disk_path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(
+            json.dumps({"expires_at": expires_at, "model": model, "response": response}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+
+        if sweep:
+            self._sweep_disk()
+
+    def _sweep_disk(self) -> None:
+        """Delete expired entries, then the least recently used ones over the limit."""
+        now = time.time()
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                if json.loads(path.read_text(encoding="utf-8"))["expires_at"] <= now:
+                    path.unlink(missing_ok=True)
+                else:
+                    entries.append((path.stat().st_mtime, path))
+            except (ValueError, KeyError, OSError):
+                path.unlink(missing_ok=True)
+        entries.sort()
+        for _, path in entries[:max(len(entries) - self.max_disk_entries, 0)]:
+            path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Drop every cached response (memory and disk)."""
+        with self._lock:
+            self._memory.clear()
+        if self.directory is not None:
+            for path in self.directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            lookups = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "mode": self.mode,
+                "hits": hits,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> ResponseCache:
+    """Get the process-wide LLM response cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                settings = get_settings()
+                _cache = ResponseCache(
+                    directory=settings.LLM_CACHE_DIR or None,
+                    mode=settings.LLM_CACHE_MODE,
+                    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                    max_memory_entries=settings.LLM_CACHE_MEMORY_ENTRIES,
+                    max_disk_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                )
+    return _cache
+
+
+class CachedLLM(LLM):
+    """CrewAI LLM answering repeated prompts from the response cache."""
+
+    def __new__(cls, *args, **kwargs):
+        # Kept on the LiteLLM route: a native client would never reach call()
+        if _NATIVE_ROUTING:
+            return super().__new__(cls, *args, **{**kwargs, "is_litellm": True})
+        return super().__new__(cls)
+
+    def _complete(self, messages, **kwargs):
+        """Ask the model (subclasses route this through the LLM provider)."""
+        return super().call(messages, **kwargs)
+
+    def call(self, messages, **kwargs):
+        # Keyword arguments only: the signature of LLM.call differs between
+        # CrewAI versions (tools / available_functions were added later)
+        cache = get_llm_cache()
+        if not cache.enabled or kwargs.get("tools") or kwargs.get("available_functions"):
+            return self._complete(messages, **kwargs)
+
+        key = prompt_key(
+            self.model,
+            messages,
+            temperature=getattr(self, "temperature", None),
+            stop=getattr(self, "stop", None),
+        )
+        if cache.mode == "refresh":
+            cache.count_bypass()
+        else:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            if cache.mode == "replay":
+                raise LLMCacheMiss(f"No cached {self.model} response for prompt {key[:12]} (LLM_CACHE_MODE=replay)")
+
+        response = self._complete(messages, **kwargs)
+        if isinstance(response, str) and response.strip():
+            cache.put(key, response, model=self.model)
+        return response
@@ -0,0 +1,293 @@
+"""
+Darwin Multi-Agent System - LLM Provider
+========================================
+Process-wide LLM access shared by all agents.
+
+- One LLM object per model, all sending through one pooled `httpx`
+  client (LLM_HTTP_POOL_SIZE keep-alive connections), instead of a
+  client per agent.
+- At most LLM_MAX_CONCURRENT_CALLS completions are in flight per
+  process, whichever agent or thread asks.
+- Requests to a model are spaced to LLM_REQUESTS_PER_MINUTE (overridable
+  per model with LLM_MODEL_REQUESTS_PER_MINUTE, e.g.
+  "gemini/gemini-2.0-flash=15"), so parallel work queues up instead of
+  bursting into quota errors.
+- Rate-limited (429) and failed (5xx, timeouts, dropped connections)
+  completions are retried with jittered exponential backoff.
+- Latency, token usage (reported by LiteLLM), retries and throttling
+  waits are exposed via get_stats(), in total and per model.
+
+Responses are cached in front of all this (cache.py): hits never reach
+the provider. Completions go through LiteLLM, also on CrewAI versions
+that would otherwise hand known models to their native SDK clients.
+"""
+
+import random
+import threading
+import time
+from typing import Optional, Dict, Any, Callable, TypeVar
+
+import httpx
+from litellm.integrations.custom_logger import CustomLogger
+
+from src.config.settings import get_settings
+from .cache import CachedLLM
+
+
+T = TypeVar("T")
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# LiteLLM exception types worth retrying (status codes are not always set)
+_RETRY_ERRORS = {"RateLimitError", "ServiceUnavailableError", "InternalServerError", "APIConnectionError", "Timeout"}
+
+_MODEL_STATS = ("calls", "errors", "retries", "rate_limited", "latency_seconds", "prompt_tokens", "completion_tokens")
+
+
+def parse_model_limits(value: str) -> Dict[str, float]:
+    """Per-model requests per minute from "model=rpm,model=rpm"."""
+    limits = {}
+    for item in value.split(","):
+        if "=" in item:
+            model, rpm = item.rsplit("=", 1)
+            limits[model.strip()] = float(rpm)
+    return limits
+
+
+class _UsageLogger(CustomLogger):
+    """LiteLLM callback reporting the token usage of every completion."""
+
+    def __init__(self, provider: "LLMProvider"):
+        super().__init__()
+        self.provider = provider
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        usage = getattr(response_obj, "usage", None)
+        if usage is None:
+            return
+        model = kwargs.get("model") or "unknown"
+        prefix = kwargs.get("custom_llm_provider") or (kwargs.get("litellm_params") or {}).get("custom_llm_provider")
+        if prefix and not model.startswith(f"{prefix}/"):
+            model = f"{prefix}/{model}"
+        self.provider.record_usage(
+            model,
+            getattr(usage, "prompt_tokens", 0) or 0,
+            getattr(usage, "completion_tokens", 0) or 0,
+        )
+
+
+class ManagedLLM(CachedLLM):
+    """CrewAI LLM whose completions go through the shared LLM provider."""
+
+    def _complete(self, messages, **kwargs):
+        provider = get_llm_provider()
+        kwargs["callbacks"] = [*(kwargs.get("callbacks") or []), provider.usage_logger]
+        return provider.complete(self.model, lambda: super(ManagedLLM, self)._complete(messages, **kwargs))
+
+
+class LLMProvider:
+    """Shared, throttled and retrying access to LLM completions."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        pool_size: int = 10,
+        timeout: float = 120.0,
+        max_concurrent_calls: int = 4,
+        requests_per_minute: float = 60.0,
+        model_requests_per_minute: Optional[Dict[str, float]] = None,
+        max_retries: int = 3,
+        retry_base_seconds: float = 2.0,
+        retry_max_seconds: float = 60.0,
+    ):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.requests_per_minute = requests_per_minute
+        self.model_requests_per_minute = model_requests_per_minute or {}
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.max_concurrent_calls = max(1, max_concurrent_calls)
+        self._slots = threading.BoundedSemaphore(self.max_concurrent_calls)
+
+        self.http = httpx.Client(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=timeout,
+        )
+        self._handler = None  # LiteLLM wrapper around self.http, created with the first LLM
+        self.usage_logger = _UsageLogger(self)
+
+        self._lock = threading.Lock()
+        self._llms: Dict[str, ManagedLLM] = {}
+        self._next_call_at: Dict[str, float] = {}  # Monotonic time of each model's next free slot
+        self.stats: Dict[str, Any] = {
+            **{name: 0 for name in _MODEL_STATS},
+            "throttle_wait_seconds": 0.0,
+            "max_latency_seconds": 0.0,
+            "models": {},
+        }
+
+    # ===================
+    # LLMs
+    # ===================
+
+    def _http_handler(self):
+        """The pooled client in the form LiteLLM accepts as `client`."""
+        if self._handler is None:
+            from litellm.llms.custom_httpx.http_handler import HTTPHandler
+            self._handler = HTTPHandler(timeout=self.timeout, client=self.http)
+        return self._handler
+
+    def llm(self, model: str) -> ManagedLLM:
+        """The shared LLM of a model (e.g. "gemini/gemini-2.0-flash")."""
+        with self._lock:
+            if model not in self._llms:
+                llm = ManagedLLM(
+                    model=model,
+                    api_key=self.api_key,
+                    timeout=self.timeout,
+                    client=self._http_handler(),
+                )
+                # Anything else (e.g. a CrewAI native client) would skip
+                # the limits, retries and metrics of this provider
+                if not isinstance(llm, ManagedLLM):
+                    raise TypeError(f"CrewAI built a {type(llm).__name__} for {model}, not a ManagedLLM")
+                self._llms[model] = llm
+            return self._llms[model]
+
+    # ===================
+    # Calls
+    # ===================
+
+    def _model_stats(self, model: str) -> Dict[str, Any]:
+        """Counters of one model (caller holds the lock)."""
+        if model not in self.stats["models"]:
+            self.stats["models"][model] = {name: 0 for name in _MODEL_STATS}
+        return self.stats["models"][model]
+
+    def _count(self, model: str, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.stats[name] += value
+            self._model_stats(model)[name] += value
+
+    def _pace(self, model: str) -> None:
+        """Wait for the model's next request slot."""
+        rpm = self.model_requests_per_minute.get(model, self.requests_per_minute)
+        if rpm <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_call_at.get(model, 0.0))
+            self._next_call_at[model] = start + 60.0 / rpm
+            wait = start - now
+            self.stats["throttle_wait_seconds"] += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        ceiling = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _retryable(self, model: str, error: Exception) -> bool:
+        status = getattr(error, "status_code", None)
+        name = type(error).__name__
+        if status == 429 or name == "RateLimitError":
+            self._count(model, "rate_limited")
+            return True
+        return status in _RETRY_STATUSES or name in _RETRY_ERRORS
+
+    def complete(self, model: str, call: Callable[[], T]) -> T:
+        """
+        Run one completion of `model` within the concurrency and rate
+        limits, retrying rate-limited and transient failures.
+        """
+        attempt = 0
+        while True:
+            with self._slots:
+                self._pace(model)
+                started = time.monotonic()
+                try:
+                    result = call()
+                except Exception as e:
+                    self._count(model, "errors")
+                    if attempt >= self.max_retries or not self._retryable(model, e):
+                        raise
+                else:
+                    latency = time.monotonic() - started
+                    with self._lock:
+                        self.stats["calls"] += 1
+                        self.stats["latency_seconds"] += latency
+                        self.stats["max_latency_seconds"] = max(self.stats["max_latency_seconds"], latency)
+                        model_stats = self._model_stats(model)
+                        model_stats["calls"] += 1
+                        model_stats["latency_seconds"] += latency
+                    return result
+
+            # Back off without holding a concurrency slot
+            delay = self._backoff(attempt)
+            attempt += 1
+            self._count(model, "retries")
+            time.sleep(delay)
+
+    def record_usage(self, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+            model_stats = self._model_stats(model)
+            model_stats["prompt_tokens"] += prompt_tokens
+            model_stats["completion_tokens"] += completion_tokens
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Call counters, latency and token usage (totals and per model)."""
+        with self._lock:
+            stats = {
+                **{name: value for name, value in self.stats.items() if name != "models"},
+                "models": {model: dict(values) for model, values in self.stats["models"].items()},
+            }
+        stats["avg_latency_seconds"] = round(stats["latency_seconds"] / stats["calls"], 3) if stats["calls"] else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.http.close()
+
+
+# Global provider instance
+_provider: Optional[LLMProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_llm_provider() -> LLMProvider:
+    """Get or create the shared LLM provider."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                settings = get_settings()
+                _provider = LLMProvider(
+                    api_key=settings.GEMINI_API_KEY,
+                    pool_size=settings.LLM_HTTP_POOL_SIZE,
+                    timeout=settings.LLM_TIMEOUT_SECONDS,
+                    max_concurrent_calls=settings.LLM_MAX_CONCURRENT_CALLS,
+                    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+                    model_requests_per_minute=parse_model_limits(settings.LLM_MODEL_REQUESTS_PER_MINUTE),
+                    max_retries=settings.LLM_MAX_RETRIES,
+                    retry_base_seconds=settings.LLM_RETRY_BASE_SECONDS,
+                    retry_max_seconds=settings.LLM_RETRY_MAX_SECONDS,
+                )
+    return _provider
+
+
+def close_llm_provider() -> None:
+    """Close the shared LLM provider."""
+    global _provider
+    with _provider_lock:
+        if _provider is not None:
+            _provider.close()
+        _provider = None
+
+
+def get_gemini_llm() -> ManagedLLM:
+    """Get the shared Gemini LLM for CrewAI (configured by GEMINI_MODEL)."""
+    return get_llm_provider().llm(f"gemini/{get_settings().GEMINI_MODEL}")
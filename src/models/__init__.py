@@ -12,6 +12,7 @@ from .enums import (
     TaskPriority,
     TaskStatus,
     PRStatus,
+    JobStatus,
     AgentType,
     LogLevel,
     SEVERITY_THRESHOLDS,
@@ -33,6 +34,7 @@ __all__ = [
     "TaskPriority",
     "TaskStatus",
     "PRStatus",
+    "JobStatus",
     "AgentType",
     "LogLevel",
     # Constants
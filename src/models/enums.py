@@ -104,6 +104,19 @@ class PRStatus(str, Enum):
         return self.value
 
 
+class JobStatus(str, Enum):
+    """Status of a background pipeline job."""
+    
+    QUEUED = "queued"                # Waiting for a worker
+    RUNNING = "running"              # Pipeline executing
+    COMPLETED = "completed"          # Finished successfully
+    FAILED = "failed"                # Pipeline error or interrupted
+    CANCELLED = "cancelled"          # Cancelled by an operator
+    
+    def __str__(self) -> str:
+        return self.value
+
+
 class AgentType(str, Enum):
     """Types of Darwin agents."""
     
@@ -145,7 +158,19 @@ SEVERITY_THRESHOLDS = {
         Severity.HIGH: 0.3,       # 30%+
         Severity.MEDIUM: 0.2,     # 20%+
         Severity.LOW: 0.1,        # 10%+
-    }
+    },
+    "error_spike_ratio": {
+        Severity.CRITICAL: 10,    # Recent error rate vs. baseline rate
+        Severity.HIGH: 5,
+        Severity.MEDIUM: 3,
+        Severity.LOW: 2,
+    },
+    "error_count": {
+        Severity.CRITICAL: 100,   # Errors on a page without a baseline
+        Severity.HIGH: 50,
+        Severity.MEDIUM: 20,
+        Severity.LOW: 5,
+    },
 }
 
 # Confidence thresholds
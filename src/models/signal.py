@@ -61,6 +61,7 @@ class Signal(BaseModel):
     class Config:
         populate_by_name = True
         use_enum_values = True
+        validate_default = True  # Default enums are stored as values too
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
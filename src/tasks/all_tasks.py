@@ -8,19 +8,52 @@ from crewai import Task, Agent
 from typing import Optional
 
 
-def create_detect_signals_task(watcher_agent: Agent) -> Task:
+def create_detect_signals_task(
+    watcher_agent: Agent,
+    detection_report: Optional[str] = None
+) -> Task:
     """
     Create the signal detection task for the Watcher Agent.
     
     This task queries PostHog for friction signals and saves them to MongoDB.
+    If the rule-based detector already ran (`detection_report`), the
+    Watcher only summarizes its signals.
     """
+    if detection_report is not None:
+        return Task(
+            description=f"""
+        Summarize the UX friction signals found by Darwin's rule-based detector.
+        
+        The signals below are already saved in the MongoDB 'signals'
+        collection - do NOT save them again.
+        
+        {detection_report}
+        
+        Steps:
+        1. Explain what each critical and high severity signal means for users
+        2. Point out signals that likely share a cause (same page or element)
+        3. Optionally use posthog_query to drill into a page or event when
+           a signal needs more context
+        4. Recommend which signals the Analyst should look at first
+        """,
+            expected_output="""
+        A summary report containing:
+        - Total number of friction signals detected
+        - Breakdown by signal type
+        - The most critical signals with their page/element and users impacted
+        - A prioritized list of signals for the Analyst
+        """,
+            agent=watcher_agent,
+        )
+    
     return Task(
         description="""
         Detect UX friction signals from PostHog analytics.
         
         Steps:
-        1. Query PostHog for rage click events in the last 7 days
-        2. Query PostHog for any significant drop-offs or errors
+        1. Run posthog_query with query_type "friction_scan" and days=7: it
+           returns rage clicks, funnel drop-offs and event counts in one call
+        2. Use the other query types only to drill into a specific page or event
         3. For each friction point found:
            - Classify the signal type (rage_click, drop_off, error_spike, etc.)
            - Determine severity based on affected user count
@@ -74,7 +107,9 @@ def create_analyze_issues_task(
         2. For each high-severity signal:
            a. Read the relevant source code from GitHub
               - For product page issues, check 'app/product/[id].tsx'
-              - Use github_list_files to explore if needed
+              - Use github_find_files to locate files by name or glob (e.g. 'app/**/*.tsx'),
+                github_grep (with a path_glob) to find where a component or style is defined,
+                and github_list_files to explore a directory
            b. Analyze the code to find the root cause:
               - Small touch targets (padding < 16)
               - Missing press feedback (no activeOpacity)
@@ -168,6 +203,8 @@ def create_fix_and_pr_task(
            - Get recommended_fix (if list, use FIRST item)
            - Get original_code from recommended_fix.original_code OR recommended_fix.code_changes[0].original_code
            - Get suggested_code from recommended_fix.suggested_code OR recommended_fix.code_changes[0].suggested_code
+           - If a value shows as <elided ...>, fetch the full value with the
+             mongodb_read_field call given in it - never pass the summary itself
         
         4. Create the PR using github_create_pr with PATCH approach:
            - title: "🧬 Darwin Fix: [Issue Title]"
@@ -181,6 +218,10 @@ def create_fix_and_pr_task(
            
            NOTE: You do NOT need to provide the full file content!
            The tool will read the file, find original_code, and replace it.
+           
+           If the fix has SEVERAL code changes (recommended_fix is a list, or
+           has several code_changes), use github_create_batch_pr instead and
+           pass all of them as `fixes` - they go into ONE PR and ONE commit.
         
         4. After PR is created:
            - Save PR details to MongoDB 'pull_requests' collection with:
@@ -4,6 +4,93 @@ Darwin Multi-Agent System - Custom Tools
 CrewAI tools for PostHog, GitHub, and MongoDB operations.
 """
 
+from .progress import (
+    progress_reporter,
+    report_progress,
+    track_tool_calls,
+)
+
+from .github_scheduler import (
+    RequestScheduler,
+    RateLimitExceeded,
+)
+
+from .github_client import (
+    GitHubClient,
+    get_github_client,
+    close_github_client,
+)
+
+from .github_cache import (
+    BlobCache,
+    RepoFileCache,
+    get_file_cache,
+    get_file_reader,
+)
+
+from .github_tree import (
+    RepoTree,
+    RepoTreeIndex,
+    get_tree_index,
+)
+
+from .patching import (
+    PatchError,
+    PatchMatch,
+    apply_patch,
+    apply_patch_match,
+    locate_patch,
+)
+
+from .github_pr_builder import (
+    Fix,
+    BatchPRBuilder,
+    get_pr_builder,
+)
+
+from .git_mirror import (
+    GitError,
+    GitMirror,
+    MirrorPRBuilder,
+    get_git_mirror,
+)
+
+from .posthog_client import (
+    PostHogClient,
+    PostHogError,
+    get_posthog_client,
+    close_posthog_client,
+)
+
+from .posthog_incremental import (
+    IncrementalAggregator,
+    IncrementalQuery,
+    get_incremental_aggregator,
+)
+
+from .compact_output import (
+    compact_table,
+    compact_documents,
+    resolve_output_format,
+)
+
+from .context_budget import (
+    ContextBudget,
+    context_budget,
+    current_budget,
+    budget_tool_output,
+    elide_fields,
+    estimate_tokens,
+)
+
+from .signal_detector import (
+    DetectionThresholds,
+    SignalDetector,
+    detect_signals,
+    format_detection_report,
+    save_signals,
+)
+
 from .posthog_tools import (
     PostHogQueryTool,
     PostHogRecordingsTool,
@@ -12,8 +99,11 @@ from .posthog_tools import (
 from .github_tools import (
     GitHubReadTool,
     GitHubPRTool,
+    GitHubBatchPRTool,
     GitHubCheckBranchTool,
     GitHubListFilesTool,
+    GitHubFindFilesTool,
+    GitHubGrepTool,
 )
 
 from .mongodb_tools import (
@@ -21,6 +111,7 @@ from .mongodb_tools import (
     MongoDBWriteTool,
     MongoDBUpdateTool,
     MongoDBFindByIdTool,
+    MongoDBReadFieldTool,
     MongoDBCountTool,
     GetUnprocessedSignalsTool,
     GetPendingTasksTool,
@@ -34,16 +125,75 @@ __all__ = [
     # GitHub Tools
     "GitHubReadTool",
     "GitHubPRTool",
+    "GitHubBatchPRTool",
     "GitHubCheckBranchTool",
     "GitHubListFilesTool",
+    "GitHubFindFilesTool",
+    "GitHubGrepTool",
     # MongoDB Tools
     "MongoDBReadTool",
     "MongoDBWriteTool",
     "MongoDBUpdateTool",
     "MongoDBFindByIdTool",
+    "MongoDBReadFieldTool",
     "MongoDBCountTool",
     "GetUnprocessedSignalsTool",
     "GetPendingTasksTool",
+    # GitHub client
+    "GitHubClient",
+    "get_github_client",
+    "close_github_client",
+    "RequestScheduler",
+    "RateLimitExceeded",
+    "BlobCache",
+    "RepoFileCache",
+    "get_file_cache",
+    "get_file_reader",
+    "RepoTree",
+    "RepoTreeIndex",
+    "get_tree_index",
+    "Fix",
+    "BatchPRBuilder",
+    "get_pr_builder",
+    "GitError",
+    "GitMirror",
+    "MirrorPRBuilder",
+    "get_git_mirror",
+    "PatchError",
+    "PatchMatch",
+    "apply_patch",
+    "apply_patch_match",
+    "locate_patch",
+    # PostHog client
+    "PostHogClient",
+    "PostHogError",
+    "get_posthog_client",
+    "close_posthog_client",
+    # Incremental PostHog aggregates
+    "IncrementalAggregator",
+    "IncrementalQuery",
+    "get_incremental_aggregator",
+    # Compact tool output
+    "compact_table",
+    "compact_documents",
+    "resolve_output_format",
+    # Tool context budget
+    "ContextBudget",
+    "context_budget",
+    "current_budget",
+    "budget_tool_output",
+    "elide_fields",
+    "estimate_tokens",
+    # Rule-based signal detection
+    "DetectionThresholds",
+    "SignalDetector",
+    "detect_signals",
+    "format_detection_report",
+    "save_signals",
+    # Progress reporting
+    "progress_reporter",
+    "report_progress",
+    "track_tool_calls",
 ]
 
 
@@ -53,12 +203,16 @@ WATCHER_TOOLS = [
     PostHogRecordingsTool(),
     MongoDBWriteTool(),
     MongoDBReadTool(),
+    MongoDBReadFieldTool(),
 ]
 
 ANALYST_TOOLS = [
     GitHubReadTool(),
     GitHubListFilesTool(),
+    GitHubFindFilesTool(),
+    GitHubGrepTool(),
     MongoDBReadTool(),
+    MongoDBReadFieldTool(),
     MongoDBWriteTool(),
     MongoDBUpdateTool(),
     GetUnprocessedSignalsTool(),
@@ -67,8 +221,12 @@ ANALYST_TOOLS = [
 ENGINEER_TOOLS = [
     GitHubReadTool(),
     GitHubPRTool(),
+    GitHubBatchPRTool(),
     GitHubListFilesTool(),
+    GitHubFindFilesTool(),
+    GitHubGrepTool(),
     MongoDBReadTool(),
+    MongoDBReadFieldTool(),
     MongoDBWriteTool(),
     MongoDBUpdateTool(),
     GetPendingTasksTool(),
@@ -0,0 +1,126 @@
+"""
+Darwin Multi-Agent System - Compact Tool Output
+===============================================
+Token-lean rendering of tool results, used when a tool runs with
+output_format="compact" (the default is DARWIN_TOOL_OUTPUT_FORMAT).
+
+- Tables are columnar JSON (`{"columns": [...], "rows": [[...]]}`)
+  instead of markdown tables or one pretty-printed object per
+  document: keys are not repeated per row and no whitespace is spent on
+  indentation.
+- Only the first DARWIN_TOOL_OUTPUT_TOP_K rows are kept. When rows are
+  cut, `total` and `omitted` say how many there were and `stats` has
+  min/max/sum of the numeric columns over all rows, so totals stay right.
+- Strings longer than DARWIN_TOOL_OUTPUT_MAX_FIELD_CHARS (also inside
+  nested values) are cut, with a marker giving the number of characters
+  dropped.
+
+The markdown format stays available for humans and for prompts that
+rely on it.
+"""
+
+import json
+from typing import Optional, Dict, Any, List, Sequence
+
+from src.config.settings import get_settings
+
+
+OUTPUT_FORMATS = ("markdown", "compact")
+
+
+def resolve_output_format(output_format: Optional[str]) -> str:
+    """
+    The requested format, or the configured default.
+
+    Raises:
+        ValueError: Unknown format
+    """
+    resolved = (output_format or get_settings().DARWIN_TOOL_OUTPUT_FORMAT).lower()
+    if resolved not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}. Use one of: {list(OUTPUT_FORMATS)}")
+    return resolved
+
+
+def dumps_compact(value: Any) -> str:
+    """JSON without indentation or spaces after separators."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def truncate_value(value: Any, max_chars: int) -> Any:
+    """Cut long strings, recursing into dicts and lists (max_chars <= 0 keeps everything)."""
+    if max_chars <= 0:
+        return value
+    if isinstance(value, str):
+        if len(value) > max_chars:
+            return f"{value[:max_chars]}…[+{len(value) - max_chars} chars]"
+        return value
+    if isinstance(value, dict):
+        return {key: truncate_value(item, max_chars) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [truncate_value(item, max_chars) for item in value]
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def column_stats(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> Dict[str, Dict[str, Any]]:
+    """min/max/sum of every column whose values are all numbers (None ignored)."""
+    stats = {}
+    for index, column in enumerate(columns):
+        values = [row[index] for row in rows if index < len(row) and row[index] is not None]
+        if values and all(_is_number(value) for value in values):
+            stats[column] = {"min": min(values), "max": max(values), "sum": round(sum(values), 4)}
+    return stats
+
+
+def compact_table(
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    top_k: Optional[int] = None,
+    max_field_chars: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Columnar form of a table: the first `top_k` rows, plus totals.
+
+    Returns:
+        {"columns", "rows"}; when rows were cut also "total", "omitted"
+        and "stats" (numeric column summaries over all rows)
+    """
+    settings = get_settings()
+    top_k = settings.DARWIN_TOOL_OUTPUT_TOP_K if top_k is None else top_k
+    max_field_chars = settings.DARWIN_TOOL_OUTPUT_MAX_FIELD_CHARS if max_field_chars is None else max_field_chars
+
+    kept = rows[:top_k] if top_k > 0 else rows
+    table: Dict[str, Any] = {
+        "columns": list(columns),
+        "rows": [[truncate_value(value, max_field_chars) for value in row] for row in kept],
+    }
+    if len(kept) < len(rows):
+        table["total"] = len(rows)
+        table["omitted"] = len(rows) - len(kept)
+        stats = column_stats(columns, rows)
+        if stats:
+            table["stats"] = stats
+    return table
+
+
+def compact_documents(
+    docs: List[Dict[str, Any]],
+    top_k: Optional[int] = None,
+    max_field_chars: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Documents as one columnar table; the columns are the union of their
+    fields in order of first appearance (missing fields are null).
+    """
+    columns: List[str] = []
+    seen = set()
+    for doc in docs:
+        for key in doc:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    rows = [[doc.get(column) for column in columns] for doc in docs]
+    return compact_table(columns, rows, top_k, max_field_chars)
@@ -0,0 +1,237 @@
+"""
+Darwin Multi-Agent System - Tool Context Budget
+===============================================
+Keeps tool results from flooding agent prompts.
+
+- The token cost of every tool result is estimated (about 4 characters
+  per token) and charged to the running task. A single result may use
+  DARWIN_CONTEXT_CALL_TOKENS, or what is left of the task's
+  DARWIN_CONTEXT_TASK_TOKENS if that is less - but never less than
+  DARWIN_CONTEXT_MIN_CALL_TOKENS, so late calls still get an answer.
+- Tools that know the shape of their results pack them to that budget:
+  long document fields (code, sample_events) become elided summaries
+  with a handle to fetch them (`mongodb_read_field`), and files are
+  returned a line range at a time with a handle for the next range.
+- Whatever is still over budget is cut by `budget_tool_output`, with a
+  note saying so.
+
+The budget lives in a context variable set around `crew.kickoff()` (like
+the progress reporter) and is reset after every task. Without one,
+only the per-call limit applies.
+"""
+
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Callable, Dict, Any, List, Tuple
+
+from src.config.settings import get_settings
+from .compact_output import dumps_compact
+
+
+# Characters per token of the estimate (English text and code average ~4)
+_CHARS_PER_TOKEN = 4
+
+# Characters of an elided string shown in its summary
+_PREVIEW_CHARS = 80
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a string."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def tokens_to_chars(tokens: int) -> int:
+    return tokens * _CHARS_PER_TOKEN
+
+
+class ContextBudget:
+    """Token budget of the tool results of one pipeline run."""
+
+    def __init__(
+        self,
+        task_tokens: int = 60000,
+        call_tokens: int = 4000,
+        min_call_tokens: int = 500,
+        field_tokens: int = 300,
+    ):
+        self.task_tokens = task_tokens
+        self.call_tokens = call_tokens
+        self.min_call_tokens = min_call_tokens
+        self.field_tokens = field_tokens
+
+        self._lock = threading.Lock()
+        self._task_used = 0
+        self._finished_tasks: List[int] = []  # Tokens used by each finished task
+        self.stats = {"calls": 0, "tokens": 0, "trimmed_calls": 0, "elided_fields": 0}
+
+    @classmethod
+    def from_settings(cls) -> "ContextBudget":
+        settings = get_settings()
+        return cls(
+            task_tokens=settings.DARWIN_CONTEXT_TASK_TOKENS,
+            call_tokens=settings.DARWIN_CONTEXT_CALL_TOKENS,
+            min_call_tokens=settings.DARWIN_CONTEXT_MIN_CALL_TOKENS,
+            field_tokens=settings.DARWIN_CONTEXT_FIELD_TOKENS,
+        )
+
+    def call_limit(self) -> int:
+        """Tokens the next tool result may use."""
+        with self._lock:
+            remaining = self.task_tokens - self._task_used if self.task_tokens > 0 else self.call_tokens
+        return max(self.min_call_tokens, min(self.call_tokens, remaining))
+
+    def charge(self, tokens: int, trimmed: bool = False) -> None:
+        with self._lock:
+            self._task_used += tokens
+            self.stats["calls"] += 1
+            self.stats["tokens"] += tokens
+            if trimmed:
+                self.stats["trimmed_calls"] += 1
+
+    def count_elided(self, fields: int) -> None:
+        with self._lock:
+            self.stats["elided_fields"] += fields
+
+    def next_task(self) -> None:
+        """Start the budget of the next task."""
+        with self._lock:
+            self._finished_tasks.append(self._task_used)
+            self._task_used = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "task_tokens": self._finished_tasks + [self._task_used]}
+
+
+_budget: ContextVar[Optional[ContextBudget]] = ContextVar("darwin_context_budget", default=None)
+
+
+@contextmanager
+def context_budget(budget: Optional[ContextBudget]):
+    """Charge tool results produced inside the block to `budget`."""
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+def current_budget() -> Optional[ContextBudget]:
+    return _budget.get()
+
+
+def call_limit() -> int:
+    """Tokens the next tool result may use (per-call limit without a run budget)."""
+    budget = _budget.get()
+    if budget is None:
+        return get_settings().DARWIN_CONTEXT_CALL_TOKENS
+    return budget.call_limit()
+
+
+def field_limit() -> int:
+    """Tokens a single document field may use before it is elided."""
+    budget = _budget.get()
+    return budget.field_tokens if budget is not None else get_settings().DARWIN_CONTEXT_FIELD_TOKENS
+
+
+# ===================
+# Packing
+# ===================
+
+def elide_fields(
+    value: Any,
+    handle: Callable[[str], str],
+    max_tokens: Optional[int] = None,
+    path: str = "",
+) -> Any:
+    """
+    Replace values that cost more than `max_tokens` by a short summary.
+
+    Dicts are walked field by field, so only the long leaves are elided;
+    a long string or list is replaced as a whole. The summary names the
+    size and ends with `handle(path)`, the call that returns the full
+    value (path is dotted, e.g. "recommended_fix.original_code").
+    """
+    max_tokens = field_limit() if max_tokens is None else max_tokens
+    if isinstance(value, dict):
+        return {
+            key: elide_fields(item, handle, max_tokens, f"{path}.{key}" if path else str(key))
+            for key, item in value.items()
+        }
+    if max_tokens <= 0 or not isinstance(value, (str, list, tuple)):
+        return value
+
+    text = value if isinstance(value, str) else dumps_compact(value)
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return value
+    if isinstance(value, str):
+        preview = " ".join(value[:_PREVIEW_CHARS].split())
+        summary = f"{len(value)} chars (~{tokens} tokens) starting \"{preview}…\""
+    else:
+        summary = f"list of {len(value)} items (~{tokens} tokens)"
+    return f"<elided {summary}; full value: {handle(path)}>"
+
+
+def fit_items(items: List[Any], max_tokens: int) -> Tuple[List[Any], int]:
+    """
+    The leading items whose combined JSON fits in `max_tokens` (at least one).
+
+    Returns:
+        (kept items, number of items left out)
+    """
+    kept, used = [], 0
+    for item in items:
+        tokens = estimate_tokens(dumps_compact(item))
+        if kept and used + tokens > max_tokens:
+            break
+        kept.append(item)
+        used += tokens
+    return kept, len(items) - len(kept)
+
+
+def fit_text(text: str, max_tokens: int, note: str) -> str:
+    """Cut text to `max_tokens` at a line boundary and append `note`."""
+    max_chars = tokens_to_chars(max_tokens)
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    if cut < max_chars // 2:
+        cut = max_chars
+    return text[:cut] + f"\n\n*…{note}*"
+
+
+def budget_tool_output(tool_cls):
+    """
+    Class decorator charging every `_run` result to the context budget
+    and cutting results over the per-call limit.
+    """
+    run = tool_cls._run
+
+    @functools.wraps(run)
+    def _run(self, *args, **kwargs):
+        limit = call_limit()
+        output = run(self, *args, **kwargs)
+        if not isinstance(output, str):
+            return output
+
+        tokens = estimate_tokens(output)
+        trimmed = tokens > limit
+        if trimmed:
+            output = fit_text(
+                output,
+                limit,
+                f"output cut at ~{limit} of ~{tokens} tokens; narrow the request to see the rest",
+            )
+            tokens = estimate_tokens(output)
+
+        budget = _budget.get()
+        if budget is not None:
+            budget.charge(tokens, trimmed)
+            budget.count_elided(output.count("<elided "))
+        return output
+
+    tool_cls._run = _run
+    return tool_cls
@@ -0,0 +1,389 @@
+"""
+Darwin Multi-Agent System - Local Git Mirror
+============================================
+Optional git backend (GITHUB_BACKEND=mirror) that keeps a bare mirror of
+the target repository's branches on local disk.
+
+The mirror is refreshed with an incremental `git fetch` at most every
+GITHUB_MIRROR_FETCH_SECONDS (and always before a PR is built). File
+reads, directory listings, globbing, grep and patch application run
+against the mirror's object store with git plumbing. Fix commits are
+written locally and pushed; only PR creation (and labels) go through the
+REST API.
+
+The remote can be any git URL, so a local bare repository can stand in
+for GitHub (GITHUB_MIRROR_REMOTE=/path/to/repo.git).
+"""
+
+import base64
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from github.GithubException import GithubException
+
+from src.config.settings import get_settings
+from .github_client import GitHubClient, get_github_client
+from .github_tree import RepoTree, TreeEntry
+from .github_pr_builder import BatchPRBuilder, PreparedChange
+
+
+_COMMIT_SHA = re.compile(r"^[0-9a-f]{40}$")
+
+# Commit trees kept in memory
+_MAX_TREES = 4
+
+# Identity of commits created by Darwin
+_AUTHOR_NAME = "Darwin"
+_AUTHOR_EMAIL = "darwin@users.noreply.github.com"
+
+
+class GitError(RuntimeError):
+    """Raised when a git command fails."""
+
+
+class GitMirror:
+    """Bare mirror of a repository's branches, read with git plumbing."""
+
+    def __init__(
+        self,
+        remote_url: str,
+        directory: str,
+        token: Optional[str] = None,
+        fetch_interval: float = 60,
+    ):
+        self.remote_url = remote_url
+        self.directory = Path(directory)
+        self.token = token
+        self.fetch_interval = fetch_interval
+
+        self._last_fetch: Optional[float] = None
+        self._fetch_lock = threading.Lock()
+        self._trees: "OrderedDict[str, RepoTree]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"fetches": 0, "pushes": 0, "git_commands": 0}
+
+    # ===================
+    # Git Commands
+    # ===================
+
+    def _env(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0", **(extra or {})}
+        if self.token and self.remote_url.startswith("https://"):
+            # Passed through the environment so the token never shows up in argv or config
+            credentials = base64.b64encode(f"x-access-token:{self.token}".encode()).decode()
+            env.update({
+                "GIT_CONFIG_COUNT": "1",
+                "GIT_CONFIG_KEY_0": "http.extraHeader",
+                "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}",
+            })
+        return env
+
+    def _git(
+        self,
+        *args: str,
+        input: Optional[bytes] = None,
+        env: Optional[Dict[str, str]] = None,
+        ok_codes: Tuple[int, ...] = (0,),
+    ) -> subprocess.CompletedProcess:
+        """
+        Run git against the mirror.
+
+        Raises:
+            GitError: If git exits with a code not in ok_codes
+        """
+        result = subprocess.run(
+            ["git", "--git-dir", str(self.directory), *args],
+            input=input,
+            capture_output=True,
+            env=self._env(env),
+        )
+        with self._lock:
+            self.stats["git_commands"] += 1
+        if result.returncode not in ok_codes:
+            message = result.stderr.decode("utf-8", "replace").strip()
+            raise GitError(f"git {args[0]} failed: {message}")
+        return result
+
+    # ===================
+    # Mirror Lifecycle
+    # ===================
+
+    def ensure(self) -> None:
+        """Create the bare mirror on first use."""
+        if (self.directory / "HEAD").exists():
+            return
+        with self._fetch_lock:
+            if (self.directory / "HEAD").exists():
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._git("init", "--bare", "--quiet")
+            self._git("remote", "add", "origin", self.remote_url)
+            self._git("config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+            self._last_fetch = None
+
+    def fetch(self, max_age: Optional[float] = None) -> None:
+        """Fetch from the remote unless the last fetch is younger than max_age."""
+        self.ensure()
+        max_age = self.fetch_interval if max_age is None else max_age
+        with self._fetch_lock:
+            if self._last_fetch is not None and time.monotonic() - self._last_fetch < max_age:
+                return
+            self._git("fetch", "--prune", "--quiet", "origin")
+            self._last_fetch = time.monotonic()
+            with self._lock:
+                self.stats["fetches"] += 1
+
+    # ===================
+    # Reads
+    # ===================
+
+    def resolve_ref(self, ref: str, max_age: Optional[float] = None) -> str:
+        """
+        Resolve a branch name (or commit SHA) to a commit SHA.
+
+        Raises:
+            GithubException: 404 if the branch or commit does not exist
+        """
+        if _COMMIT_SHA.match(ref):
+            # Commits are immutable: only fetch if the mirror does not have it yet
+            self.ensure()
+            sha = self._rev_parse(ref)
+            if sha is None:
+                self.fetch(max_age=0)
+                sha = self._rev_parse(ref)
+        else:
+            self.fetch(max_age)
+            sha = self._rev_parse(f"refs/heads/{ref}")
+
+        if sha is None:
+            raise GithubException(404, {"message": f"Branch not found: {ref}"}, None)
+        return sha
+
+    def _rev_parse(self, name: str) -> Optional[str]:
+        result = self._git("rev-parse", "--verify", "--quiet", f"{name}^{{commit}}", ok_codes=(0, 1, 128))
+        return result.stdout.decode().strip() if result.returncode == 0 else None
+
+    def tree(self, ref: str = "main") -> RepoTree:
+        """All paths at `ref`, from `git ls-tree` (cached per commit)."""
+        commit = self.resolve_ref(ref)
+        with self._lock:
+            tree = self._trees.get(commit)
+            if tree is not None:
+                self._trees.move_to_end(commit)
+                return tree
+
+        listing = self._git("ls-tree", "-r", "-t", "-l", "-z", commit).stdout.decode("utf-8")
+        entries = []
+        for record in listing.split("\0"):
+            if not record:
+                continue
+            meta, path = record.split("\t", 1)
+            mode, kind, sha, size = meta.split()
+            if kind in ("blob", "tree"):
+                entries.append(TreeEntry(
+                    path, kind, sha, None if size == "-" else int(size), mode
+                ))
+        root = self._git("rev-parse", f"{commit}^{{tree}}").stdout.decode().strip()
+        tree = RepoTree(commit, entries, sha=root)
+
+        with self._lock:
+            self._trees[commit] = tree
+            while len(self._trees) > _MAX_TREES:
+                self._trees.popitem(last=False)
+        return tree
+
+    def read_bytes(self, path: str, ref: str = "main", max_ref_age: Optional[float] = None) -> Tuple[bytes, str, str]:
+        """
+        Read a file's raw content.
+
+        Returns:
+            (content, blob_sha, commit_sha)
+
+        Raises:
+            IsADirectoryError: If the path is a directory
+            GithubException: 404 if the path does not exist
+        """
+        commit = self.resolve_ref(ref, max_age=max_ref_age)
+        entry = self.tree(commit).get(path)
+        if entry is None:
+            raise GithubException(404, {"message": f"Not Found: {path}"}, None)
+        if entry.is_dir:
+            raise IsADirectoryError(path)
+        return self._git("cat-file", "blob", entry.sha).stdout, entry.sha, commit
+
+    def read_file(self, path: str, ref: str = "main", max_ref_age: Optional[float] = None) -> Tuple[str, str]:
+        """
+        Read a file as UTF-8 text.
+
+        Returns:
+            (content, blob_sha)
+        """
+        data, sha, _ = self.read_bytes(path, ref, max_ref_age)
+        return data.decode("utf-8"), sha
+
+    def grep(
+        self,
+        pattern: str,
+        ref: str = "main",
+        paths: Optional[List[str]] = None,
+        ignore_case: bool = False,
+        max_results: int = 100,
+    ) -> List[Tuple[str, int, str]]:
+        """
+        Search file contents with `git grep` (extended regex).
+
+        Returns:
+            (path, line_number, line) tuples, at most max_results
+        """
+        commit = self.resolve_ref(ref)
+        args = ["grep", "-n", "-I", "-E", "--full-name"]
+        if ignore_case:
+            args.append("-i")
+        args += ["-e", pattern, commit, "--"]
+        args += [f":(glob){p}" for p in paths or []]
+
+        # Exit code 1 means no matches
+        output = self._git(*args, ok_codes=(0, 1)).stdout.decode("utf-8", "replace")
+        matches = []
+        prefix = f"{commit}:"
+        for line in output.splitlines():
+            if line.startswith(prefix):
+                line = line[len(prefix):]
+            path, number, text = line.split(":", 2)
+            matches.append((path, int(number), text))
+            if len(matches) >= max_results:
+                break
+        return matches
+
+    # ===================
+    # Writes
+    # ===================
+
+    def create_commit(
+        self,
+        base_commit: str,
+        files: Dict[str, str],
+        message: str,
+        modes: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Commit file contents on top of base_commit (locally, without
+        touching any ref). Returns the new commit SHA.
+        """
+        modes = modes or {}
+        index_lines = []
+        for path, content in sorted(files.items()):
+            sha = self._git(
+                "hash-object", "-w", "--stdin", input=content.encode("utf-8")
+            ).stdout.decode().strip()
+            index_lines.append(f"{modes.get(path, '100644')} {sha}\t{path}")
+
+        # Build the tree in a throwaway index so concurrent commits don't collide
+        fd, index_file = tempfile.mkstemp(prefix="darwin-index-")
+        os.close(fd)
+        os.unlink(index_file)
+        try:
+            env = {"GIT_INDEX_FILE": index_file}
+            self._git("read-tree", base_commit, env=env)
+            self._git(
+                "update-index", "--index-info",
+                input=("\n".join(index_lines) + "\n").encode("utf-8"),
+                env=env,
+            )
+            tree = self._git("write-tree", env=env).stdout.decode().strip()
+        finally:
+            if os.path.exists(index_file):
+                os.unlink(index_file)
+
+        identity = {
+            "GIT_AUTHOR_NAME": _AUTHOR_NAME,
+            "GIT_AUTHOR_EMAIL": _AUTHOR_EMAIL,
+            "GIT_COMMITTER_NAME": _AUTHOR_NAME,
+            "GIT_COMMITTER_EMAIL": _AUTHOR_EMAIL,
+        }
+        return self._git(
+            "commit-tree", tree, "-p", base_commit,
+            input=message.encode("utf-8"),
+            env=identity,
+        ).stdout.decode().strip()
+
+    def push(self, commit_sha: str, branch: str) -> None:
+        """Push a commit to a remote branch (fast-forward only)."""
+        self._git("push", "--quiet", "origin", f"{commit_sha}:refs/heads/{branch}")
+        self._git("update-ref", f"refs/heads/{branch}", commit_sha)
+        with self._lock:
+            self.stats["pushes"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "trees_in_memory": len(self._trees)}
+
+
+# ===================
+# Pull Requests
+# ===================
+
+class MirrorPRBuilder(BatchPRBuilder):
+    """BatchPRBuilder that commits in the mirror and pushes with git."""
+
+    def __init__(self, client: GitHubClient, mirror: GitMirror):
+        super().__init__(client, mirror)
+        self.mirror = mirror
+
+    def _base_tree(self, commit: str) -> str:
+        return self.mirror.tree(commit).sha
+
+    def _file_mode(self, commit: str, path: str) -> str:
+        entry = self.mirror.tree(commit).get(path)
+        return entry.mode if entry is not None and entry.mode else "100644"
+
+    def commit(self, change: PreparedChange, message: str) -> str:
+        return self.mirror.create_commit(
+            change.base_commit,
+            change.files,
+            message,
+            modes={path: self._file_mode(change.base_commit, path) for path in change.files},
+        )
+
+    def push_branch(self, branch_name: str, commit_sha: str) -> None:
+        self.mirror.push(commit_sha, branch_name)
+
+
+# Global mirror instance
+_mirror: Optional[GitMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_git_mirror() -> GitMirror:
+    """Get or create the mirror of the configured repository."""
+    global _mirror
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                settings = get_settings()
+                remote = settings.GITHUB_MIRROR_REMOTE or (
+                    f"https://github.com/{settings.GITHUB_OWNER}/{settings.GITHUB_REPO}.git"
+                )
+                directory = settings.GITHUB_MIRROR_DIR or os.path.join(
+                    settings.GITHUB_CACHE_DIR or ".darwin_cache",
+                    "mirrors", settings.GITHUB_OWNER, f"{settings.GITHUB_REPO}.git",
+                )
+                _mirror = GitMirror(
+                    remote,
+                    directory,
+                    token=settings.GITHUB_TOKEN,
+                    fetch_interval=settings.GITHUB_MIRROR_FETCH_SECONDS,
+                )
+    return _mirror
+
+
+def get_mirror_pr_builder() -> MirrorPRBuilder:
+    """PR builder that pushes from the mirror and opens PRs through the API."""
+    return MirrorPRBuilder(get_github_client(), get_git_mirror())
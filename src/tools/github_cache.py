@@ -0,0 +1,330 @@
+"""
+Darwin Multi-Agent System - GitHub File Cache
+=============================================
+Content-addressed cache for repository file reads.
+
+A read of `path` at `ref` is resolved in three steps:
+
+1. ref → commit SHA (branch heads cached for GITHUB_REF_CACHE_SECONDS)
+2. (commit, path) → blob SHA (immutable; looked up in the commit's
+   recursive tree, see github_tree.py, or learned from the parent
+   directory listing when the tree was truncated)
+3. blob SHA → content (in-memory LRU, then on-disk store, then the
+   git blobs API)
+
+Blobs are immutable, so a pipeline run downloads each file version at
+most once, and later runs reuse every blob that has not changed.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+from github.GithubException import GithubException
+
+from src.config.settings import get_settings
+from .github_client import GitHubClient, get_github_client
+
+
+_COMMIT_SHA = re.compile(r"^[0-9a-f]{40}$")
+
+# (commit, path) -> (type, sha) resolutions kept by RepoFileCache
+_MAX_PATH_ENTRIES = 4096
+
+
+def git_blob_sha(data: bytes) -> str:
+    """SHA-1 git assigns to a blob with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+# ===================
+# Blob Store
+# ===================
+
+class BlobCache:
+    """Two-level (memory + disk) LRU store of blob contents keyed by SHA."""
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.directory = Path(directory) if directory else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _disk_path(self, sha: str) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        return self.directory / sha[:2] / sha
+
+    def _remember(self, sha: str, data: bytes) -> None:
+        """Insert into the memory LRU (caller holds the lock)."""
+        if len(data) > self.max_memory_bytes:
+            return
+        if sha in self._memory:
+            self._memory.move_to_end(sha)
+            return
+        self._memory[sha] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get(self, sha: str) -> Optional[bytes]:
+        """Blob content, or None if not cached."""
+        with self._lock:
+            data = self._memory.get(sha)
+            if data is not None:
+                self._memory.move_to_end(sha)
+                self.stats["memory_hits"] += 1
+                return data
+
+        path = self._disk_path(sha)
+        if path is not None and path.exists():
+            data = path.read_bytes()
+            if git_blob_sha(data) == sha:
+                os.utime(path)  # Recently used: survives disk eviction longer
+                with self._lock:
+                    self._remember(sha, data)
+                    self.stats["disk_hits"] += 1
+                return data
+            path.unlink(missing_ok=True)  # Corrupt entry
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, sha: str, data: bytes) -> None:
+        """Store a blob (content must hash to `sha`)."""
+        if git_blob_sha(data) != sha:
+            raise ValueError(f"Blob content does not match SHA {sha}")
+
+        with self._lock:
+            self._remember(sha, data)
+
+        path = self._disk_path(sha)
+        if path is None or path.exists() or len(data) > self.max_disk_bytes:
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(data)
+            over_cap = self._disk_bytes > self.max_disk_bytes
+        if over_cap:
+            self._evict_disk()
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.directory.glob("*/*") if p.is_file())
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used blobs until the store is under 90% of its cap."""
+        files = sorted(
+            (p for p in self.directory.glob("*/*") if p.is_file()),
+            key=lambda p: p.stat().st_mtime,
+        )
+        total = sum(p.stat().st_size for p in files)
+        target = int(self.max_disk_bytes * 0.9)
+        for path in files:
+            if total <= target:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._disk_bytes = total
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+            }
+
+
+# ===================
+# Repository File Cache
+# ===================
+
+class RepoFileCache:
+    """Resolve and read repository files through the blob cache."""
+
+    def __init__(self, client: GitHubClient, blobs: BlobCache, ref_ttl_seconds: float = 30):
+        self.client = client
+        self.blobs = blobs
+        self.ref_ttl_seconds = ref_ttl_seconds
+
+        self._refs: Dict[str, Tuple[float, str]] = {}
+        # (commit, path) -> (type, sha); immutable for a given commit,
+        # least recently used first
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Per-commit tree index (RepoTreeIndex); set by get_file_cache()
+        self.trees = None
+
+    def resolve_ref(self, ref: str, max_age: Optional[float] = None) -> str:
+        """
+        Resolve a branch name (or commit SHA) to a commit SHA.
+
+        Args:
+            ref: Branch name or full commit SHA
+            max_age: Accept a cached resolution up to this old (defaults to the TTL)
+        """
+        if _COMMIT_SHA.match(ref):
+            return ref
+
+        max_age = self.ref_ttl_seconds if max_age is None else max_age
+        now = time.monotonic()
+        with self._lock:
+            cached = self._refs.get(ref)
+        if cached and now - cached[0] < max_age:
+            return cached[1]
+
+        sha = self.client.get_branch(ref)["commit"]["sha"]
+        with self._lock:
+            self._refs[ref] = (now, sha)
+        return sha
+
+    def entry(self, commit: str, path: str) -> Tuple[str, str]:
+        """
+        (type, sha) of `path` at `commit`.
+
+        Raises:
+            GithubException: 404 if the path does not exist
+        """
+        path = path.strip("/")
+        key = (commit, path)
+        with self._lock:
+            found = self._entries.get(key)
+            if found:
+                self._entries.move_to_end(key)
+        if found:
+            return found
+
+        # One recursive tree request covers every path of the commit
+        if self.trees is not None:
+            found = self.trees.lookup(commit, path)
+            if found is not None:
+                if found[0] == "missing":
+                    raise GithubException(404, {"message": f"Not Found: {path}"}, None)
+                return found
+
+        # One listing yields the SHAs of the file and all its siblings
+        parent = path.rsplit("/", 1)[0] if "/" in path else ""
+        listing = self.client.get_contents(parent, ref=commit)
+        if not isinstance(listing, list):
+            raise GithubException(404, {"message": f"Not a directory: {parent}"}, None)
+
+        with self._lock:
+            for item in listing:
+                self._entries[(commit, item["path"])] = (item["type"], item["sha"])
+                self._entries.move_to_end((commit, item["path"]))
+            found = self._entries.get(key)
+            # Bounded like the blob LRU; entries of superseded commits age out
+            while len(self._entries) > _MAX_PATH_ENTRIES:
+                self._entries.popitem(last=False)
+
+        if not found:
+            raise GithubException(404, {"message": f"Not Found: {path}"}, None)
+        return found
+
+    def read_bytes(self, path: str, ref: str = "main", max_ref_age: Optional[float] = None) -> Tuple[bytes, str, str]:
+        """
+        Read a file's raw content.
+
+        Returns:
+            (content, blob_sha, commit_sha)
+
+        Raises:
+            IsADirectoryError: If the path is a directory
+            GithubException: For API errors (404 if missing)
+        """
+        commit = self.resolve_ref(ref, max_age=max_ref_age)
+        kind, sha = self.entry(commit, path)
+        if kind == "dir":
+            raise IsADirectoryError(path)
+
+        data = self.blobs.get(sha)
+        if data is None:
+            data = self.client.get_blob_bytes(sha)
+            self.blobs.put(sha, data)
+        return data, sha, commit
+
+    def read_file(self, path: str, ref: str = "main", max_ref_age: Optional[float] = None) -> Tuple[str, str]:
+        """
+        Read a file as UTF-8 text.
+
+        Returns:
+            (content, blob_sha)
+        """
+        data, sha, _ = self.read_bytes(path, ref, max_ref_age)
+        return data.decode("utf-8"), sha
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+        return {**self.blobs.get_stats(), "path_entries": entries}
+
+
+# Global file cache instance
+_cache: Optional[RepoFileCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_file_cache() -> RepoFileCache:
+    """Get or create the shared file cache for the configured repository."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                settings = get_settings()
+                client = get_github_client()
+                directory = None
+                if settings.GITHUB_CACHE_DIR:
+                    directory = os.path.join(
+                        settings.GITHUB_CACHE_DIR, "blobs", client.owner, client.repo_name
+                    )
+                _cache = RepoFileCache(
+                    client,
+                    BlobCache(
+                        directory,
+                        max_memory_bytes=settings.GITHUB_BLOB_CACHE_MEMORY_MB * 1024 * 1024,
+                        max_disk_bytes=settings.GITHUB_BLOB_CACHE_DISK_MB * 1024 * 1024,
+                    ),
+                    ref_ttl_seconds=settings.GITHUB_REF_CACHE_SECONDS,
+                )
+                from .github_tree import create_tree_index
+                _cache.trees = create_tree_index(_cache)
+    return _cache
+
+
+def get_file_reader():
+    """
+    File reader for the configured backend: the shared file cache, or the
+    local git mirror when GITHUB_BACKEND=mirror. Both provide
+    resolve_ref(), read_bytes() and read_file().
+    """
+    if get_settings().GITHUB_BACKEND == "mirror":
+        from .git_mirror import get_git_mirror
+        return get_git_mirror()
+    return get_file_cache()
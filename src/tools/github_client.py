@@ -0,0 +1,254 @@
+"""
+Darwin Multi-Agent System - GitHub Client
+=========================================
+Process-wide GitHub access shared by all tools and scripts.
+
+- One pooled `requests.Session` for all REST calls, instead of a new
+  client and a `get_repo` round trip per tool call.
+- GET requests are revalidated with ETags: an unchanged resource comes
+  back as `304 Not Modified`, which GitHub does not count against the
+  rate limit, and is served from the local response cache.
+- Every REST call goes through a RequestScheduler (github_scheduler.py)
+  for rate-limit pacing, retries and coalescing of identical reads.
+"""
+
+import base64
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from github.GithubException import GithubException
+
+from src.config.settings import get_settings
+from .github_scheduler import RequestScheduler, create_scheduler
+
+
+# GitHub REST API version sent with every request
+API_VERSION = "2022-11-28"
+
+
+class GitHubClient:
+    """Pooled, ETag-caching GitHub client for one repository."""
+
+    def __init__(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        api_url: str = "https://api.github.com",
+        pool_size: int = 10,
+        etag_cache_size: int = 512,
+        timeout: float = 30,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        self.owner = owner
+        self.repo_name = repo
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self.scheduler = scheduler or RequestScheduler()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": API_VERSION,
+            "User-Agent": "darwin-multi-agent",
+        })
+
+        # URL -> (etag, parsed body), least recently used first
+        self._etag_cache: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        self._etag_cache_size = etag_cache_size
+        self._cache_lock = threading.Lock()
+
+        self.stats = {"requests": 0, "not_modified": 0}
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.repo_name}"
+
+    # ===================
+    # REST Requests
+    # ===================
+
+    def repo_path(self, suffix: str = "") -> str:
+        """API path of the repository, e.g. repo_path('/branches/main')."""
+        return f"/repos/{self.owner}/{self.repo_name}{suffix}"
+
+    def _count(self, name: str) -> None:
+        with self._cache_lock:
+            self.stats[name] += 1
+
+    def _url(self, path: str) -> str:
+        return path if path.startswith("http") else f"{self.api_url}{path}"
+
+    @staticmethod
+    def _raise_for_status(response: requests.Response) -> None:
+        """Raise GithubException (like PyGithub does) for error responses."""
+        if response.status_code < 400:
+            return
+        try:
+            data = response.json()
+        except ValueError:
+            data = {"message": response.text[:200]}
+        raise GithubException(response.status_code, data, dict(response.headers))
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session.
+
+        Raises:
+            GithubException: For 4xx/5xx responses
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = self._url(path)
+        response = self.scheduler.execute(
+            method.upper(),
+            lambda: self.session.request(method, url, **kwargs),
+        )
+        self._count("requests")
+        self._raise_for_status(response)
+        return response
+
+    def send_json(self, method: str, path: str, payload: Dict[str, Any]) -> Any:
+        """
+        Send a JSON body (POST/PATCH) and return the parsed response.
+
+        Raises:
+            GithubException: For 4xx/5xx responses
+        """
+        response = self.request(method, path, json=payload)
+        return response.json() if response.content else None
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET a JSON resource, revalidating cached copies with If-None-Match.
+
+        Raises:
+            GithubException: For 4xx/5xx responses
+        """
+        url = self._url(path)
+        key = url if not params else f"{url}?{sorted(params.items())}"
+
+        with self._cache_lock:
+            cached = self._etag_cache.get(key)
+            if cached:
+                self._etag_cache.move_to_end(key)
+
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        response = self.scheduler.execute(
+            "GET",
+            lambda: self.session.get(url, params=params, headers=headers, timeout=self.timeout),
+            coalesce_key=(key, cached[0] if cached else None),
+        )
+        self._count("requests")
+
+        if response.status_code == 304 and cached:
+            self._count("not_modified")
+            return cached[1]
+
+        self._raise_for_status(response)
+        data = response.json()
+
+        etag = response.headers.get("ETag")
+        if etag and self._etag_cache_size > 0:
+            with self._cache_lock:
+                self._etag_cache[key] = (etag, data)
+                self._etag_cache.move_to_end(key)
+                while len(self._etag_cache) > self._etag_cache_size:
+                    self._etag_cache.popitem(last=False)
+
+        return data
+
+    # ===================
+    # Repository Reads
+    # ===================
+
+    def get_contents(self, path: str, ref: str = "main") -> Any:
+        """Contents API entry for a file (dict) or directory (list)."""
+        return self.get_json(
+            self.repo_path(f"/contents/{quote(path.strip('/'))}"),
+            params={"ref": ref},
+        )
+
+    def get_file_text(self, path: str, ref: str = "main") -> Tuple[str, str]:
+        """
+        Read a file as text.
+
+        Returns:
+            (content, blob_sha)
+
+        Raises:
+            IsADirectoryError: If the path is a directory
+            GithubException: For API errors (404 if missing)
+        """
+        entry = self.get_contents(path, ref)
+        if isinstance(entry, list):
+            raise IsADirectoryError(path)
+
+        if entry.get("encoding") == "base64" and entry.get("content"):
+            return base64.b64decode(entry["content"]).decode("utf-8"), entry["sha"]
+
+        # Files over 1 MB come back without inline content
+        return self.get_blob_text(entry["sha"]), entry["sha"]
+
+    def get_blob_bytes(self, sha: str) -> bytes:
+        """Read a git blob by SHA (immutable, so never ETag-cached)."""
+        blob = self.request("GET", self.repo_path(f"/git/blobs/{sha}")).json()
+        return base64.b64decode(blob["content"])
+
+    def get_blob_text(self, sha: str) -> str:
+        """Read a git blob by SHA as text."""
+        return self.get_blob_bytes(sha).decode("utf-8")
+
+    def get_branch(self, branch: str) -> Dict[str, Any]:
+        """Branch entry, including its head commit."""
+        return self.get_json(self.repo_path(f"/branches/{quote(branch, safe='')}"))
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Request, ETag cache and scheduler counters."""
+        with self._cache_lock:
+            stats = {**self.stats, "etag_entries": len(self._etag_cache)}
+        return {**stats, "scheduler": self.scheduler.get_stats()}
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+
+# Global client instance
+_client: Optional[GitHubClient] = None
+_client_lock = threading.Lock()
+
+
+def get_github_client() -> GitHubClient:
+    """Get or create the shared GitHub client for the configured repository."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                settings = get_settings()
+                _client = GitHubClient(
+                    token=settings.GITHUB_TOKEN,
+                    owner=settings.GITHUB_OWNER,
+                    repo=settings.GITHUB_REPO,
+                    api_url=settings.GITHUB_API_URL,
+                    pool_size=settings.GITHUB_HTTP_POOL_SIZE,
+                    etag_cache_size=settings.GITHUB_ETAG_CACHE_SIZE,
+                    scheduler=create_scheduler(),
+                )
+    return _client
+
+
+def close_github_client() -> None:
+    """Close the shared GitHub client."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
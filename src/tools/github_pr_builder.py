@@ -0,0 +1,257 @@
+"""
+Darwin Multi-Agent System - Batch Pull Requests
+===============================================
+Build one pull request from many `original_code → suggested_code` fixes
+across many files, using the Git Data API.
+
+All fixes are applied locally against a single base commit, then written
+as one tree and one commit:
+
+    POST /git/trees    (base_tree + inline contents of every changed file)
+    POST /git/commits  (one parent: the base commit)
+    POST /git/refs     (the PR branch)
+    POST /pulls
+    POST /issues/{n}/labels
+
+Reads go through the blob cache and tree index, so the API cost of a PR
+is a handful of requests no matter how many fixes it carries, and the
+change lands atomically: either every applied fix is in the commit, or
+nothing is pushed.
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Iterable, Sequence
+
+from github.GithubException import GithubException
+
+from src.config.settings import get_settings
+
+from .github_client import GitHubClient, get_github_client
+from .github_cache import RepoFileCache, get_file_cache, git_blob_sha
+from .patching import PatchError, PatchMatch, apply_patch_match
+
+
+# Mode of regular files created or rewritten without a known mode
+_FILE_MODE = "100644"
+
+# Labels added to every Darwin PR (missing labels are ignored)
+DEFAULT_LABELS = ("darwin-fix", "auto-generated")
+
+
+@dataclass
+class Fix:
+    """One code replacement in one file."""
+    file_path: str
+    original_code: str
+    suggested_code: str
+    description: str = ""
+
+
+@dataclass
+class PreparedChange:
+    """Fixes applied in memory against one base commit, ready to push."""
+    base_branch: str
+    base_commit: str
+    base_tree: str
+    files: Dict[str, str] = field(default_factory=dict)
+    applied: List[Fix] = field(default_factory=list)
+    matches: List[PatchMatch] = field(default_factory=list)  # One per applied fix
+    failed: List[Dict[str, str]] = field(default_factory=list)
+
+
+def make_branch_name(title: str) -> str:
+    """Branch name derived from a PR title, e.g. darwin/increase-touch-target-1712345678."""
+    clean_title = ''.join(c if c.isalnum() or c == ' ' else '' for c in title.lower())
+    clean_title = re.sub(r' +', '-', clean_title.strip())[:30].strip('-')
+    return f"darwin/{clean_title or 'fix'}-{int(time.time())}"
+
+
+class BatchPRBuilder:
+    """Create single-commit pull requests through the Git Data API."""
+
+    def __init__(self, client: GitHubClient, files: RepoFileCache):
+        self.client = client
+        self.files = files
+
+    def _base_tree(self, commit: str) -> str:
+        """Root tree SHA of a commit (from the tree index when available)."""
+        if self.files.trees is not None:
+            sha = self.files.trees.tree(commit).sha
+            if sha:
+                return sha
+        data = self.client.get_json(self.client.repo_path(f"/git/commits/{commit}"))
+        return data["tree"]["sha"]
+
+    def _file_mode(self, commit: str, path: str) -> str:
+        if self.files.trees is not None:
+            entry = self.files.trees.tree(commit).get(path)
+            if entry is not None and entry.mode:
+                return entry.mode
+        return _FILE_MODE
+
+    def prepare(self, fixes: Iterable[Fix], base_branch: str = "main") -> PreparedChange:
+        """
+        Apply fixes to the current head of `base_branch`.
+
+        Fixes to the same file are applied in order, each on top of the
+        previous one. A fix that does not apply is recorded in `failed`
+        and skipped; the others still go into the change.
+
+        Raises:
+            GithubException: If the base branch cannot be resolved
+        """
+        # Fresh head: the patches must apply to what the PR will be based on
+        base_commit = self.files.resolve_ref(base_branch, max_age=0)
+        change = PreparedChange(
+            base_branch=base_branch,
+            base_commit=base_commit,
+            base_tree=self._base_tree(base_commit),
+        )
+
+        for fix in fixes:
+            path = fix.file_path.strip("/")
+            try:
+                content = change.files.get(path)
+                if content is None:
+                    content, _ = self.files.read_file(path, ref=base_commit)
+                change.files[path], match = apply_patch_match(
+                    content, fix.original_code, fix.suggested_code
+                )
+                change.applied.append(fix)
+                change.matches.append(match)
+            except IsADirectoryError:
+                change.failed.append({"file_path": path, "error": "Path is a directory"})
+            except PatchError as e:
+                change.failed.append({"file_path": path, "error": str(e)})
+            except GithubException as e:
+                if e.status != 404:
+                    raise
+                change.failed.append({"file_path": path, "error": "File not found"})
+
+        return change
+
+    def commit(self, change: PreparedChange, message: str) -> str:
+        """Write the changed files as one tree and commit; returns the commit SHA."""
+        tree = self.client.send_json("POST", self.client.repo_path("/git/trees"), {
+            "base_tree": change.base_tree,
+            "tree": [
+                {
+                    "path": path,
+                    "mode": self._file_mode(change.base_commit, path),
+                    "type": "blob",
+                    "content": content,
+                }
+                for path, content in sorted(change.files.items())
+            ],
+        })
+        commit = self.client.send_json("POST", self.client.repo_path("/git/commits"), {
+            "message": message,
+            "tree": tree["sha"],
+            "parents": [change.base_commit],
+        })
+
+        # The new blobs are now known by SHA: later reads of the branch are free
+        for content in change.files.values():
+            data = content.encode("utf-8")
+            self.files.blobs.put(git_blob_sha(data), data)
+
+        return commit["sha"]
+
+    def push_branch(self, branch_name: str, commit_sha: str) -> None:
+        """Point `branch_name` at `commit_sha`, creating it if needed (fast-forward only)."""
+        try:
+            self.client.send_json("POST", self.client.repo_path("/git/refs"), {
+                "ref": f"refs/heads/{branch_name}",
+                "sha": commit_sha,
+            })
+        except GithubException as e:
+            if e.status != 422:  # 422: branch already exists
+                raise
+            self.client.send_json("PATCH", self.client.repo_path(f"/git/refs/heads/{branch_name}"), {
+                "sha": commit_sha,
+                "force": False,
+            })
+
+    def open_pull_request(
+        self,
+        change: PreparedChange,
+        title: str,
+        body: str,
+        branch_name: Optional[str] = None,
+        labels: Sequence[str] = DEFAULT_LABELS,
+    ) -> Dict[str, Any]:
+        """
+        Commit a prepared change to a new branch and open a PR for it.
+
+        Returns:
+            pr_number, pr_url, branch_name, commit_sha, files
+
+        Raises:
+            ValueError: If no fix was applied
+            GithubException: For API errors
+        """
+        if not change.files:
+            raise ValueError("No fixes could be applied; nothing to commit")
+
+        branch_name = branch_name or make_branch_name(title)
+        commit_sha = self.commit(change, f"🧬 Darwin: {title}")
+        self.push_branch(branch_name, commit_sha)
+
+        pr = self.client.send_json("POST", self.client.repo_path("/pulls"), {
+            "title": title,
+            "body": body,
+            "head": branch_name,
+            "base": change.base_branch,
+        })
+
+        if labels:
+            try:
+                self.client.send_json(
+                    "POST",
+                    self.client.repo_path(f"/issues/{pr['number']}/labels"),
+                    {"labels": list(labels)},
+                )
+            except GithubException:
+                pass  # Labels might not exist
+
+        return {
+            "pr_number": pr["number"],
+            "pr_url": pr["html_url"],
+            "branch_name": branch_name,
+            "commit_sha": commit_sha,
+            "files": sorted(change.files),
+        }
+
+    def create_pull_request(
+        self,
+        title: str,
+        body: str,
+        fixes: Iterable[Fix],
+        branch_name: Optional[str] = None,
+        base_branch: str = "main",
+        labels: Sequence[str] = DEFAULT_LABELS,
+    ) -> Dict[str, Any]:
+        """
+        Apply fixes and open a single PR with all of them.
+
+        Returns:
+            open_pull_request()'s result plus `applied` and `failed`
+        """
+        change = self.prepare(fixes, base_branch)
+        result = self.open_pull_request(change, title, body, branch_name, labels)
+        result["applied"] = len(change.applied)
+        result["failed"] = change.failed
+        return result
+
+
+def get_pr_builder() -> BatchPRBuilder:
+    """
+    PR builder for the configured repository: Git Data API by default, or
+    local commits pushed from the git mirror when GITHUB_BACKEND=mirror.
+    """
+    if get_settings().GITHUB_BACKEND == "mirror":
+        from .git_mirror import get_mirror_pr_builder
+        return get_mirror_pr_builder()
+    return BatchPRBuilder(get_github_client(), get_file_cache())
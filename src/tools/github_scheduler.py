@@ -0,0 +1,288 @@
+"""
+Darwin Multi-Agent System - GitHub Request Scheduler
+====================================================
+Central pacing, retry and coalescing for every GitHub REST call made
+through GitHubClient.
+
+- Token bucket fed by the `X-RateLimit-*` headers of each response: the
+  remaining quota (minus a reserve) is spread evenly until the reset
+  time, so a batch run slows down instead of running dry. With the
+  quota exhausted, requests wait for the reset.
+- Writes are spaced by GITHUB_WRITE_INTERVAL_SECONDS, as GitHub asks of
+  clients to avoid secondary rate limits.
+- 403 (rate limited) and 429 responses are retried after `Retry-After` /
+  the reset time, or with jittered exponential backoff. 5xx responses are
+  retried for reads only, since a failed write may have been applied.
+- Identical GET requests in flight at the same time share one response.
+- Wait times, retries and the latest quota are exposed via get_stats().
+"""
+
+import random
+import threading
+import time
+from typing import Optional, Dict, Any, Callable, Tuple
+
+import requests
+
+from src.config.settings import get_settings
+
+
+_WRITE_METHODS = {"POST", "PATCH", "PUT", "DELETE"}
+_RETRY_READ_STATUSES = {500, 502, 503, 504}
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to wait longer than allowed."""
+
+
+class _InFlight:
+    """A GET shared by concurrent identical callers."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[requests.Response] = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestScheduler:
+    """Rate-limit-aware executor for GitHub HTTP requests."""
+
+    def __init__(
+        self,
+        max_retries: int = 4,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 60.0,
+        reserve: int = 50,
+        write_interval_seconds: float = 1.0,
+        max_wait_seconds: float = 900.0,
+        burst: int = 10,
+    ):
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.reserve = reserve
+        self.write_interval_seconds = write_interval_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.burst = burst
+
+        self._lock = threading.Lock()
+        # Token bucket; unlimited until the first response reports a quota
+        self._tokens = float(burst)
+        self._rate: Optional[float] = None  # Tokens per second
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0  # Monotonic time before which nothing is sent
+        self._next_write_at = 0.0
+
+        self._limit: Optional[int] = None
+        self._remaining: Optional[int] = None
+        self._reset_epoch: Optional[float] = None
+
+        self._in_flight: Dict[Tuple, _InFlight] = {}
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "server_errors": 0,
+            "coalesced": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    # ===================
+    # Pacing
+    # ===================
+
+    def _reserve_slot(self, method: str) -> float:
+        """Take a token (and a write slot); returns how long to wait first."""
+        now = time.monotonic()
+        with self._lock:
+            if self._rate is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self._rate)
+            self._refilled_at = now
+
+            start = max(now, self._blocked_until)
+            if self._rate is not None:
+                self._tokens -= 1
+                if self._tokens < 0:
+                    # Wait until the bucket has refilled our token
+                    start = max(start, now + (-self._tokens / self._rate if self._rate > 0 else 0))
+
+            if method in _WRITE_METHODS:
+                start = max(start, self._next_write_at)
+                self._next_write_at = start + self.write_interval_seconds
+
+            return start - now
+
+    def _wait(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        if seconds > self.max_wait_seconds:
+            raise RateLimitExceeded(
+                f"GitHub rate limit: would wait {seconds:.0f}s (limit {self.max_wait_seconds:.0f}s)"
+            )
+        time.sleep(seconds)
+        with self._lock:
+            self.stats["waits"] += 1
+            self.stats["wait_seconds"] += seconds
+            self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], seconds)
+
+    def _observe(self, response: requests.Response) -> None:
+        """Update the quota and refill rate from rate-limit headers."""
+        headers = response.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            limit = int(headers.get("X-RateLimit-Limit", remaining))
+            reset_epoch = float(headers.get("X-RateLimit-Reset", time.time() + 3600))
+        except ValueError:
+            return
+
+        seconds_to_reset = max(1.0, reset_epoch - time.time())
+        with self._lock:
+            self._limit, self._remaining, self._reset_epoch = limit, remaining, reset_epoch
+            usable = remaining - self.reserve
+            if usable <= 0:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + seconds_to_reset)
+                self._rate = 0.0
+                self._tokens = 0.0
+            else:
+                self._rate = usable / seconds_to_reset
+                self._tokens = max(0.0, min(self._tokens, float(min(self.burst, usable))))
+
+    # ===================
+    # Retries
+    # ===================
+
+    def _retry_delay(self, response: requests.Response, method: str, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the response is final."""
+        status = response.status_code
+        headers = response.headers
+
+        rate_limited = status == 429 or (
+            status == 403 and (
+                headers.get("X-RateLimit-Remaining") == "0"
+                or "Retry-After" in headers
+                or "rate limit" in response.text[:500].lower()
+            )
+        )
+        if rate_limited:
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            if "Retry-After" in headers:
+                try:
+                    return float(headers["Retry-After"]) + random.uniform(0, 1)
+                except ValueError:
+                    pass
+            if headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+                try:
+                    return max(1.0, float(headers["X-RateLimit-Reset"]) - time.time() + 1)
+                except ValueError:
+                    pass
+            return self._backoff(attempt, minimum=60.0 if status == 403 else 0.0)
+
+        if status in _RETRY_READ_STATUSES and method not in _WRITE_METHODS:
+            with self._lock:
+                self.stats["server_errors"] += 1
+            return self._backoff(attempt)
+
+        return None
+
+    def _backoff(self, attempt: int, minimum: float = 0.0) -> float:
+        """Exponential backoff with full jitter."""
+        ceiling = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** attempt))
+        return max(minimum, random.uniform(0, ceiling))
+
+    # ===================
+    # Execution
+    # ===================
+
+    def _execute(self, method: str, send: Callable[[], requests.Response]) -> requests.Response:
+        attempt = 0
+        while True:
+            self._wait(self._reserve_slot(method))
+            response = send()
+            with self._lock:
+                self.stats["requests"] += 1
+            self._observe(response)
+
+            delay = self._retry_delay(response, method, attempt)
+            if delay is None or attempt >= self.max_retries:
+                return response
+
+            attempt += 1
+            with self._lock:
+                self.stats["retries"] += 1
+            self._wait(delay)
+
+    def execute(
+        self,
+        method: str,
+        send: Callable[[], requests.Response],
+        coalesce_key: Optional[Tuple] = None,
+    ) -> requests.Response:
+        """
+        Send a request through the scheduler.
+
+        Args:
+            method: HTTP method (writes are spaced and not retried on 5xx)
+            send: Performs the HTTP request; called once per attempt
+            coalesce_key: Identity of a GET; concurrent calls with the same
+                key share one request and its response
+
+        Raises:
+            RateLimitExceeded: If the quota resets later than max_wait_seconds
+        """
+        if coalesce_key is None or method != "GET":
+            return self._execute(method, send)
+
+        with self._lock:
+            flight = self._in_flight.get(coalesce_key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[coalesce_key] = _InFlight()
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+
+        try:
+            flight.response = self._execute(method, send)
+            return flight.response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(coalesce_key, None)
+            flight.done.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scheduler counters and the latest reported quota."""
+        with self._lock:
+            return {
+                **self.stats,
+                "wait_seconds": round(self.stats["wait_seconds"], 3),
+                "max_wait_seconds": round(self.stats["max_wait_seconds"], 3),
+                "rate_limit": self._limit,
+                "rate_limit_remaining": self._remaining,
+                "rate_limit_reset": self._reset_epoch,
+            }
+
+
+def create_scheduler() -> RequestScheduler:
+    """Scheduler configured from settings."""
+    settings = get_settings()
+    return RequestScheduler(
+        max_retries=settings.GITHUB_MAX_RETRIES,
+        retry_base_seconds=settings.GITHUB_RETRY_BASE_SECONDS,
+        retry_max_seconds=settings.GITHUB_RETRY_MAX_SECONDS,
+        reserve=settings.GITHUB_RATE_LIMIT_RESERVE,
+        write_interval_seconds=settings.GITHUB_WRITE_INTERVAL_SECONDS,
+        max_wait_seconds=settings.GITHUB_MAX_WAIT_SECONDS,
+    )
@@ -4,14 +4,17 @@ Darwin Multi-Agent System - GitHub Tools
 Custom CrewAI tools for GitHub operations.
 """
 
-from typing import Type, Optional
+import re
+from typing import Type, Optional, List, Any
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
-from github import Github, Auth
 from github.GithubException import GithubException
-import base64
 
-from src.config.settings import get_settings
+from .github_cache import get_file_reader
+from .github_tree import get_tree_index
+from .github_pr_builder import Fix, get_pr_builder
+from .progress import track_tool_calls, report_progress
+from .context_budget import budget_tool_output, call_limit, tokens_to_chars
 
 
 class GitHubReadInput(BaseModel):
@@ -23,8 +26,18 @@ class GitHubReadInput(BaseModel):
         default="main",
         description="Branch to read from"
     )
+    start_line: int = Field(
+        default=1,
+        description="First line to return (to continue a long file)"
+    )
+    end_line: Optional[int] = Field(
+        default=None,
+        description="Last line to return (default: as many as fit the context budget)"
+    )
 
 
+@track_tool_calls
+@budget_tool_output
 class GitHubReadTool(BaseTool):
     """
     Read file contents from a GitHub repository.
@@ -37,37 +50,56 @@ class GitHubReadTool(BaseTool):
     Read the contents of a file from the GitHub repository.
     Use this to examine source code that may be causing UX issues.
     Provide the file path relative to the repository root.
-    Returns the file contents as a string.
+    Returns the file contents with line numbers. Long files are returned
+    a part at a time; use start_line/end_line to read other lines.
     """
     args_schema: Type[BaseModel] = GitHubReadInput
     
-    def _run(self, file_path: str, branch: str = "main") -> str:
+    def _run(
+        self,
+        file_path: str,
+        branch: str = "main",
+        start_line: int = 1,
+        end_line: Optional[int] = None,
+    ) -> str:
         """Read file from GitHub."""
-        settings = get_settings()
-        
         try:
-            auth = Auth.Token(settings.GITHUB_TOKEN)
-            g = Github(auth=auth)
-            
-            repo = g.get_repo(f"{settings.GITHUB_OWNER}/{settings.GITHUB_REPO}")
+            reader = get_file_reader()
             
             try:
-                file_content = repo.get_contents(file_path, ref=branch)
+                content, _ = reader.read_file(file_path, ref=branch)
                 
-                if isinstance(file_content, list):
-                    return f"Error: '{file_path}' is a directory, not a file."
+                lines = content.split('\n')
+                first = max(start_line, 1)
+                last = min(end_line or len(lines), len(lines))
+                if first > last:
+                    return f"Error: '{file_path}' has {len(lines)} lines; start_line {start_line} is past the end."
                 
-                # Decode content
-                content = base64.b64decode(file_content.content).decode('utf-8')
+                # Add line numbers for reference, as many lines as fit the budget
+                max_chars = tokens_to_chars(call_limit()) - len(file_path) - 200
+                numbered = []
+                used = 0
+                for i in range(first - 1, last):
+                    line = f"{i+1:4d} | {lines[i]}"
+                    if numbered and used + len(line) + 1 > max_chars:
+                        break
+                    numbered.append(line)
+                    used += len(line) + 1
+                numbered_content = '\n'.join(numbered)
                 
-                # Add line numbers for reference
-                lines = content.split('\n')
-                numbered_content = '\n'.join(
-                    f"{i+1:4d} | {line}" for i, line in enumerate(lines)
-                )
+                shown_last = first + len(numbered) - 1
+                if first == 1 and shown_last == len(lines):
+                    footer = f"*{len(lines)} lines*"
+                else:
+                    footer = f"Lines {first}-{shown_last} of {len(lines)}"
+                    if shown_last < last:
+                        footer += f"; continue with start_line={shown_last + 1}"
+                    footer = f"*{footer}*"
                 
-                return f"## File: {file_path}\n\n```\n{numbered_content}\n```\n\n*{len(lines)} lines*"
+                return f"## File: {file_path}\n\n```\n{numbered_content}\n```\n\n{footer}"
                 
+            except IsADirectoryError:
+                return f"Error: '{file_path}' is a directory, not a file."
             except GithubException as e:
                 if e.status == 404:
                     return f"File not found: {file_path} on branch '{branch}'"
@@ -104,6 +136,7 @@ class GitHubPRInput(BaseModel):
     )
 
 
+@track_tool_calls
 class GitHubPRTool(BaseTool):
     """
     Create a GitHub Pull Request with code changes using PATCH approach.
@@ -140,59 +173,6 @@ class GitHubPRTool(BaseTool):
     """
     args_schema: Type[BaseModel] = GitHubPRInput
     
-    def _apply_patch(self, content: str, original_code: str, suggested_code: str) -> str:
-        """Apply the code patch using find-and-replace."""
-        # Normalize line endings
-        content = content.replace('\r\n', '\n')
-        original_code = original_code.replace('\r\n', '\n')
-        suggested_code = suggested_code.replace('\r\n', '\n')
-        
-        # Also handle escaped newlines from JSON
-        original_code = original_code.replace('\\n', '\n')
-        suggested_code = suggested_code.replace('\\n', '\n')
-        
-        # Try direct replacement first
-        if original_code in content:
-            return content.replace(original_code, suggested_code, 1)
-        
-        # Try with normalized whitespace (strip trailing spaces from each line)
-        original_lines = [line.rstrip() for line in original_code.split('\n')]
-        content_lines = content.split('\n')
-        content_lines_stripped = [line.rstrip() for line in content_lines]
-        
-        # Find matching section
-        for i in range(len(content_lines) - len(original_lines) + 1):
-            match = True
-            for j, orig_line in enumerate(original_lines):
-                if content_lines_stripped[i + j] != orig_line.rstrip():
-                    match = False
-                    break
-            
-            if match:
-                # Found the match - replace preserving original indentation
-                result_lines = content_lines[:i]
-                
-                # Get base indentation from first matched line
-                first_line = content_lines[i]
-                base_indent = len(first_line) - len(first_line.lstrip())
-                
-                # Add suggested code
-                for k, suggested_line in enumerate(suggested_code.split('\n')):
-                    if k == 0:
-                        # First line keeps original indentation
-                        result_lines.append(' ' * base_indent + suggested_line.lstrip())
-                    elif suggested_line.strip():
-                        # Non-empty lines: preserve relative indentation
-                        result_lines.append(' ' * base_indent + suggested_line.lstrip())
-                    else:
-                        # Empty lines
-                        result_lines.append('')
-                
-                result_lines.extend(content_lines[i + len(original_lines):])
-                return '\n'.join(result_lines)
-        
-        raise ValueError(f"Could not find original code in file. Make sure original_code matches exactly.")
-    
     def _run(
         self,
         title: str,
@@ -204,91 +184,42 @@ class GitHubPRTool(BaseTool):
         base_branch: str = "main"
     ) -> str:
         """Create a PR with the specified patch changes."""
-        settings = get_settings()
-        
         try:
-            auth = Auth.Token(settings.GITHUB_TOKEN)
-            g = Github(auth=auth)
-            
-            repo = g.get_repo(f"{settings.GITHUB_OWNER}/{settings.GITHUB_REPO}")
+            builder = get_pr_builder()
             
-            # Generate branch name if not provided
-            if not branch_name:
-                import time
-                timestamp = int(time.time())
-                # Clean title for branch name
-                clean_title = title.lower()
-                clean_title = ''.join(c if c.isalnum() or c == ' ' else '' for c in clean_title)
-                clean_title = clean_title.replace(' ', '-')[:30]
-                branch_name = f"darwin/{clean_title}-{timestamp}"
-            
-            # Get the base branch SHA
-            base_ref = repo.get_branch(base_branch)
-            base_sha = base_ref.commit.sha
-            
-            # Read current file content
-            try:
-                current_file = repo.get_contents(file_path, ref=base_branch)
-                current_content = base64.b64decode(current_file.content).decode('utf-8')
-                file_sha = current_file.sha
-            except GithubException as e:
-                if e.status == 404:
+            # Read the file at the current head of the base branch and apply the patch
+            change = builder.prepare(
+                [Fix(file_path, original_code, suggested_code)],
+                base_branch=base_branch,
+            )
+            if change.failed:
+                error = change.failed[0]["error"]
+                if error == "File not found":
                     return f"Error: File not found: {file_path}"
-                raise
-            
-            # Apply the patch
-            try:
-                new_content = self._apply_patch(current_content, original_code, suggested_code)
-            except ValueError as e:
-                return f"Error applying patch: {str(e)}"
-            
-            # Create new branch
-            try:
-                repo.create_git_ref(
-                    ref=f"refs/heads/{branch_name}",
-                    sha=base_sha
-                )
-            except GithubException as e:
-                if e.status == 422:  # Branch already exists
-                    pass
-                else:
-                    raise
+                return f"Error applying patch: {error}"
             
-            # Update file on the new branch
-            repo.update_file(
-                path=file_path,
-                message=f"🧬 Darwin: {title}",
-                content=new_content,
-                sha=file_sha,
-                branch=branch_name
-            )
+            # One commit on a new branch, then the Pull Request
+            result = builder.open_pull_request(change, title, body, branch_name)
             
-            # Create Pull Request
-            pr = repo.create_pull(
-                title=title,
-                body=body,
-                head=branch_name,
-                base=base_branch
+            report_progress(
+                "pr_created",
+                pr_number=result["pr_number"],
+                pr_url=result["pr_url"],
+                branch=result["branch_name"],
             )
             
-            # Add labels
-            try:
-                pr.add_to_labels("darwin-fix", "auto-generated")
-            except:
-                pass  # Labels might not exist
-            
             return f"""## ✅ Pull Request Created Successfully!
 
-**PR Number:** #{pr.number}
-**PR URL:** {pr.html_url}
-**Branch:** `{branch_name}` → `{base_branch}`
+**PR Number:** #{result["pr_number"]}
+**PR URL:** {result["pr_url"]}
+**Branch:** `{result["branch_name"]}` → `{base_branch}`
 
 ### Changes Made:
 - Modified: `{file_path}`
-- Applied patch: Replaced original code with suggested fix
+- Applied patch: Replaced original code with suggested fix at {change.matches[0].describe()}
 
 ### Next Steps:
-1. Review the changes at {pr.html_url}
+1. Review the changes at {result["pr_url"]}
 2. Request review from team members
 3. Merge when approved
 """
@@ -299,6 +230,146 @@ class GitHubPRTool(BaseTool):
             return f"Error creating PR: {str(e)}"
 
 
+class GitHubFixInput(BaseModel):
+    """One patch in a batch PR."""
+    file_path: str = Field(
+        description="Path to the file to modify"
+    )
+    original_code: str = Field(
+        description="The original code snippet to find and replace (copy exactly from the file)"
+    )
+    suggested_code: str = Field(
+        description="The new code to replace the original with"
+    )
+    description: str = Field(
+        default="",
+        description="Short description of this fix (listed in the PR body)"
+    )
+
+
+class GitHubBatchPRInput(BaseModel):
+    """Input schema for GitHub batch PR tool."""
+    title: str = Field(
+        description="PR title (e.g., '🧬 Darwin Fix: Checkout usability fixes')"
+    )
+    body: str = Field(
+        description="PR description in markdown format"
+    )
+    fixes: List[GitHubFixInput] = Field(
+        description="Patches to apply; may touch several files and several places in one file"
+    )
+    branch_name: Optional[str] = Field(
+        default=None,
+        description="Branch name (auto-generated if not provided)"
+    )
+    base_branch: str = Field(
+        default="main",
+        description="Target branch for the PR"
+    )
+
+
+@track_tool_calls
+class GitHubBatchPRTool(BaseTool):
+    """
+    Create ONE Pull Request containing many patches across many files.
+    
+    Used by: Engineer Agent
+    
+    All patches are applied against the same base commit and pushed as a
+    single commit, so a multi-part fix is reviewed and merged atomically.
+    """
+    
+    name: str = "github_create_batch_pr"
+    description: str = """
+    Create ONE GitHub Pull Request that applies several patches, possibly in
+    several files. Use this when a fix has more than one code change
+    (e.g. recommended_fix is a list, or has several code_changes).
+    
+    Provide title, body and a list of fixes, each with:
+    - file_path
+    - original_code: EXACT code snippet to find
+    - suggested_code: code to replace it with
+    
+    Patches to the same file are applied in the given order. Patches that
+    cannot be applied are skipped and reported; the PR contains the rest.
+    Returns the PR URL on success.
+    """
+    args_schema: Type[BaseModel] = GitHubBatchPRInput
+    
+    def _run(
+        self,
+        title: str,
+        body: str,
+        fixes: List[Any],
+        branch_name: Optional[str] = None,
+        base_branch: str = "main"
+    ) -> str:
+        """Create a PR with all applicable patches."""
+        try:
+            fix_list = []
+            for item in fixes:
+                if isinstance(item, BaseModel):
+                    item = item.model_dump()
+                fix_list.append(Fix(
+                    file_path=item["file_path"],
+                    original_code=item["original_code"],
+                    suggested_code=item["suggested_code"],
+                    description=item.get("description", ""),
+                ))
+            
+            if not fix_list:
+                return "Error: No fixes provided"
+            
+            builder = get_pr_builder()
+            change = builder.prepare(fix_list, base_branch=base_branch)
+            
+            if not change.files:
+                return "Error applying patches: no patch could be applied\n" + '\n'.join(
+                    f"- `{f['file_path']}`: {f['error']}" for f in change.failed
+                )
+            
+            result = builder.open_pull_request(change, title, body, branch_name)
+            result["applied"] = len(change.applied)
+            result["failed"] = change.failed
+            
+            report_progress(
+                "pr_created",
+                pr_number=result["pr_number"],
+                pr_url=result["pr_url"],
+                branch=result["branch_name"],
+                files=len(result["files"]),
+                fixes=result["applied"],
+            )
+            
+            output = f"""## ✅ Pull Request Created Successfully!
+
+**PR Number:** #{result["pr_number"]}
+**PR URL:** {result["pr_url"]}
+**Branch:** `{result["branch_name"]}` → `{base_branch}`
+
+### Changes Made:
+"""
+            output += '\n'.join(f"- Modified: `{path}`" for path in result["files"])
+            output += '\n' + '\n'.join(
+                f"- Patched `{fix.file_path}` at {match.describe()}"
+                for fix, match in zip(change.applied, change.matches)
+            )
+            output += f"\n- Applied {result['applied']} of {len(fix_list)} patches in one commit\n"
+            
+            if result["failed"]:
+                output += "\n### ⚠️ Skipped Patches:\n"
+                output += '\n'.join(
+                    f"- `{f['file_path']}`: {f['error']}" for f in result["failed"]
+                ) + '\n'
+            
+            return output
+            
+        except GithubException as e:
+            return f"GitHub API Error: {e.status} - {e.data.get('message', str(e))}"
+        except Exception as e:
+            return f"Error creating PR: {str(e)}"
+
+
 class GitHubBranchInput(BaseModel):
     """Input schema for GitHub branch check tool."""
     branch_name: str = Field(
@@ -306,6 +377,7 @@ class GitHubBranchInput(BaseModel):
     )
 
 
+@track_tool_calls
 class GitHubCheckBranchTool(BaseTool):
     """
     Check if a branch exists in the repository.
@@ -322,16 +394,11 @@ class GitHubCheckBranchTool(BaseTool):
     
     def _run(self, branch_name: str) -> str:
         """Check if branch exists."""
-        settings = get_settings()
-        
         try:
-            auth = Auth.Token(settings.GITHUB_TOKEN)
-            g = Github(auth=auth)
-            
-            repo = g.get_repo(f"{settings.GITHUB_OWNER}/{settings.GITHUB_REPO}")
+            reader = get_file_reader()
             
             try:
-                repo.get_branch(branch_name)
+                reader.resolve_ref(branch_name, max_age=0)
                 return f"Branch '{branch_name}' exists."
             except GithubException as e:
                 if e.status == 404:
@@ -354,6 +421,8 @@ class GitHubListFilesInput(BaseModel):
     )
 
 
+@track_tool_calls
+@budget_tool_output
 class GitHubListFilesTool(BaseTool):
     """
     List files in a directory of the repository.
@@ -371,47 +440,227 @@ class GitHubListFilesTool(BaseTool):
     
     def _run(self, directory: str = "", branch: str = "main") -> str:
         """List files in directory."""
-        settings = get_settings()
-        
         try:
-            auth = Auth.Token(settings.GITHUB_TOKEN)
-            g = Github(auth=auth)
+            tree = get_tree_index().tree(branch)
+            contents = tree.list_directory(directory or "")
             
-            repo = g.get_repo(f"{settings.GITHUB_OWNER}/{settings.GITHUB_REPO}")
+            if contents is None:
+                entry = tree.get(directory)
+                if entry is None:
+                    return f"Directory not found: {directory}"
+                contents = [entry]
             
-            try:
-                contents = repo.get_contents(directory or "", ref=branch)
-                
-                if not isinstance(contents, list):
-                    contents = [contents]
-                
-                dirs = []
-                files = []
-                
-                for item in contents:
-                    if item.type == "dir":
-                        dirs.append(f"📁 {item.path}/")
-                    else:
-                        size = item.size
-                        files.append(f"📄 {item.path} ({size} bytes)")
-                
-                output = f"## Contents of `{directory or '/'}`\n\n"
-                
-                if dirs:
-                    output += "### Directories\n"
-                    output += '\n'.join(sorted(dirs)) + '\n\n'
-                
-                if files:
-                    output += "### Files\n"
-                    output += '\n'.join(sorted(files)) + '\n'
+            dirs = []
+            files = []
+            
+            for item in contents:
+                if item.is_dir:
+                    dirs.append(f"📁 {item.path}/")
+                else:
+                    files.append(f"📄 {item.path} ({item.size or 0} bytes)")
+            
+            output = f"## Contents of `{directory or '/'}`\n\n"
+            
+            if dirs:
+                output += "### Directories\n"
+                output += '\n'.join(dirs) + '\n\n'
+            
+            if files:
+                output += "### Files\n"
+                output += '\n'.join(files) + '\n'
+            
+            output += f"\n*{len(dirs)} directories, {len(files)} files*"
+            return output
                 
-                output += f"\n*{len(dirs)} directories, {len(files)} files*"
-                return output
+        except GithubException as e:
+            if e.status == 404:
+                return f"Branch not found: {branch}"
+            return f"Error listing files: {str(e)}"
+        except Exception as e:
+            return f"Error listing files: {str(e)}"
+
+
+class GitHubFindFilesInput(BaseModel):
+    """Input schema for GitHub find files tool."""
+    pattern: str = Field(
+        description=(
+            "Glob such as 'app/**/*.tsx' (when it contains * or ?), "
+            "otherwise a file name or path fragment such as 'ProductCard'"
+        )
+    )
+    branch: str = Field(
+        default="main",
+        description="Branch to search"
+    )
+    limit: int = Field(
+        default=50,
+        description="Maximum number of paths to return"
+    )
+
+
+@track_tool_calls
+@budget_tool_output
+class GitHubFindFilesTool(BaseTool):
+    """
+    Find files anywhere in the repository by glob or name.
+    
+    Used by: Analyst Agent, Engineer Agent
+    """
+    
+    name: str = "github_find_files"
+    description: str = """
+    Find files anywhere in the GitHub repository without walking directories.
+    Pass a glob (e.g. 'app/**/*.tsx', '**/checkout*') or a file name /
+    path fragment (e.g. 'ProductCard', 'cart'). Best matches come first.
+    """
+    args_schema: Type[BaseModel] = GitHubFindFilesInput
+    
+    def _run(self, pattern: str, branch: str = "main", limit: int = 50) -> str:
+        """Search the repository tree."""
+        try:
+            tree = get_tree_index().tree(branch)
+            
+            if any(ch in pattern for ch in "*?"):
+                matches = tree.glob(pattern)
+            else:
+                matches = tree.find(pattern, limit=limit + 1)
+            
+            if not matches:
+                return f"No files matching '{pattern}' on branch '{branch}'"
+            
+            shown = matches[:limit]
+            output = f"## Files matching `{pattern}`\n\n"
+            output += '\n'.join(f"📄 {e.path} ({e.size or 0} bytes)" for e in shown)
+            if len(matches) > limit:
+                output += f"\n\n*Showing first {limit} matches; narrow the pattern for more*"
+            else:
+                output += f"\n\n*{len(shown)} files*"
+            if tree.truncated:
+                output += "\n*Repository tree was truncated by GitHub; results may be incomplete*"
+            return output
                 
-            except GithubException as e:
-                if e.status == 404:
-                    return f"Directory not found: {directory}"
-                raise
+        except GithubException as e:
+            if e.status == 404:
+                return f"Branch not found: {branch}"
+            return f"Error finding files: {str(e)}"
+        except Exception as e:
+            return f"Error finding files: {str(e)}"
+
+
+class GitHubGrepInput(BaseModel):
+    """Input schema for GitHub grep tool."""
+    pattern: str = Field(
+        description="Regular expression to search for (e.g., 'padding: ?8', 'onPress=\\{addToCart')"
+    )
+    path_glob: str = Field(
+        default="",
+        description="Only search files matching this glob (e.g., 'app/**/*.tsx'); empty for all files (needs a git mirror)"
+    )
+    branch: str = Field(
+        default="main",
+        description="Branch to search"
+    )
+    ignore_case: bool = Field(
+        default=False,
+        description="Case-insensitive search"
+    )
+    max_results: int = Field(
+        default=50,
+        description="Maximum number of matching lines to return"
+    )
+
+
+# Files scanned per grep when reading through the REST API (one request
+# per uncached file, paced by the scheduler)
+_API_GREP_MAX_FILES = 30
+
+
+@track_tool_calls
+@budget_tool_output
+class GitHubGrepTool(BaseTool):
+    """
+    Search file contents across the repository.
+    
+    Used by: Analyst Agent, Engineer Agent
+    """
+    
+    name: str = "github_grep"
+    description: str = """
+    Search the contents of repository files with a regular expression.
+    Returns matching lines as path:line: text. Use path_glob (e.g. 'app/**/*.tsx')
+    to narrow the search; it is required unless a local git mirror is
+    configured (GITHUB_BACKEND=mirror). Useful to find where a component,
+    style or handler is defined before reading whole files.
+    """
+    args_schema: Type[BaseModel] = GitHubGrepInput
+    
+    def _run(
+        self,
+        pattern: str,
+        path_glob: str = "",
+        branch: str = "main",
+        ignore_case: bool = False,
+        max_results: int = 50,
+    ) -> str:
+        """Search file contents."""
+        try:
+            reader = get_file_reader()
+            note = ""
+            
+            if hasattr(reader, "grep"):
+                # Local git mirror: git grep over the whole commit
+                matches = reader.grep(
+                    pattern, ref=branch,
+                    paths=[path_glob] if path_glob else None,
+                    ignore_case=ignore_case,
+                    max_results=max_results,
+                )
+            else:
+                # REST API: scan cached blobs of the matching files
+                if not path_glob:
+                    return (
+                        "Error: path_glob is required (e.g. 'app/**/*.tsx'). Searching the whole "
+                        "repository through the GitHub API costs one request per file; full-repo "
+                        "grep needs a local mirror (set GITHUB_BACKEND=mirror). Use "
+                        "github_find_files to locate candidate files first."
+                    )
+                regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+                tree = get_tree_index().tree(branch)
+                files = tree.glob(path_glob)
+                if len(files) > _API_GREP_MAX_FILES:
+                    note = (
+                        f"\n*Searched the first {_API_GREP_MAX_FILES} of {len(files)} files; "
+                        f"narrow path_glob (or set GITHUB_BACKEND=mirror for a local mirror) "
+                        f"for complete results*"
+                    )
+                    files = files[:_API_GREP_MAX_FILES]
                 
+                matches = []
+                for entry in files:
+                    try:
+                        content, _ = reader.read_file(entry.path, ref=tree.commit)
+                    except UnicodeDecodeError:
+                        continue  # Binary file
+                    for number, line in enumerate(content.split('\n'), 1):
+                        if regex.search(line):
+                            matches.append((entry.path, number, line))
+                    if len(matches) >= max_results:
+                        break
+                matches = matches[:max_results]
+            
+            if not matches:
+                return f"No matches for `{pattern}` on branch '{branch}'" + note
+            
+            output = f"## Matches for `{pattern}`\n\n```\n"
+            output += '\n'.join(f"{path}:{number}: {line.strip()[:200]}" for path, number, line in matches)
+            output += f"\n```\n\n*{len(matches)} matching lines*" + note
+            return output
+            
+        except re.error as e:
+            return f"Error: invalid pattern: {str(e)}"
+        except GithubException as e:
+            if e.status == 404:
+                return f"Branch not found: {branch}"
+            return f"Error searching files: {str(e)}"
         except Exception as e:
-            return f"Error listing files: {str(e)}"
+            return f"Error searching files: {str(e)}"
@@ -0,0 +1,283 @@
+"""
+Darwin Multi-Agent System - Repository Tree Index
+=================================================
+Index of every path in the repository at a commit, built from a single
+recursive git-trees request and cached per commit SHA (in memory and on
+disk, since a commit's tree never changes).
+
+Directory listings, glob matches and file-name searches are answered
+locally, without API calls.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from src.config.settings import get_settings
+from .github_client import GitHubClient
+from .github_cache import RepoFileCache, get_file_cache
+
+
+# Commit trees kept in memory
+_MAX_TREES = 4
+
+
+class TreeEntry:
+    """A file ('blob') or directory ('tree') in the index."""
+
+    __slots__ = ("path", "type", "sha", "size", "mode")
+
+    def __init__(
+        self,
+        path: str,
+        type: str,
+        sha: str,
+        size: Optional[int] = None,
+        mode: Optional[str] = None,
+    ):
+        self.path = path
+        self.type = type
+        self.sha = sha
+        self.size = size
+        self.mode = mode
+
+    @property
+    def is_dir(self) -> bool:
+        return self.type == "tree"
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+
+def glob_to_regex(pattern: str) -> re.Pattern:
+    """
+    Compile a path glob: `*` and `?` stay within one path segment, `**`
+    spans segments. Brackets are literal, so Next.js / Expo route files
+    like `app/product/[id].tsx` match themselves.
+    """
+    pattern = pattern.strip("/")
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("^" + "".join(out) + "$")
+
+
+class RepoTree:
+    """All paths of one commit, indexed for local queries."""
+
+    def __init__(
+        self,
+        commit: str,
+        entries: List[TreeEntry],
+        truncated: bool = False,
+        sha: Optional[str] = None,
+    ):
+        self.commit = commit
+        self.sha = sha  # Root tree SHA
+        self.truncated = truncated
+        self.entries: Dict[str, TreeEntry] = {e.path: e for e in entries}
+        self.children: Dict[str, List[TreeEntry]] = {}
+        for entry in entries:
+            parent = entry.path.rsplit("/", 1)[0] if "/" in entry.path else ""
+            self.children.setdefault(parent, []).append(entry)
+
+    @classmethod
+    def from_api(cls, commit: str, data: Dict[str, Any]) -> "RepoTree":
+        return cls(
+            commit,
+            [
+                TreeEntry(
+                    item["path"], item["type"], item["sha"],
+                    item.get("size"), item.get("mode"),
+                )
+                for item in data.get("tree", [])
+                if item["type"] in ("blob", "tree")
+            ],
+            truncated=data.get("truncated", False),
+            sha=data.get("sha"),
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "sha": self.sha,
+            "truncated": self.truncated,
+            "tree": [
+                {"path": e.path, "type": e.type, "sha": e.sha, "size": e.size, "mode": e.mode}
+                for e in self.entries.values()
+            ],
+        }
+
+    def get(self, path: str) -> Optional[TreeEntry]:
+        return self.entries.get(path.strip("/"))
+
+    def list_directory(self, directory: str = "") -> Optional[List[TreeEntry]]:
+        """Direct children of a directory, or None if it does not exist."""
+        directory = directory.strip("/")
+        if directory and (directory not in self.entries or not self.entries[directory].is_dir):
+            return None
+        return sorted(self.children.get(directory, []), key=lambda e: e.path)
+
+    def glob(self, pattern: str, include_dirs: bool = False) -> List[TreeEntry]:
+        """Entries whose path matches a glob such as `app/**/*.tsx`."""
+        regex = glob_to_regex(pattern)
+        return sorted(
+            (e for e in self.entries.values()
+             if (include_dirs or not e.is_dir) and regex.match(e.path)),
+            key=lambda e: e.path,
+        )
+
+    def find(self, query: str, limit: int = 50) -> List[TreeEntry]:
+        """
+        Files whose name or a path component contains `query`
+        (case-insensitive). Exact file names rank first, then name
+        matches, then directory component matches.
+        """
+        query = query.strip("/").lower()
+        ranked = []
+        for entry in self.entries.values():
+            if entry.is_dir:
+                continue
+            path = entry.path.lower()
+            name = entry.name.lower()
+            stem = name.rsplit(".", 1)[0]
+            if name == query or stem == query or path == query:
+                rank = 0
+            elif query in name:
+                rank = 1
+            elif query in path:
+                rank = 2
+            else:
+                continue
+            ranked.append((rank, len(entry.path), entry.path, entry))
+        ranked.sort(key=lambda r: r[:3])
+        return [r[3] for r in ranked[:limit]]
+
+
+class RepoTreeIndex:
+    """Per-commit tree cache backed by the git trees API."""
+
+    def __init__(
+        self,
+        client: GitHubClient,
+        files: RepoFileCache,
+        directory: Optional[str] = None,
+    ):
+        self.client = client
+        self.files = files
+        self.directory = Path(directory) if directory else None
+        self._trees: "OrderedDict[str, RepoTree]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self.stats = {"api_loads": 0, "disk_loads": 0, "memory_hits": 0}
+
+    def _disk_path(self, commit: str) -> Optional[Path]:
+        return self.directory / f"{commit}.json" if self.directory else None
+
+    def _load(self, commit: str) -> RepoTree:
+        path = self._disk_path(commit)
+        if path is not None and path.exists():
+            try:
+                tree = RepoTree.from_api(commit, json.loads(path.read_text()))
+                self.stats["disk_loads"] += 1
+                return tree
+            except (ValueError, KeyError):
+                path.unlink(missing_ok=True)
+
+        data = self.client.get_json(
+            self.client.repo_path(f"/git/trees/{commit}"),
+            params={"recursive": "1"},
+        )
+        tree = RepoTree.from_api(commit, data)
+        self.stats["api_loads"] += 1
+
+        if path is not None and not tree.truncated:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(tree.to_json()))
+            os.replace(tmp, path)
+        return tree
+
+    def tree(self, ref: str = "main") -> RepoTree:
+        """Tree of `ref` (branch or commit SHA), loaded at most once per commit."""
+        commit = self.files.resolve_ref(ref)
+
+        with self._lock:
+            tree = self._trees.get(commit)
+            if tree is not None:
+                self._trees.move_to_end(commit)
+                self.stats["memory_hits"] += 1
+                return tree
+            loading = self._loading.setdefault(commit, threading.Lock())
+
+        # Concurrent callers for the same commit wait for one load
+        with loading:
+            with self._lock:
+                tree = self._trees.get(commit)
+            if tree is None:
+                try:
+                    tree = self._load(commit)
+                    with self._lock:
+                        self._trees[commit] = tree
+                        while len(self._trees) > _MAX_TREES:
+                            self._trees.popitem(last=False)
+                finally:
+                    with self._lock:
+                        self._loading.pop(commit, None)
+        return tree
+
+    def lookup(self, commit: str, path: str) -> Optional[Tuple[str, str]]:
+        """(type, sha) of a path if the commit's tree is complete, else None."""
+        tree = self.tree(commit)
+        if tree.truncated:
+            return None
+        entry = tree.get(path)
+        if entry is None:
+            return ("missing", "")
+        return ("dir" if entry.is_dir else "file", entry.sha)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "trees_in_memory": len(self._trees)}
+
+
+def create_tree_index(files: RepoFileCache) -> RepoTreeIndex:
+    """Tree index for the file cache's repository, persisted under GITHUB_CACHE_DIR."""
+    settings = get_settings()
+    client = files.client
+    directory = None
+    if settings.GITHUB_CACHE_DIR:
+        directory = os.path.join(
+            settings.GITHUB_CACHE_DIR, "trees", client.owner, client.repo_name
+        )
+    return RepoTreeIndex(client, files, directory)
+
+
+def get_tree_index():
+    """
+    Get the shared tree index (owned by the shared file cache), or the
+    local git mirror when GITHUB_BACKEND=mirror. Both provide tree(ref).
+    """
+    if get_settings().GITHUB_BACKEND == "mirror":
+        from .git_mirror import get_git_mirror
+        return get_git_mirror()
+    return get_file_cache().trees
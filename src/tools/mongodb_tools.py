@@ -22,6 +22,9 @@ from src.db import (
     serialize_doc,
     serialize_docs,
 )
+from .progress import track_tool_calls, report_progress
+from .compact_output import compact_documents, dumps_compact, resolve_output_format
+from .context_budget import budget_tool_output, call_limit, elide_fields, fit_items, tokens_to_chars
 
 
 class MongoDBReadInput(BaseModel):
@@ -37,13 +40,38 @@ class MongoDBReadInput(BaseModel):
         default=10,
         description="Maximum number of documents to return"
     )
+    output_format: Optional[str] = Field(
+        default=None,
+        description="'compact' (one columnar JSON table) or 'markdown' (one JSON block per document); default from settings"
+    )
+
+
+# Collections agents may read
+READABLE_COLLECTIONS = [
+    'signals', 'ux_issues', 'tasks', 
+    'pull_requests', 'agent_logs',
+    'code_fixes', 'product_metrics', 'insights'
+]
+
+
+def pack_document(collection: str, doc: dict) -> dict:
+    """Document with long fields elided behind mongodb_read_field handles."""
+    doc_id = doc.get("_id")
+    return elide_fields(
+        doc,
+        lambda path: f"mongodb_read_field(collection='{collection}', doc_id='{doc_id}', field='{path}')",
+    )
 
 
+@track_tool_calls
+@budget_tool_output
 class MongoDBReadTool(BaseTool):
     """
     Read documents from MongoDB collections.
     
     Used by: All Agents
+    
+    Python callers can use fetch() for the documents themselves.
     """
     
     name: str = "mongodb_read"
@@ -61,6 +89,9 @@ class MongoDBReadTool(BaseTool):
     - '{"status": "new"}' - Find new signals
     - '{"processed": false}' - Find unprocessed items
     - '{}' - Get all documents
+    
+    output_format 'compact' returns one columnar JSON table
+    (columns = field names, one row per document).
     """
     args_schema: Type[BaseModel] = MongoDBReadInput
     
@@ -68,42 +99,65 @@ class MongoDBReadTool(BaseTool):
         self,
         collection: str,
         query: str = "{}",
-        limit: int = 10
+        limit: int = 10,
+        output_format: Optional[str] = None
     ) -> str:
         """Read documents from MongoDB."""
         try:
-            # Parse query
-            try:
-                query_dict = json.loads(query)
-            except json.JSONDecodeError:
-                return f"Invalid JSON query: {query}"
-            
-            # Validate collection
-            valid_collections = [
-                'signals', 'ux_issues', 'tasks', 
-                'pull_requests', 'agent_logs',
-                'code_fixes', 'product_metrics', 'insights'
-            ]
-            if collection not in valid_collections:
-                return f"Invalid collection: {collection}. Use one of: {valid_collections}"
-            
-            # Execute query
-            docs = find_many(collection, query_dict, limit=limit)
+            output_format = resolve_output_format(output_format)
+            docs = self.fetch(collection, query, limit)
             
             if not docs:
                 return f"No documents found in '{collection}' matching query: {query}"
             
+            # Elide long fields, then keep the documents that fit the context budget
+            docs, omitted = fit_items([pack_document(collection, doc) for doc in docs], call_limit())
+            note = (
+                f"{omitted} more document(s) not shown (context budget); narrow the query or lower the limit"
+                if omitted else None
+            )
+            
+            if output_format == "compact":
+                result = {"collection": collection, **compact_documents(docs)}
+                if note:
+                    result["note"] = note
+                return dumps_compact(result)
+            
             # Format output
-            output = f"## Found {len(docs)} document(s) in `{collection}`\n\n"
+            output = f"## Found {len(docs) + omitted} document(s) in `{collection}`\n\n"
             
             for i, doc in enumerate(docs, 1):
                 output += f"### Document {i}\n"
                 output += f"```json\n{json.dumps(doc, indent=2, default=str)}\n```\n\n"
             
+            if note:
+                output += f"*{note}*\n"
             return output
             
+        except ValueError as e:
+            return str(e)
         except Exception as e:
             return f"Error reading from MongoDB: {str(e)}"
+    
+    def fetch(self, collection: str, query: str = "{}", limit: int = 10) -> List[dict]:
+        """
+        Documents matching a JSON query, without any formatting.
+        
+        Raises:
+            ValueError: Invalid JSON query or collection
+        """
+        # Parse query
+        try:
+            query_dict = json.loads(query)
+        except json.JSONDecodeError:
+            raise ValueError(f"Invalid JSON query: {query}")
+        
+        # Validate collection
+        if collection not in READABLE_COLLECTIONS:
+            raise ValueError(f"Invalid collection: {collection}. Use one of: {READABLE_COLLECTIONS}")
+        
+        # Execute query
+        return find_many(collection, query_dict, limit=limit)
 
 
 class MongoDBWriteInput(BaseModel):
@@ -116,6 +170,7 @@ class MongoDBWriteInput(BaseModel):
     )
 
 
+@track_tool_calls
 class MongoDBWriteTool(BaseTool):
     """
     Write documents to MongoDB collections.
@@ -227,6 +282,7 @@ class MongoDBWriteTool(BaseTool):
                         "needs_manual_review": True
                     }
                     doc_id = insert_one(collection, doc_dict)
+                    report_progress("document_written", collection=collection, doc_id=doc_id, operation="insert")
                     return f"⚠️ JSON parsing failed, saved raw content.\n\n**Collection:** {collection}\n**Document ID:** {doc_id}\n**Error:** {parse_error}\n\nPlease ensure JSON is properly escaped."
                 except Exception as fallback_error:
                     return f"Invalid JSON document. Error: {parse_error}\n\nFirst 200 chars: {document[:200]}...\n\nTip: Ensure all quotes in code snippets are escaped with backslash."
@@ -238,6 +294,7 @@ class MongoDBWriteTool(BaseTool):
             
             # Insert
             doc_id = insert_one(collection, doc_dict)
+            report_progress("document_written", collection=collection, doc_id=doc_id, operation="insert")
             
             return f"✅ Document inserted successfully!\n\n**Collection:** {collection}\n**Document ID:** {doc_id}"
             
@@ -258,6 +315,7 @@ class MongoDBUpdateInput(BaseModel):
     )
 
 
+@track_tool_calls
 class MongoDBUpdateTool(BaseTool):
     """
     Update a document in MongoDB.
@@ -293,6 +351,7 @@ class MongoDBUpdateTool(BaseTool):
             success = update_by_id(collection, doc_id, updates_dict)
             
             if success:
+                report_progress("document_written", collection=collection, doc_id=doc_id, operation="update")
                 return f"✅ Document updated successfully!\n\n**Collection:** {collection}\n**Document ID:** {doc_id}\n**Updated fields:** {list(updates_dict.keys())}"
             else:
                 return f"⚠️ Document not found or no changes made.\n\n**Collection:** {collection}\n**Document ID:** {doc_id}"
@@ -311,6 +370,8 @@ class MongoDBFindByIdInput(BaseModel):
     )
 
 
+@track_tool_calls
+@budget_tool_output
 class MongoDBFindByIdTool(BaseTool):
     """
     Find a single document by its ID.
@@ -331,6 +392,7 @@ class MongoDBFindByIdTool(BaseTool):
             doc = find_by_id(collection, doc_id)
             
             if doc:
+                doc = pack_document(collection, doc)
                 return f"## Document Found\n\n**Collection:** {collection}\n\n```json\n{json.dumps(doc, indent=2, default=str)}\n```"
             else:
                 return f"Document not found in '{collection}' with ID: {doc_id}"
@@ -339,6 +401,79 @@ class MongoDBFindByIdTool(BaseTool):
             return f"Error finding document: {str(e)}"
 
 
+class MongoDBReadFieldInput(BaseModel):
+    """Input schema for MongoDB read field tool."""
+    collection: str = Field(
+        description="Collection name"
+    )
+    doc_id: str = Field(
+        description="Document ID"
+    )
+    field: str = Field(
+        description="Dotted field path from an elided value (e.g., 'recommended_fix.original_code')"
+    )
+    offset: int = Field(
+        default=0,
+        description="Character offset to continue a long value from"
+    )
+
+
+@track_tool_calls
+@budget_tool_output
+class MongoDBReadFieldTool(BaseTool):
+    """
+    Read one (possibly long) field of a document.
+    
+    Used by: All Agents
+    """
+    
+    name: str = "mongodb_read_field"
+    description: str = """
+    Read the full value of one document field, e.g. a value shown as
+    <elided ...> by mongodb_read. Provide the collection, document ID and
+    dotted field path from the elided summary. Long values are returned in
+    parts; pass the offset given at the end to read the next part.
+    """
+    args_schema: Type[BaseModel] = MongoDBReadFieldInput
+    
+    def _run(self, collection: str, doc_id: str, field: str, offset: int = 0) -> str:
+        """Read a document field."""
+        try:
+            if collection not in READABLE_COLLECTIONS:
+                return f"Invalid collection: {collection}. Use one of: {READABLE_COLLECTIONS}"
+            
+            doc = find_by_id(collection, doc_id)
+            if not doc:
+                return f"Document not found in '{collection}' with ID: {doc_id}"
+            
+            value: Any = doc
+            for key in field.split("."):
+                if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+                    value = value[int(key)]
+                elif isinstance(value, dict) and key in value:
+                    value = value[key]
+                else:
+                    return f"Field '{field}' not found in {collection}/{doc_id}"
+            
+            text = value if isinstance(value, str) else json.dumps(value, indent=1, default=str)
+            header = f"## `{field}` of {collection}/{doc_id}\n\n"
+            # Room for the header, fences and continuation note
+            size = max(tokens_to_chars(call_limit()) - len(header) - 200, 200)
+            part = text[offset:offset + size]
+            output = f"{header}```\n{part}\n```\n"
+            
+            end = offset + len(part)
+            if offset > 0 or end < len(text):
+                note = f"Characters {offset}-{end} of {len(text)}"
+                if end < len(text):
+                    note += f"; continue with offset={end}"
+                output += f"\n*{note}*"
+            return output
+            
+        except Exception as e:
+            return f"Error reading field: {str(e)}"
+
+
 class MongoDBCountInput(BaseModel):
     """Input schema for MongoDB count tool."""
     collection: str = Field(
@@ -350,6 +485,7 @@ class MongoDBCountInput(BaseModel):
     )
 
 
+@track_tool_calls
 class MongoDBCountTool(BaseTool):
     """
     Count documents in a collection.
@@ -390,6 +526,8 @@ class GetUnprocessedSignalsInput(BaseModel):
     )
 
 
+@track_tool_calls
+@budget_tool_output
 class GetUnprocessedSignalsTool(BaseTool):
     """
     Get unprocessed signals for analysis.
@@ -443,6 +581,8 @@ class GetPendingTasksInput(BaseModel):
     )
 
 
+@track_tool_calls
+@budget_tool_output
 class GetPendingTasksTool(BaseTool):
     """
     Get pending tasks for the Engineer to work on.
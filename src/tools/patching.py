@@ -0,0 +1,300 @@
+"""
+Darwin Multi-Agent System - Code Patching
+=========================================
+Locate and apply `original_code → suggested_code` fixes.
+
+`original_code` comes from an LLM and often differs from the file in
+whitespace or a token or two. Locating it goes through three stages,
+each cheaper than a full scan:
+
+1. Exact substring search.
+2. Line-hash index: every line is keyed by its whitespace-free text, so
+   a block whose lines match up to spacing is found by looking up its
+   rarest line and checking the aligned window.
+3. Bounded fuzzy matching: the same anchors (plus lines similar to the
+   first/last lines of the block when no line matches exactly) yield a
+   few candidate windows, which are scored with difflib. The best one
+   is accepted if its similarity reaches the confidence threshold.
+
+Every result carries the exact span it matched and a confidence score.
+"""
+
+import difflib
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple
+
+from src.config.settings import get_settings
+
+
+# Candidate windows scored per patch (bounds the fuzzy stage)
+_MAX_CANDIDATES = 64
+
+# Occurrences above which a line is too common to serve as an anchor
+_MAX_ANCHOR_HITS = 16
+
+# Similarity a line needs to seed a candidate when no line matches exactly
+_SEED_LINE_RATIO = 0.75
+
+class PatchError(ValueError):
+    """Raised when a fix cannot be applied to a file."""
+
+
+@dataclass
+class PatchMatch:
+    """Where original_code was found."""
+    start_line: int  # 1-based, inclusive
+    end_line: int    # 1-based, inclusive
+    start: int       # Character offsets into the (LF-normalized) content
+    end: int
+    confidence: float
+    method: str      # "exact", "whitespace" or "fuzzy"
+
+    def describe(self) -> str:
+        lines = (
+            f"line {self.start_line}" if self.start_line == self.end_line
+            else f"lines {self.start_line}-{self.end_line}"
+        )
+        if self.method == "exact":
+            return f"{lines} (exact match)"
+        return f"{lines} ({self.method} match, {self.confidence:.0%} confidence)"
+
+
+def _normalize_newlines(text: str) -> str:
+    return text.replace('\r\n', '\n')
+
+
+def _key(line: str) -> str:
+    """Line identity ignoring all whitespace."""
+    return "".join(line.split())
+
+
+def _indent(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+class _FileIndex:
+    """Line offsets and a hash index of the non-blank lines of a file."""
+
+    def __init__(self, content: str):
+        self.lines = content.split('\n')
+        self.offsets = []
+        offset = 0
+        for line in self.lines:
+            self.offsets.append(offset)
+            offset += len(line) + 1
+
+        # Significant (non-blank) lines: position -> file line number
+        self.sig_lines: List[int] = []
+        self.sig_keys: List[str] = []
+        self.positions: Dict[str, List[int]] = {}
+        for number, line in enumerate(self.lines):
+            key = _key(line)
+            if key:
+                self.positions.setdefault(key, []).append(len(self.sig_keys))
+                self.sig_lines.append(number)
+                self.sig_keys.append(key)
+
+    def span(self, sig_start: int, sig_end: int) -> Tuple[int, int]:
+        """File line range [first, last] of significant positions [sig_start, sig_end)."""
+        return self.sig_lines[sig_start], self.sig_lines[sig_end - 1]
+
+
+def _candidate_starts(index: _FileIndex, needle: List[str]) -> List[int]:
+    """Significant-line positions where a window aligned with `needle` may start."""
+    starts: Dict[int, None] = {}
+
+    # Anchors: needle lines that occur verbatim (modulo whitespace), rarest first
+    anchors = sorted(
+        (len(index.positions[key]), offset, key)
+        for offset, key in enumerate(needle)
+        if key in index.positions and len(index.positions[key]) <= _MAX_ANCHOR_HITS
+    )
+    for _, offset, key in anchors:
+        for position in index.positions[key]:
+            starts.setdefault(position - offset, None)
+            if len(starts) >= _MAX_CANDIDATES:
+                return list(starts)
+
+    if starts:
+        return list(starts)
+
+    # No line survived intact: seed from lines similar to the block's ends
+    for offset in sorted({0, len(needle) // 2, len(needle) - 1}):
+        matcher = difflib.SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(needle[offset])
+        for position, key in enumerate(index.sig_keys):
+            matcher.set_seq1(key)
+            if (
+                matcher.real_quick_ratio() >= _SEED_LINE_RATIO
+                and matcher.quick_ratio() >= _SEED_LINE_RATIO
+                and matcher.ratio() >= _SEED_LINE_RATIO
+            ):
+                starts.setdefault(position - offset, None)
+                if len(starts) >= _MAX_CANDIDATES:
+                    return list(starts)
+    return list(starts)
+
+
+def _best_window(
+    index: _FileIndex,
+    needle: List[str],
+    starts: List[int],
+) -> Optional[Tuple[float, int, int]]:
+    """Highest-scoring (ratio, sig_start, sig_end) window near the candidate starts."""
+    count = len(index.sig_keys)
+    slack = max(1, len(needle) // 5)
+    target = "\n".join(needle)
+    matcher = difflib.SequenceMatcher(None, autojunk=False)
+    matcher.set_seq2(target)
+
+    best = None
+    for start in starts:
+        for size in range(len(needle) - slack, len(needle) + slack + 1):
+            begin, end = max(0, start), min(count, start + size)
+            if end <= begin:
+                continue
+            matcher.set_seq1("\n".join(index.sig_keys[begin:end]))
+            if best is not None and matcher.real_quick_ratio() <= best[0]:
+                continue
+            if best is not None and matcher.quick_ratio() <= best[0]:
+                continue
+            ratio = matcher.ratio()
+            if best is None or ratio > best[0]:
+                best = (ratio, begin, end)
+    return best
+
+
+def locate_patch(content: str, original_code: str, min_confidence: float = 0.85) -> PatchMatch:
+    """
+    Find original_code in content.
+
+    Raises:
+        PatchError: If no span reaches min_confidence
+    """
+    content = _normalize_newlines(content)
+    original_code = _normalize_newlines(original_code)
+
+    def line_of(offset: int) -> int:
+        return content.count('\n', 0, offset) + 1
+
+    # 1. Exact substring
+    if original_code.strip():
+        found = content.find(original_code)
+        if found >= 0:
+            end = found + len(original_code)
+            return PatchMatch(line_of(found), line_of(max(found, end - 1)), found, end, 1.0, "exact")
+
+    needle = [key for key in (_key(line) for line in original_code.split('\n')) if key]
+    if not needle:
+        raise PatchError("original_code is empty")
+
+    index = _FileIndex(content)
+
+    # 2. Same lines up to whitespace, via the line-hash index
+    # 3. Otherwise the most similar window around the anchors
+    starts = sorted(_candidate_starts(index, needle))
+    best = None
+    for start in starts:
+        if start >= 0 and index.sig_keys[start:start + len(needle)] == needle:
+            best = (1.0, start, start + len(needle))
+            break
+    method = "whitespace"
+    if best is None:
+        best = _best_window(index, needle, starts)
+        method = "fuzzy"
+
+    if best is None or best[0] < min_confidence:
+        hint = ""
+        if best is not None:
+            first, last = index.span(best[1], best[2])
+            hint = (
+                f" Closest match: lines {first + 1}-{last + 1} "
+                f"({best[0]:.0%} similar, need {min_confidence:.0%})."
+            )
+        raise PatchError(
+            "Could not find original code in file. Make sure original_code matches exactly." + hint
+        )
+
+    ratio, sig_start, sig_end = best
+    first, last = index.span(sig_start, sig_end)
+    return PatchMatch(
+        start_line=first + 1,
+        end_line=last + 1,
+        start=index.offsets[first],
+        end=index.offsets[last] + len(index.lines[last]),
+        confidence=round(ratio, 4),
+        method=method,
+    )
+
+
+def _reindent(suggested_code: str, original_code: str, matched_first_line: str) -> str:
+    """
+    Shift suggested_code so that original_code's first line lands on the
+    indentation of the matched line, keeping relative indentation.
+    """
+    original_first = next((l for l in original_code.split('\n') if l.strip()), "")
+    base = _indent(matched_first_line)
+    reference = len(_indent(original_first))
+
+    lines = []
+    for line in suggested_code.split('\n'):
+        if not line.strip():
+            lines.append('')
+            continue
+        relative = len(_indent(line)) - reference
+        if relative >= 0:
+            lines.append(base + ' ' * relative + line.lstrip())
+        else:
+            lines.append(base[:max(0, len(base) + relative)] + line.lstrip())
+    return '\n'.join(lines)
+
+
+def apply_patch_match(
+    content: str,
+    original_code: str,
+    suggested_code: str,
+    min_confidence: Optional[float] = None,
+) -> Tuple[str, PatchMatch]:
+    """
+    Replace original_code with suggested_code.
+
+    Returns:
+        (new_content, match)
+
+    Raises:
+        PatchError: If original_code cannot be located confidently
+    """
+    if min_confidence is None:
+        min_confidence = get_settings().DARWIN_PATCH_MIN_CONFIDENCE
+
+    content = _normalize_newlines(content)
+    original_code = _normalize_newlines(original_code)
+    suggested_code = _normalize_newlines(suggested_code)
+
+    # Also handle escaped newlines from JSON
+    original_code = original_code.replace('\\n', '\n')
+    suggested_code = suggested_code.replace('\\n', '\n')
+
+    match = locate_patch(content, original_code, min_confidence)
+    if match.method == "exact":
+        replacement = suggested_code
+    else:
+        matched_first_line = content.split('\n')[match.start_line - 1]
+        replacement = _reindent(suggested_code, original_code, matched_first_line)
+
+    return content[:match.start] + replacement + content[match.end:], match
+
+
+def apply_patch(
+    content: str,
+    original_code: str,
+    suggested_code: str,
+    min_confidence: Optional[float] = None,
+) -> str:
+    """
+    Replace original_code with suggested_code (see apply_patch_match).
+
+    Raises:
+        PatchError: If original_code cannot be located confidently
+    """
+    return apply_patch_match(content, original_code, suggested_code, min_confidence)[0]
@@ -0,0 +1,198 @@
+"""
+Darwin Multi-Agent System - HogQL Result Cache
+==============================================
+TTL cache for HogQL query results, shared by every caller of
+PostHogClient.query().
+
+- Keyed by project, the query text (whitespace outside quoted literals
+  normalized) and a time bucket, so the same query issued several times
+  in a run (by an agent or by a script) is sent to PostHog once.
+- The TTL follows the lookback window of the query: a 30-day aggregate
+  barely moves within an hour, a 1-hour window does. TTL =
+  lookback × POSTHOG_CACHE_TTL_RATIO, clamped to the configured minimum
+  and maximum; queries without an INTERVAL get the minimum.
+- Two tiers: an in-memory LRU and JSON files on disk, so results also
+  carry over between runs.
+- Callers can bypass the cache (use_cache=False) to force a fresh query;
+  the fresh result still replaces the cached one.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+
+_INTERVAL = re.compile(r"INTERVAL\s+(\d+)\s+(SECOND|MINUTE|HOUR|DAY|WEEK|MONTH)S?\b", re.IGNORECASE)
+
+_UNIT_SECONDS = {
+    "SECOND": 1,
+    "MINUTE": 60,
+    "HOUR": 3600,
+    "DAY": 86400,
+    "WEEK": 7 * 86400,
+    "MONTH": 30 * 86400,
+}
+
+# A quoted string or identifier (kept), or a run of whitespace (collapsed)
+_HOGQL_TOKENS = re.compile(r"""('(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`(?:[^`\\]|\\.)*`)|\s+""")
+
+# Puts between sweeps of expired files from the disk tier
+_SWEEP_EVERY = 100
+
+
+def normalize_hogql(query: str) -> str:
+    """
+    Query text with runs of whitespace collapsed (formatting does not
+    change results). Quoted strings and identifiers are kept verbatim:
+    `LIKE '%a  b%'` and `LIKE '%a b%'` are different queries.
+    """
+    return _HOGQL_TOKENS.sub(lambda match: match.group(1) or " ", query).strip()
+
+
+def lookback_seconds(query: str) -> Optional[int]:
+    """Longest `INTERVAL n UNIT` window in the query, in seconds."""
+    windows = [int(n) * _UNIT_SECONDS[unit.upper()] for n, unit in _INTERVAL.findall(query)]
+    return max(windows) if windows else None
+
+
+class QueryCache:
+    """Two-level (memory + disk) TTL cache of HogQL responses."""
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        max_memory_entries: int = 256,
+        ttl_ratio: float = 0.01,
+        min_ttl_seconds: float = 60,
+        max_ttl_seconds: float = 3600,
+    ):
+        self.directory = Path(directory) if directory else None
+        self.max_memory_entries = max_memory_entries
+        self.ttl_ratio = ttl_ratio
+        self.min_ttl_seconds = min_ttl_seconds
+        self.max_ttl_seconds = max_ttl_seconds
+
+        # key -> (expires_at, response), least recently used first
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "stores": 0}
+
+    def ttl_for(self, query: str) -> float:
+        """Seconds a result of this query stays fresh."""
+        window = lookback_seconds(query)
+        if window is None:
+            return self.min_ttl_seconds
+        return max(self.min_ttl_seconds, min(self.max_ttl_seconds, window * self.ttl_ratio))
+
+    def key_for(self, project_id: Any, query: str, now: Optional[float] = None) -> Tuple[str, float]:
+        """
+        Cache key of a query and the end of its time bucket.
+
+        Buckets are aligned to multiples of the TTL, so every caller in the
+        same bucket shares one entry and the entry expires with the bucket.
+        """
+        ttl = self.ttl_for(query)
+        now = time.time() if now is None else now
+        bucket = int(now // ttl)
+        raw = f"{project_id}\n{normalize_hogql(query)}\n{ttl}\n{bucket}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest(), (bucket + 1) * ttl
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, expires_at: float, data: Dict[str, Any]) -> None:
+        """Insert into the memory LRU (caller holds the lock)."""
+        self._memory[key] = (expires_at, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def count_bypass(self) -> None:
+        with self._lock:
+            self.stats["bypassed"] += 1
+
+    def get(self, project_id: Any, query: str) -> Optional[Dict[str, Any]]:
+        """Cached response for the query, or None."""
+        key, _ = self.key_for(project_id, query)
+        now = time.time()
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and cached[0] > now:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return cached[1]
+
+        path = self._disk_path(key)
+        if path is not None and path.exists():
+            try:
+                stored = json.loads(path.read_text(encoding="utf-8"))
+                if stored["expires_at"] > now:
+                    with self._lock:
+                        self._remember(key, stored["expires_at"], stored["response"])
+                        self.stats["disk_hits"] += 1
+                    return stored["response"]
+            except (ValueError, KeyError, OSError):
+                pass
+            path.unlink(missing_ok=True)  # Expired or corrupt
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, project_id: Any, query: str, response: Dict[str, Any]) -> None:
+        """Store a query response until the end of its time bucket."""
+        key, expires_at = self.key_for(project_id, query)
+        with self._lock:
+            self._remember(key, expires_at, response)
+            self.stats["stores"] += 1
+            self._puts += 1
+            sweep = self._puts % _SWEEP_EVERY == 0
+
+        path = self._disk_path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({"expires_at": expires_at, "response": response}), encoding="utf-8")
+        os.replace(tmp, path)
+
+        if sweep:
+            self._sweep_disk()
+
+    def _sweep_disk(self) -> None:
+        """Delete expired entries from the disk tier."""
+        now = time.time()
+        for path in self.directory.glob("*/*.json"):
+            try:
+                if json.loads(path.read_text(encoding="utf-8"))["expires_at"] <= now:
+                    path.unlink(missing_ok=True)
+            except (ValueError, KeyError, OSError):
+                path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Drop every cached result (memory and disk)."""
+        with self._lock:
+            self._memory.clear()
+        if self.directory is not None:
+            for path in self.directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            lookups = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
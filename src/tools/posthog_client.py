@@ -0,0 +1,320 @@
+"""
+Darwin Multi-Agent System - PostHog Client
+==========================================
+Process-wide PostHog API access shared by all tools and scripts.
+
+- One pooled `requests.Session` with HTTP keep-alive, instead of a new
+  TLS connection per query.
+- 429 responses are retried after `Retry-After` or with jittered
+  exponential backoff. 5xx responses and dropped connections are retried
+  for reads (GET and HogQL queries) only, since a failed write may have
+  been applied.
+- HogQL queries get their own timeout (POSTHOG_QUERY_TIMEOUT_SECONDS),
+  which can be overridden per query.
+- HogQL results are served from a TTL cache (posthog_cache.py) when one
+  is configured; use_cache=False forces a fresh query.
+- Independent queries can be run concurrently with query_many(); at most
+  POSTHOG_MAX_CONCURRENT_QUERIES queries are in flight per process.
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config.settings import get_settings
+from .posthog_cache import QueryCache
+
+
+_RETRY_READ_STATUSES = {500, 502, 503, 504}
+
+
+class PostHogError(Exception):
+    """Raised for PostHog API error responses."""
+
+    def __init__(self, status: int, message: str):
+        self.status = status
+        self.message = message
+        super().__init__(f"PostHog API error: {status} - {message}")
+
+
+class PostHogClient:
+    """Pooled, retrying PostHog client for one project."""
+
+    def __init__(
+        self,
+        api_key: str,
+        host: str,
+        project_id: int,
+        pool_size: int = 10,
+        timeout: float = 30,
+        query_timeout: float = 60,
+        max_retries: int = 3,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 30.0,
+        cache: Optional[QueryCache] = None,
+        max_concurrent_queries: int = 5,
+    ):
+        self.host = host.rstrip("/")
+        self.project_id = project_id
+        self.timeout = timeout
+        self.query_timeout = query_timeout
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.cache = cache
+        self.max_concurrent_queries = max(1, max_concurrent_queries)
+        self._query_slots = threading.BoundedSemaphore(self.max_concurrent_queries)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "User-Agent": "darwin-multi-agent",
+        })
+
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "queries": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "server_errors": 0,
+            "connection_errors": 0,
+        }
+
+    # ===================
+    # Requests
+    # ===================
+
+    def project_path(self, suffix: str = "") -> str:
+        """API path of the project, e.g. project_path('/query/')."""
+        return f"/api/projects/{self.project_id}{suffix}"
+
+    def _url(self, path: str) -> str:
+        return path if path.startswith("http") else f"{self.host}{path}"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        ceiling = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _retry_delay(self, response: requests.Response, read: bool, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the response is final."""
+        if response.status_code == 429:
+            self._count("rate_limited")
+            try:
+                return min(self.retry_max_seconds, float(response.headers["Retry-After"])) + random.uniform(0, 1)
+            except (KeyError, ValueError):
+                return self._backoff(attempt)
+        if response.status_code in _RETRY_READ_STATUSES and read:
+            self._count("server_errors")
+            return self._backoff(attempt)
+        return None
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        read: Optional[bool] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request through the pooled session, retrying 429 (and 5xx
+        for reads). Error responses are returned, not raised.
+
+        Args:
+            method: HTTP method
+            path: API path (e.g. project_path('/persons/')) or full URL
+            read: Whether the request is safe to repeat after a 5xx or a
+                dropped connection (defaults to True for GET only)
+            **kwargs: Passed to requests (json, params, timeout, ...)
+        """
+        method = method.upper()
+        read = method == "GET" if read is None else read
+        kwargs.setdefault("timeout", self.timeout)
+        url = self._url(path)
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.ConnectionError:
+                self._count("connection_errors")
+                if not read or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                self._count("requests")
+                delay = self._retry_delay(response, read, attempt)
+                if delay is None or attempt >= self.max_retries:
+                    return response
+
+            attempt += 1
+            self._count("retries")
+            time.sleep(delay)
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET a JSON resource.
+
+        Raises:
+            PostHogError: For 4xx/5xx responses
+        """
+        response = self.request("GET", path, params=params)
+        if response.status_code != 200:
+            raise PostHogError(response.status_code, response.text[:200])
+        return response.json()
+
+    def query(
+        self,
+        hogql: str,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Run a HogQL query.
+
+        Args:
+            hogql: Query text
+            timeout: Seconds to wait for the result (defaults to query_timeout)
+            use_cache: Serve a cached result if one is fresh; with False the
+                query is always sent (and its result cached)
+
+        Returns:
+            The query response (`results`, `columns`, ...)
+
+        Raises:
+            PostHogError: For 4xx/5xx responses
+        """
+        if self.cache is not None:
+            if use_cache:
+                cached = self.cache.get(self.project_id, hogql)
+                if cached is not None:
+                    return cached
+            else:
+                self.cache.count_bypass()
+
+        self._count("queries")
+        with self._query_slots:
+            response = self.request(
+                "POST",
+                self.project_path("/query/"),
+                read=True,  # Queries do not change anything
+                json={"query": {"kind": "HogQLQuery", "query": hogql}},
+                timeout=timeout or self.query_timeout,
+            )
+        if response.status_code != 200:
+            raise PostHogError(response.status_code, response.text[:200])
+
+        data = response.json()
+        if self.cache is not None:
+            self.cache.put(self.project_id, hogql, data)
+        return data
+
+    def query_many(
+        self,
+        queries: Dict[str, str],
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run independent HogQL queries concurrently.
+
+        Total latency is close to that of the slowest query. A query that
+        fails does not affect the others: its entry is
+        `{"results": [], "error": "..."}`.
+
+        Args:
+            queries: Query name -> HogQL text
+            timeout: Per-query timeout (defaults to query_timeout)
+            use_cache: As for query()
+
+        Returns:
+            Query name -> query response
+        """
+        def run(hogql: str) -> Dict[str, Any]:
+            try:
+                return self.query(hogql, timeout=timeout, use_cache=use_cache)
+            except (PostHogError, requests.RequestException) as e:
+                return {"results": [], "error": str(e)}
+
+        if len(queries) <= 1:
+            return {name: run(hogql) for name, hogql in queries.items()}
+
+        workers = min(len(queries), self.max_concurrent_queries)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="posthog-query") as pool:
+            futures = {name: pool.submit(run, hogql) for name, hogql in queries.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request counters, plus the query cache's when enabled."""
+        with self._lock:
+            stats = dict(self.stats)
+        if self.cache is not None:
+            stats["cache"] = self.cache.get_stats()
+        return stats
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+
+# Global client instance
+_client: Optional[PostHogClient] = None
+_client_lock = threading.Lock()
+
+
+def get_posthog_client() -> PostHogClient:
+    """Get or create the shared PostHog client for the configured project."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                settings = get_settings()
+                cache = None
+                if settings.POSTHOG_CACHE_ENABLED:
+                    directory = None
+                    if settings.POSTHOG_CACHE_DIR:
+                        directory = os.path.join(settings.POSTHOG_CACHE_DIR, str(settings.POSTHOG_PROJECT_ID))
+                    cache = QueryCache(
+                        directory,
+                        max_memory_entries=settings.POSTHOG_CACHE_MEMORY_ENTRIES,
+                        ttl_ratio=settings.POSTHOG_CACHE_TTL_RATIO,
+                        min_ttl_seconds=settings.POSTHOG_CACHE_MIN_TTL_SECONDS,
+                        max_ttl_seconds=settings.POSTHOG_CACHE_MAX_TTL_SECONDS,
+                    )
+                _client = PostHogClient(
+                    api_key=settings.POSTHOG_API_KEY,
+                    host=settings.POSTHOG_HOST,
+                    project_id=settings.POSTHOG_PROJECT_ID,
+                    pool_size=settings.POSTHOG_HTTP_POOL_SIZE,
+                    timeout=settings.POSTHOG_TIMEOUT_SECONDS,
+                    query_timeout=settings.POSTHOG_QUERY_TIMEOUT_SECONDS,
+                    max_retries=settings.POSTHOG_MAX_RETRIES,
+                    retry_base_seconds=settings.POSTHOG_RETRY_BASE_SECONDS,
+                    retry_max_seconds=settings.POSTHOG_RETRY_MAX_SECONDS,
+                    cache=cache,
+                    max_concurrent_queries=settings.POSTHOG_MAX_CONCURRENT_QUERIES,
+                )
+    return _client
+
+
+def close_posthog_client() -> None:
+    """Close the shared PostHog client."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
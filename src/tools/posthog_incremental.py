@@ -0,0 +1,409 @@
+"""
+Darwin Multi-Agent System - Incremental PostHog Aggregates
+==========================================================
+Watermark-based detection queries: instead of re-scanning
+`INTERVAL {days} DAY` on every run, each query only reads events newer
+than its last run and merges them into rolling aggregates in MongoDB.
+
+- `posthog_watermarks`: one document per query with the high-water
+  timestamp up to which events have been aggregated.
+- `posthog_aggregates`: partial aggregates per (query, group key, hour):
+  event count plus the distinct ids seen (capped per bucket).
+
+A run reads events in [watermark, now - POSTHOG_INGESTION_LAG_SECONDS),
+adds them to the hourly buckets and advances the watermark; the last
+few minutes are left for the next run because PostHog ingests events
+with some delay. Results for any window up to
+POSTHOG_INCREMENTAL_RETENTION_DAYS are summed from the buckets, so an
+hourly run reads about an hour of events instead of the whole window.
+The first run (or one after a gap longer than the retention) backfills
+the full retention window once.
+
+One query returns at most _MAX_ROWS rows, ordered by bucket. When a
+window hits that cap (typically the backfill), only its complete
+buckets are merged and the rest of the window is read by a follow-up
+query starting at the first incomplete bucket, up to _MAX_PAGES queries
+per run; the watermark only ever moves past merged buckets.
+
+Each run leases the watermarks it works on for lease_seconds, renews the
+lease after every query before merging its rows, and stores the
+watermark with every merge. A run whose lease ran out and was taken over
+by another run drops that query instead of merging the same events
+twice; a run only ever releases its own lease.
+
+Unique users are the union of the per-bucket id sets. A bucket with
+more than _MAX_USERS_PER_BUCKET users keeps only that many ids (and is
+marked `truncated`), so for very busy groups the count is a lower bound.
+"""
+
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from src.config.settings import get_settings
+from .posthog_client import PostHogClient, get_posthog_client
+
+
+WATERMARKS_COLLECTION = "posthog_watermarks"
+AGGREGATES_COLLECTION = "posthog_aggregates"
+
+# Distinct ids stored per (group, hour) bucket
+_MAX_USERS_PER_BUCKET = 200
+
+# Rows returned by one incremental HogQL query (PostHog caps results)
+_MAX_ROWS = 10000
+
+# Follow-up queries per run for windows over _MAX_ROWS rows
+_MAX_PAGES = 20
+
+
+@dataclass(frozen=True)
+class IncrementalQuery:
+    """An event aggregate that can be maintained incrementally."""
+    name: str
+    where: str                          # HogQL condition on events
+    groups: Tuple[Tuple[str, str], ...]  # (alias, HogQL expression)
+
+    def hogql(self, start: datetime, end: datetime) -> str:
+        """Per-hour partial aggregates of events in [start, end), earliest buckets first."""
+        columns = ", ".join(f"{expression} as {alias}" for alias, expression in self.groups)
+        aliases = ", ".join(alias for alias, _ in self.groups)
+        return f"""
+            SELECT
+                {columns},
+                toStartOfHour(timestamp) as bucket,
+                count() as events,
+                uniq(distinct_id) as unique_users,
+                groupUniqArray({_MAX_USERS_PER_BUCKET})(distinct_id) as users
+            FROM events
+            WHERE {self.where}
+            AND timestamp >= toDateTime('{_hogql_time(start)}')
+            AND timestamp < toDateTime('{_hogql_time(end)}')
+            GROUP BY {aliases}, bucket
+            ORDER BY bucket
+            LIMIT {_MAX_ROWS}
+        """
+
+
+RAGE_CLICKS = IncrementalQuery(
+    name="rage_clicks",
+    where="event = '$rageclick'",
+    groups=(("page", "properties.$current_url"), ("element", "properties.$el_text")),
+)
+
+CLICK_PATTERNS = IncrementalQuery(
+    name="click_patterns",
+    where="event = '$autocapture'",
+    groups=(("page", "properties.$current_url"),),
+)
+
+FUNNEL_EVENTS = IncrementalQuery(
+    name="funnel_events",
+    where=(
+        "event IN ('product_viewed', 'product_added_to_cart', 'checkout_started', "
+        "'checkout_initiated', 'payment_completed', 'order_created')"
+    ),
+    groups=(("event", "event"),),
+)
+
+EVENT_COUNTS = IncrementalQuery(
+    name="event_counts",
+    where="1 = 1",
+    groups=(("event", "event"),),
+)
+
+ERRORS = IncrementalQuery(
+    name="errors",
+    where="event = '$exception'",
+    groups=(("page", "properties.$current_url"),),
+)
+
+
+def _hogql_time(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _parse_time(value: Any) -> datetime:
+    """PostHog timestamp (ISO string) as a naive UTC datetime."""
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class IncrementalAggregator:
+    """Maintains rolling event aggregates in MongoDB from incremental HogQL queries."""
+
+    def __init__(
+        self,
+        client: PostHogClient,
+        database,
+        retention_days: int = 30,
+        ingestion_lag_seconds: float = 300,
+        lease_seconds: float = 300,
+    ):
+        self.client = client
+        self.watermarks = database[WATERMARKS_COLLECTION]
+        self.aggregates = database[AGGREGATES_COLLECTION]
+        self.retention_days = retention_days
+        self.ingestion_lag_seconds = ingestion_lag_seconds
+        self.lease_seconds = lease_seconds
+
+        self._lock = threading.Lock()
+        self.stats = {"refreshes": 0, "backfills": 0, "rows_merged": 0, "skipped_locked": 0, "lease_lost": 0, "pages": 0, "truncated": 0}
+
+    # ===================
+    # Watermarks
+    # ===================
+
+    def _claim(self, name: str, lease: str, now: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Lease the watermark of a query, so concurrent runs do not merge the
+        same events twice. Returns the watermark document, or None if
+        another run holds the lease.
+        """
+        try:
+            return self.watermarks.find_one_and_update(
+                {"_id": name, "$or": [
+                    {"locked_until": {"$exists": False}},
+                    {"locked_until": {"$lt": now}},
+                ]},
+                {"$set": {"locked_until": now + timedelta(seconds=self.lease_seconds), "lease": lease}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            return None  # Document exists and is locked
+
+    def _renew(self, name: str, lease: str, watermark: Optional[datetime] = None) -> bool:
+        """
+        Extend a lease (storing the watermark reached, if given). False if
+        the lease ran out and another run took it.
+        """
+        now = datetime.utcnow()
+        update: Dict[str, Any] = {"locked_until": now + timedelta(seconds=self.lease_seconds)}
+        if watermark is not None:
+            update.update(watermark=watermark, updated_at=now)
+        result = self.watermarks.update_one({"_id": name, "lease": lease}, {"$set": update})
+        return result.matched_count == 1
+
+    def _release(self, name: str, lease: str) -> None:
+        """Unlock the watermark, if the lease is still ours."""
+        self.watermarks.update_one({"_id": name, "lease": lease}, {"$unset": {"locked_until": "", "lease": ""}})
+
+    # ===================
+    # Refresh
+    # ===================
+
+    def refresh(
+        self,
+        queries: Sequence[IncrementalQuery],
+        extra: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the aggregates of `queries` up to date.
+
+        All incremental queries (and the plain HogQL queries in `extra`)
+        are sent as one concurrent batch; windows over _MAX_ROWS rows are
+        continued with follow-up batches.
+
+        Returns:
+            Responses of the `extra` queries, by name
+        """
+        now = datetime.utcnow()
+        lease = uuid.uuid4().hex
+        # Whole seconds, as sent to HogQL, so consecutive windows meet exactly
+        end = (now - timedelta(seconds=self.ingestion_lag_seconds)).replace(microsecond=0)
+        retention_start = now - timedelta(days=self.retention_days)
+
+        claimed: List[str] = []
+        # Query name -> (query, start of the window still to read)
+        pending: Dict[str, Tuple[IncrementalQuery, datetime]] = {}
+        responses: Dict[str, Dict[str, Any]] = {}
+        try:
+            for query in queries:
+                state = self._claim(query.name, lease, now)
+                if state is None:
+                    with self._lock:
+                        self.stats["skipped_locked"] += 1
+                    continue
+                claimed.append(query.name)
+
+                start = state.get("watermark")
+                if start is None or start < retention_start:
+                    # First run, or a gap longer than the retention: rebuild
+                    self.aggregates.delete_many({"query": query.name})
+                    start = retention_start.replace(microsecond=0)
+                    with self._lock:
+                        self.stats["backfills"] += 1
+                if start < end:
+                    pending[query.name] = (query, start)
+
+            batch: Dict[str, str] = dict(extra or {})
+            for page in range(_MAX_PAGES):
+                batch.update({f"incremental:{name}": query.hogql(start, end) for name, (query, start) in pending.items()})
+                if not batch:
+                    break
+                # Fresh by construction: the window is new on every run
+                page_responses = self.client.query_many(batch, use_cache=False)
+                if page == 0:
+                    responses = page_responses
+                batch = {}
+
+                remaining: Dict[str, Tuple[IncrementalQuery, datetime]] = {}
+                for name, (query, start) in pending.items():
+                    response = page_responses[f"incremental:{name}"]
+                    if "error" in response:
+                        continue  # Watermark stays put; the window is retried next run
+                    # Merge only under a live lease: another run may have taken it over
+                    if not self._renew(name, lease):
+                        with self._lock:
+                            self.stats["lease_lost"] += 1
+                        continue
+                    rows, watermark = self._complete_rows(query, response.get("results", []), end)
+                    self._merge(query, rows)
+                    self.aggregates.delete_many({"query": name, "bucket": {"$lt": retention_start}})
+                    self._renew(name, lease, watermark)
+                    if watermark < end:
+                        remaining[name] = (query, watermark)
+                with self._lock:
+                    self.stats["pages"] += 1
+                pending = remaining
+        finally:
+            for name in claimed:
+                self._release(name, lease)
+
+        with self._lock:
+            self.stats["refreshes"] += 1
+        return {name: responses[name] for name in (extra or {}) if name in responses}
+
+    def _complete_rows(self, query: IncrementalQuery, rows: List[list], end: datetime) -> Tuple[List[list], datetime]:
+        """
+        Rows safe to merge and the watermark after them.
+
+        Under _MAX_ROWS rows the whole window was read. At the cap, the
+        rows of the last (possibly cut) bucket are left for a follow-up
+        query starting at that bucket. A single hour over the cap cannot
+        be split further: it is merged as is and counted as truncated.
+        """
+        if len(rows) < _MAX_ROWS:
+            return rows, end
+        width = len(query.groups)
+        last = _parse_time(rows[-1][width])
+        complete = [row for row in rows if _parse_time(row[width]) < last]
+        if complete:
+            return complete, last
+        with self._lock:
+            self.stats["truncated"] += 1
+        return rows, min(last + timedelta(hours=1), end)
+
+    def _merge(self, query: IncrementalQuery, rows: List[list]) -> None:
+        """Add partial aggregates to the stored hourly buckets."""
+        width = len(query.groups)
+        operations = []
+        for row in rows:
+            key = {alias: row[i] for i, (alias, _) in enumerate(query.groups)}
+            bucket, events, unique_users, users = row[width:width + 4]
+            operations.append(UpdateOne(
+                {"query": query.name, "key": key, "bucket": _parse_time(bucket)},
+                {
+                    "$inc": {"events": events},
+                    "$addToSet": {"users": {"$each": list(users)[:_MAX_USERS_PER_BUCKET]}},
+                    "$max": {"truncated": unique_users > len(users)},
+                },
+                upsert=True,
+            ))
+        if operations:
+            self.aggregates.bulk_write(operations, ordered=False)
+        with self._lock:
+            self.stats["rows_merged"] += len(operations)
+
+    # ===================
+    # Reads
+    # ===================
+
+    def rows(self, query: IncrementalQuery, days: float, limit: int = 100) -> List[list]:
+        """
+        Rolling aggregate over the last `days` days (whole hours), most events first.
+
+        Returns:
+            Rows of [*group values, events, unique_users], like the
+            corresponding full-window HogQL queries
+        """
+        since = datetime.utcnow() - timedelta(days=days)
+        since = since.replace(minute=0, second=0, microsecond=0)
+        grouped = self.aggregates.aggregate([
+            {"$match": {"query": query.name, "bucket": {"$gte": since}}},
+            {"$group": {
+                "_id": "$key",
+                "events": {"$sum": "$events"},
+                "users": {"$push": "$users"},
+            }},
+            {"$sort": {"events": -1}},
+            {"$limit": limit},
+        ])
+
+        result = []
+        for doc in grouped:
+            users = set()
+            for bucket_users in doc["users"]:
+                users.update(bucket_users or [])
+            key = doc["_id"] or {}
+            result.append([key.get(alias) for alias, _ in query.groups] + [doc["events"], len(users)])
+        return result
+
+    def query(
+        self,
+        queries: Sequence[IncrementalQuery],
+        days: int,
+        limit: int = 100,
+        extra: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Dict[str, List[list]], Dict[str, Dict[str, Any]]]:
+        """
+        Refresh, then read the rolling aggregates.
+
+        Returns:
+            (rows by query name, responses of the `extra` queries)
+        """
+        if days > self.retention_days:
+            raise ValueError(f"Incremental aggregates cover {self.retention_days} days, not {days}")
+        extra_responses = self.refresh(queries, extra)
+        return {query.name: self.rows(query, days, limit) for query in queries}, extra_responses
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
+
+
+# Global aggregator instance
+_aggregator: Optional[IncrementalAggregator] = None
+_aggregator_lock = threading.Lock()
+
+
+def get_incremental_aggregator() -> Optional[IncrementalAggregator]:
+    """
+    Shared aggregator, or None when POSTHOG_INCREMENTAL_ENABLED is off.
+    """
+    global _aggregator
+    settings = get_settings()
+    if not settings.POSTHOG_INCREMENTAL_ENABLED:
+        return None
+    if _aggregator is None:
+        with _aggregator_lock:
+            if _aggregator is None:
+                from src.db import get_database
+                _aggregator = IncrementalAggregator(
+                    get_posthog_client(),
+                    get_database(),
+                    retention_days=settings.POSTHOG_INCREMENTAL_RETENTION_DAYS,
+                    ingestion_lag_seconds=settings.POSTHOG_INGESTION_LAG_SECONDS,
+                )
+    return _aggregator
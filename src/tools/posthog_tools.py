@@ -4,19 +4,31 @@ Darwin Multi-Agent System - PostHog Tools
 Custom CrewAI tools for querying PostHog analytics.
 """
 
-from typing import Type, Optional, List
+from typing import Type, Optional, List, Dict, Any, Sequence, Tuple
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
-import requests
+from pymongo.errors import PyMongoError
 import json
 
 from src.config.settings import get_settings
+from .progress import track_tool_calls
+from .compact_output import compact_table, dumps_compact, resolve_output_format
+from .context_budget import budget_tool_output
+from .posthog_client import PostHogClient, PostHogError, get_posthog_client
+from .posthog_incremental import (
+    IncrementalQuery,
+    RAGE_CLICKS,
+    CLICK_PATTERNS,
+    FUNNEL_EVENTS,
+    EVENT_COUNTS,
+    get_incremental_aggregator,
+)
 
 
 class PostHogQueryInput(BaseModel):
     """Input schema for PostHog query tool."""
     query_type: str = Field(
-        description="Type of query: 'rage_clicks', 'drop_offs', 'events', 'funnel_analysis', 'event_counts'"
+        description="Type of query: 'friction_scan', 'rage_clicks', 'drop_offs', 'events', 'funnel_analysis', 'event_counts'"
     )
     days: int = Field(
         default=30,
@@ -30,19 +42,118 @@ class PostHogQueryInput(BaseModel):
         default=None,
         description="Filter by specific page/URL pattern"
     )
+    refresh: bool = Field(
+        default=False,
+        description="Bypass cached results and query PostHog again"
+    )
+    output_format: Optional[str] = Field(
+        default=None,
+        description="'compact' (columnar JSON with top rows and totals) or 'markdown' (tables); default from settings"
+    )
+
+
+# ===================
+# HogQL Queries
+# ===================
+
+def rage_clicks_query(days: int, limit: int) -> str:
+    return f"""
+        SELECT
+            properties.$current_url as page,
+            properties.$el_text as element,
+            count() as rage_clicks,
+            uniq(distinct_id) as affected_users
+        FROM events
+        WHERE event = '$rageclick'
+        AND timestamp > now() - INTERVAL {days} DAY
+        GROUP BY page, element
+        ORDER BY rage_clicks DESC
+        LIMIT {limit}
+    """
+
+
+def click_patterns_query(days: int, limit: int) -> str:
+    return f"""
+        SELECT
+            properties.$current_url as page,
+            count() as total_clicks,
+            uniq(distinct_id) as unique_users
+        FROM events
+        WHERE event = '$autocapture'
+        AND timestamp > now() - INTERVAL {days} DAY
+        GROUP BY page
+        ORDER BY total_clicks DESC
+        LIMIT {limit}
+    """
+
+
+def funnel_query(days: int) -> str:
+    return f"""
+        SELECT
+            event,
+            count() as total,
+            uniq(distinct_id) as unique_users
+        FROM events
+        WHERE event IN ('product_viewed', 'product_added_to_cart', 'checkout_started', 'checkout_initiated', 'payment_completed', 'order_created')
+        AND timestamp > now() - INTERVAL {days} DAY
+        GROUP BY event
+        ORDER BY total DESC
+    """
+
+
+def event_counts_query(days: int, limit: int = 30, page_filter: Optional[str] = None) -> str:
+    where_clause = f"AND properties.$current_url LIKE '%{page_filter}%'" if page_filter else ""
+    return f"""
+        SELECT
+            event,
+            count() as total,
+            uniq(distinct_id) as unique_users
+        FROM events
+        WHERE timestamp > now() - INTERVAL {days} DAY
+        {where_clause}
+        GROUP BY event
+        ORDER BY total DESC
+        LIMIT {limit}
+    """
+
+
+PERSONS_COUNT_QUERY = "SELECT count() FROM persons"
+
 
+# Column names of the rows in each result section
+SECTION_COLUMNS: Dict[str, List[str]] = {
+    "rage_clicks": ["page", "element", "rage_clicks", "affected_users"],
+    "click_patterns": ["page", "total_clicks", "unique_users"],
+    "funnel": ["event", "total", "unique_users"],
+    "events": ["event", "total", "unique_users"],
+    "event_counts": ["event", "total", "unique_users"],
+    "persons": ["count"],
+}
 
+
+def _section(name: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """A query response as a result section (errors are kept as they are)."""
+    if "error" in response:
+        return {"error": response["error"]}
+    return {"columns": SECTION_COLUMNS[name], "results": response.get("results", [])}
+
+
+@track_tool_calls
+@budget_tool_output
 class PostHogQueryTool(BaseTool):
     """
     Query PostHog for analytics data including rage clicks, drop-offs, and events.
     
     Used by: Watcher Agent
+    
+    Python callers can use fetch() for the raw rows without any formatting.
     """
     
     name: str = "posthog_query"
     description: str = """
     Query PostHog analytics to find UX friction signals.
     Supports queries for:
+    - friction_scan: Rage clicks, click patterns, funnel, event counts and users in one call
     - rage_clicks: Find pages/elements with rage click events
     - drop_offs: Find funnel drop-off points  
     - events: Query specific events
@@ -50,6 +161,9 @@ class PostHogQueryTool(BaseTool):
     - event_counts: Get counts of all event types
     
     Returns structured data about user friction points.
+    Results are cached for a while; set refresh=true to force fresh data.
+    output_format 'compact' returns columnar JSON (top rows plus totals),
+    'markdown' returns tables.
     """
     args_schema: Type[BaseModel] = PostHogQueryInput
     
@@ -59,6 +173,8 @@ class PostHogQueryTool(BaseTool):
         days: int = 30,
         limit: int = 100,
         page_filter: Optional[str] = None,
+        refresh: bool = False,
+        output_format: Optional[str] = None,
         **kwargs  # Accept and ignore extra parameters from LLM
     ) -> str:
         """Execute the PostHog query."""
@@ -66,384 +182,359 @@ class PostHogQueryTool(BaseTool):
         if kwargs:
             print(f"[PostHogQueryTool] Ignoring extra parameters: {list(kwargs.keys())}")
         
-        settings = get_settings()
-        
-        headers = {
-            "Authorization": f"Bearer {settings.POSTHOG_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        base_url = f"{settings.POSTHOG_HOST}/api/projects/{settings.POSTHOG_PROJECT_ID}"
-        
         try:
-            if query_type == "rage_clicks":
-                return self._query_rage_clicks(base_url, headers, days, limit, page_filter)
-            elif query_type == "drop_offs" or query_type == "funnel_analysis":
-                return self._query_funnel_analysis(base_url, headers, days)
-            elif query_type == "events":
-                return self._query_events(base_url, headers, days, limit, page_filter)
-            elif query_type == "event_counts":
-                return self._query_event_counts(base_url, headers, days)
-            elif query_type == "persons":
-                return self._query_persons(base_url, headers, limit)
-            else:
-                return f"Unknown query type: {query_type}. Use: rage_clicks, drop_offs, funnel_analysis, events, event_counts"
+            output_format = resolve_output_format(output_format)
+            sections = self.fetch(query_type, days, limit, page_filter, refresh)
+            if output_format == "compact":
+                return self._render_compact(query_type, days, sections)
+            return self._render_markdown(query_type, days, sections)
+        except ValueError as e:
+            return str(e)
+        except PostHogError as e:
+            return str(e)
         except Exception as e:
             return f"Error querying PostHog: {str(e)}"
     
-    def _query_event_counts(
+    # ===================
+    # Raw Data
+    # ===================
+    
+    def fetch(
         self,
-        base_url: str,
-        headers: dict,
-        days: int
-    ) -> str:
-        """Query event counts using HogQL."""
-        query = {
-            "query": {
-                "kind": "HogQLQuery",
-                "query": f"""
-                    SELECT event, count() as count, uniq(distinct_id) as unique_users
-                    FROM events 
-                    WHERE timestamp > now() - INTERVAL {days} DAY
-                    GROUP BY event 
-                    ORDER BY count DESC 
-                    LIMIT 30
-                """
-            }
-        }
+        query_type: str,
+        days: int = 30,
+        limit: int = 100,
+        page_filter: Optional[str] = None,
+        refresh: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run a query type and return its raw results.
         
-        response = requests.post(
-            f"{base_url}/query/",
-            headers=headers,
-            json=query,
-            timeout=30
-        )
+        Returns:
+            Sections by name, each {"columns": [...], "results": [[...]]}
+            or {"error": "..."} if that part of a batch failed
         
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get("results", [])
-            
-            if not results:
-                return f"No events found in the last {days} days."
-            
-            output = f"## Event Counts (Last {days} Days)\n\n"
-            output += "| Event | Count | Unique Users |\n"
-            output += "|-------|-------|-------------|\n"
-            
-            for row in results:
-                event_name = row[0] if row[0] else "unknown"
-                count = row[1] if len(row) > 1 else 0
-                users = row[2] if len(row) > 2 else 0
-                output += f"| {event_name} | {count} | {users} |\n"
-            
-            return output
-        else:
-            return f"PostHog API error: {response.status_code} - {response.text[:200]}"
+        Raises:
+            ValueError: Unknown query type
+            PostHogError: The query failed
+        """
+        client = get_posthog_client()
+        use_cache = not refresh
+        
+        if query_type == "friction_scan":
+            return self._fetch_friction_scan(client, use_cache, days, limit)
+        elif query_type == "rage_clicks":
+            return self._fetch_rage_clicks(client, use_cache, days, limit)
+        elif query_type == "drop_offs" or query_type == "funnel_analysis":
+            return self._fetch_funnel(client, use_cache, days)
+        elif query_type == "events":
+            return self._fetch_events(client, use_cache, days, limit, page_filter)
+        elif query_type == "event_counts":
+            return self._fetch_event_counts(client, use_cache, days)
+        elif query_type == "persons":
+            return self._fetch_persons(client, limit)
+        raise ValueError(
+            f"Unknown query type: {query_type}. Use: friction_scan, rage_clicks, drop_offs, funnel_analysis, events, event_counts"
+        )
     
-    def _query_rage_clicks(
+    def _incremental(
         self,
-        base_url: str,
-        headers: dict,
+        queries: Sequence[IncrementalQuery],
         days: int,
         limit: int,
-        page_filter: Optional[str]
-    ) -> str:
-        """Query for rage click events using HogQL."""
-        # First check if $rageclick events exist
-        query = {
-            "query": {
-                "kind": "HogQLQuery",
-                "query": f"""
-                    SELECT 
-                        properties.$current_url as page,
-                        properties.$el_text as element,
-                        count() as rage_clicks,
-                        uniq(distinct_id) as affected_users
-                    FROM events 
-                    WHERE event = '$rageclick'
-                    AND timestamp > now() - INTERVAL {days} DAY
-                    GROUP BY page, element
-                    ORDER BY rage_clicks DESC
-                    LIMIT {limit}
-                """
-            }
-        }
-        
-        response = requests.post(
-            f"{base_url}/query/",
-            headers=headers,
-            json=query,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get("results", [])
-            
-            if results:
-                output = f"## Rage Click Analysis (Last {days} Days)\n\n"
-                output += "| Page | Element | Rage Clicks | Affected Users |\n"
-                output += "|------|---------|-------------|----------------|\n"
-                
-                for row in results:
-                    page = row[0] if row[0] else "unknown"
-                    element = row[1] if row[1] else "unknown"
-                    clicks = row[2] if len(row) > 2 else 0
-                    users = row[3] if len(row) > 3 else 0
-                    # Truncate long URLs
-                    page_short = page[:50] + "..." if len(str(page)) > 50 else page
-                    output += f"| {page_short} | {element} | {clicks} | {users} |\n"
-                
-                return output
-            else:
-                # No $rageclick events, fallback to autocapture analysis
-                return self._analyze_click_patterns(base_url, headers, days, limit)
-        else:
-            return f"PostHog API error: {response.status_code}"
+        extra: Optional[Dict[str, str]] = None
+    ) -> Optional[Tuple[Dict[str, List[list]], Dict[str, dict]]]:
+        """Rows from the incremental aggregates, or None to scan the full window."""
+        aggregator = get_incremental_aggregator()
+        if aggregator is None or days > aggregator.retention_days:
+            return None
+        try:
+            return aggregator.query(queries, days, limit, extra)
+        except PyMongoError as e:
+            print(f"[PostHogQueryTool] Incremental aggregates unavailable, scanning full window: {e}")
+            return None
     
-    def _analyze_click_patterns(
+    def _fetch_friction_scan(
         self,
-        base_url: str,
-        headers: dict,
+        client: PostHogClient,
+        use_cache: bool,
         days: int,
         limit: int
-    ) -> str:
-        """Analyze click patterns when no rage click events exist."""
-        query = {
-            "query": {
-                "kind": "HogQLQuery",
-                "query": f"""
-                    SELECT 
-                        properties.$current_url as page,
-                        count() as total_clicks,
-                        uniq(distinct_id) as unique_users
-                    FROM events 
-                    WHERE event = '$autocapture'
-                    AND timestamp > now() - INTERVAL {days} DAY
-                    GROUP BY page
-                    ORDER BY total_clicks DESC
-                    LIMIT {limit}
-                """
-            }
-        }
-        
-        response = requests.post(
-            f"{base_url}/query/",
-            headers=headers,
-            json=query,
-            timeout=30
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run every friction query at once; latency is that of the slowest one."""
+        incremental = self._incremental(
+            [RAGE_CLICKS, CLICK_PATTERNS, FUNNEL_EVENTS, EVENT_COUNTS],
+            days,
+            limit,
+            extra={"persons": PERSONS_COUNT_QUERY},
         )
-        
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get("results", [])
-            
-            output = f"## Click Pattern Analysis (Last {days} Days)\n\n"
-            output += "*Note: No explicit $rageclick events found. Analyzing general click patterns.*\n\n"
-            
-            if results:
-                output += "| Page | Total Clicks | Unique Users |\n"
-                output += "|------|--------------|-------------|\n"
-                
-                for row in results:
-                    page = row[0] if row[0] else "unknown"
-                    clicks = row[1] if len(row) > 1 else 0
-                    users = row[2] if len(row) > 2 else 0
-                    page_short = page[:50] + "..." if len(str(page)) > 50 else page
-                    output += f"| {page_short} | {clicks} | {users} |\n"
-            else:
-                output += "No click data found.\n"
-            
-            return output
-        
-        return "Could not analyze click patterns."
-    
-    def _query_funnel_analysis(
-        self,
-        base_url: str,
-        headers: dict,
-        days: int
-    ) -> str:
-        """Analyze conversion funnel: product_viewed → product_added_to_cart → checkout."""
-        # Get counts for key funnel events
-        query = {
-            "query": {
-                "kind": "HogQLQuery",
-                "query": f"""
-                    SELECT 
-                        event,
-                        count() as total,
-                        uniq(distinct_id) as unique_users
-                    FROM events 
-                    WHERE event IN ('product_viewed', 'product_added_to_cart', 'checkout_started', 'checkout_initiated', 'payment_completed', 'order_created')
-                    AND timestamp > now() - INTERVAL {days} DAY
-                    GROUP BY event
-                    ORDER BY total DESC
-                """
+        if incremental is not None:
+            rows, extra = incremental
+            data = {
+                "rage_clicks": {"results": rows["rage_clicks"]},
+                "click_patterns": {"results": rows["click_patterns"]},
+                "funnel": {"results": rows["funnel_events"]},
+                "event_counts": {"results": rows["event_counts"][:30]},
+                "persons": extra["persons"],
             }
-        }
-        
-        response = requests.post(
-            f"{base_url}/query/",
-            headers=headers,
-            json=query,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get("results", [])
-            
-            if not results:
-                return f"No funnel events found in the last {days} days."
-            
-            # Build a dict of event counts
-            event_data = {}
-            for row in results:
-                event_name = row[0]
-                count = row[1] if len(row) > 1 else 0
-                users = row[2] if len(row) > 2 else 0
-                event_data[event_name] = {"count": count, "users": users}
-            
-            output = f"## Conversion Funnel Analysis (Last {days} Days)\n\n"
-            
-            # Calculate conversion rates
-            product_views = event_data.get("product_viewed", {}).get("count", 0)
-            add_to_cart = event_data.get("product_added_to_cart", {}).get("count", 0)
-            checkout = event_data.get("checkout_started", event_data.get("checkout_initiated", {})).get("count", 0)
-            payment = event_data.get("payment_completed", {}).get("count", 0)
-            
-            output += "### Funnel Steps\n\n"
-            output += "| Step | Events | Conversion Rate |\n"
-            output += "|------|--------|----------------|\n"
-            output += f"| Product Viewed | {product_views} | 100% (baseline) |\n"
-            
-            if product_views > 0:
-                cart_rate = (add_to_cart / product_views) * 100
-                output += f"| Added to Cart | {add_to_cart} | {cart_rate:.1f}% |\n"
-                
-                if add_to_cart > 0:
-                    checkout_rate = (checkout / add_to_cart) * 100
-                    output += f"| Checkout Started | {checkout} | {checkout_rate:.1f}% |\n"
-                
-                if checkout > 0:
-                    payment_rate = (payment / checkout) * 100
-                    output += f"| Payment Completed | {payment} | {payment_rate:.1f}% |\n"
-            
-            # Identify drop-off points
-            output += "\n### 🚨 Drop-off Analysis\n\n"
-            
-            if product_views > 0 and add_to_cart > 0:
-                view_to_cart_drop = product_views - add_to_cart
-                view_to_cart_rate = (add_to_cart / product_views) * 100
-                
-                if view_to_cart_rate < 30:  # Less than 30% conversion is concerning
-                    output += f"**CRITICAL DROP-OFF DETECTED:**\n"
-                    output += f"- Product View → Add to Cart: Only {view_to_cart_rate:.1f}% conversion\n"
-                    output += f"- {view_to_cart_drop} users ({100-view_to_cart_rate:.1f}%) dropped off\n"
-                    output += f"- **Recommendation:** Investigate Add to Cart button usability on product pages\n\n"
-                elif view_to_cart_rate < 50:
-                    output += f"**MODERATE DROP-OFF:**\n"
-                    output += f"- Product View → Add to Cart: {view_to_cart_rate:.1f}% conversion\n"
-                    output += f"- {view_to_cart_drop} users dropped off\n\n"
-            
-            if add_to_cart > 0 and checkout > 0:
-                cart_to_checkout_rate = (checkout / add_to_cart) * 100
-                if cart_to_checkout_rate < 50:
-                    output += f"**Cart to Checkout Drop-off:**\n"
-                    output += f"- Add to Cart → Checkout: {cart_to_checkout_rate:.1f}% conversion\n\n"
-            
-            return output
         else:
-            return f"PostHog API error: {response.status_code} - {response.text[:200]}"
+            data = client.query_many({
+                "rage_clicks": rage_clicks_query(days, limit),
+                "click_patterns": click_patterns_query(days, limit),
+                "funnel": funnel_query(days),
+                "event_counts": event_counts_query(days),
+                "persons": PERSONS_COUNT_QUERY,
+            }, use_cache=use_cache)
+        return {name: _section(name, response) for name, response in data.items()}
     
-    def _query_drop_offs(
+    def _fetch_rage_clicks(
         self,
-        base_url: str,
-        headers: dict,
+        client: PostHogClient,
+        use_cache: bool,
         days: int,
         limit: int
-    ) -> str:
-        """Query for funnel drop-offs - redirects to funnel_analysis."""
-        return self._query_funnel_analysis(base_url, headers, days)
+    ) -> Dict[str, Dict[str, Any]]:
+        """Rage clicks; click patterns as well when there are no $rageclick events."""
+        incremental = self._incremental([RAGE_CLICKS, CLICK_PATTERNS], days, limit)
+        if incremental is not None:
+            rows = incremental[0]
+            sections = {"rage_clicks": _section("rage_clicks", {"results": rows["rage_clicks"]})}
+            if not rows["rage_clicks"]:
+                sections["click_patterns"] = _section("click_patterns", {"results": rows["click_patterns"]})
+            return sections
+        
+        # First check if $rageclick events exist
+        data = client.query(rage_clicks_query(days, limit), use_cache=use_cache)
+        sections = {"rage_clicks": _section("rage_clicks", data)}
+        if not data.get("results"):
+            # No $rageclick events, fallback to autocapture analysis
+            data = client.query(click_patterns_query(days, limit), use_cache=use_cache)
+            sections["click_patterns"] = _section("click_patterns", data)
+        return sections
     
-    def _query_events(
+    def _fetch_funnel(
         self,
-        base_url: str,
-        headers: dict,
+        client: PostHogClient,
+        use_cache: bool,
+        days: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """Counts of the funnel events: product_viewed → product_added_to_cart → checkout."""
+        incremental = self._incremental([FUNNEL_EVENTS], days, 100)
+        if incremental is not None:
+            return {"funnel": _section("funnel", {"results": incremental[0]["funnel_events"]})}
+        
+        data = client.query(funnel_query(days), use_cache=use_cache)
+        return {"funnel": _section("funnel", data)}
+    
+    def _fetch_events(
+        self,
+        client: PostHogClient,
+        use_cache: bool,
         days: int,
         limit: int,
         page_filter: Optional[str]
-    ) -> str:
+    ) -> Dict[str, Dict[str, Any]]:
         """Query general events using HogQL."""
-        where_clause = f"AND properties.$current_url LIKE '%{page_filter}%'" if page_filter else ""
+        if not page_filter:
+            incremental = self._incremental([EVENT_COUNTS], days, limit)
+            if incremental is not None:
+                return {"events": _section("events", {"results": incremental[0]["event_counts"]})}
         
-        query = {
-            "query": {
-                "kind": "HogQLQuery",
-                "query": f"""
-                    SELECT 
-                        event,
-                        count() as total,
-                        uniq(distinct_id) as unique_users
-                    FROM events 
-                    WHERE timestamp > now() - INTERVAL {days} DAY
-                    {where_clause}
-                    GROUP BY event
-                    ORDER BY total DESC
-                    LIMIT {limit}
-                """
-            }
-        }
+        data = client.query(event_counts_query(days, limit, page_filter), use_cache=use_cache)
+        return {"events": _section("events", data)}
+    
+    def _fetch_event_counts(
+        self,
+        client: PostHogClient,
+        use_cache: bool,
+        days: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """Query event counts using HogQL."""
+        incremental = self._incremental([EVENT_COUNTS], days, 30)
+        if incremental is not None:
+            return {"event_counts": _section("event_counts", {"results": incremental[0]["event_counts"]})}
+        
+        data = client.query(event_counts_query(days), use_cache=use_cache)
+        return {"event_counts": _section("event_counts", data)}
+    
+    def _fetch_persons(
+        self,
+        client: PostHogClient,
+        limit: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """Query person/user data."""
+        data = client.get_json(client.project_path("/persons/"), params={"limit": limit})
+        rows = [[person.get("id")] for person in data.get("results", [])]
+        return {"person_list": {"columns": ["id"], "results": rows}}
+    
+    # ===================
+    # Rendering
+    # ===================
+    
+    def _render_compact(self, query_type: str, days: int, sections: Dict[str, Dict[str, Any]]) -> str:
+        output: Dict[str, Any] = {"query_type": query_type, "days": days}
+        for name, section in sections.items():
+            if "error" in section:
+                output[name] = {"error": section["error"]}
+            else:
+                output[name] = compact_table(section["columns"], section["results"])
+        return dumps_compact(output)
+    
+    def _render_markdown(self, query_type: str, days: int, sections: Dict[str, Dict[str, Any]]) -> str:
+        if query_type == "friction_scan":
+            return self._format_friction_scan(sections, days)
+        elif query_type == "rage_clicks":
+            if sections["rage_clicks"]["results"]:
+                return self._format_rage_clicks(sections["rage_clicks"]["results"], days)
+            return self._format_click_patterns(sections["click_patterns"]["results"], days)
+        elif query_type == "drop_offs" or query_type == "funnel_analysis":
+            return self._format_funnel_analysis(sections["funnel"]["results"], days)
+        elif query_type == "events":
+            return self._format_event_counts(sections["events"]["results"], days, "Event Summary")
+        elif query_type == "event_counts":
+            return self._format_event_counts(sections["event_counts"]["results"], days, "Event Counts")
+        return f"Found {len(sections['person_list']['results'])} users in the system."
+    
+    def _format_friction_scan(self, data: Dict[str, Dict[str, Any]], days: int) -> str:
+        def section(name: str, render) -> str:
+            if "error" in data[name]:
+                return data[name]["error"]
+            return render(data[name].get("results", []))
         
-        response = requests.post(
-            f"{base_url}/query/",
-            headers=headers,
-            json=query,
-            timeout=30
+        rage = data["rage_clicks"]
+        if rage.get("results"):
+            clicks = self._format_rage_clicks(rage["results"], days)
+        elif "error" in rage:
+            clicks = rage["error"]
+        else:
+            clicks = section("click_patterns", lambda r: self._format_click_patterns(r, days))
+        
+        persons = section(
+            "persons",
+            lambda r: f"Found {r[0][0] if r and r[0] else 0} users in the system."
         )
         
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get("results", [])
-            
-            if not results:
-                return f"No events found in the last {days} days."
-            
-            output = f"## Event Summary (Last {days} Days)\n\n"
-            output += "| Event | Count | Unique Users |\n"
-            output += "|-------|-------|-------------|\n"
+        sections = [
+            f"# Friction Scan (Last {days} Days)",
+            clicks,
+            section("funnel", lambda r: self._format_funnel_analysis(r, days)),
+            section("event_counts", lambda r: self._format_event_counts(r, days, "Event Counts")),
+            f"## Users\n\n{persons}",
+        ]
+        return "\n\n".join(part.rstrip() for part in sections) + "\n"
+    
+    def _format_event_counts(self, results: List[list], days: int, title: str) -> str:
+        if not results:
+            return f"No events found in the last {days} days."
+        
+        output = f"## {title} (Last {days} Days)\n\n"
+        output += "| Event | Count | Unique Users |\n"
+        output += "|-------|-------|-------------|\n"
+        
+        for row in results:
+            event_name = row[0] if row[0] else "unknown"
+            count = row[1] if len(row) > 1 else 0
+            users = row[2] if len(row) > 2 else 0
+            output += f"| {event_name} | {count} | {users} |\n"
+        
+        return output
+    
+    def _format_rage_clicks(self, results: List[list], days: int) -> str:
+        output = f"## Rage Click Analysis (Last {days} Days)\n\n"
+        output += "| Page | Element | Rage Clicks | Affected Users |\n"
+        output += "|------|---------|-------------|----------------|\n"
+        
+        for row in results:
+            page = row[0] if row[0] else "unknown"
+            element = row[1] if row[1] else "unknown"
+            clicks = row[2] if len(row) > 2 else 0
+            users = row[3] if len(row) > 3 else 0
+            # Truncate long URLs
+            page_short = page[:50] + "..." if len(str(page)) > 50 else page
+            output += f"| {page_short} | {element} | {clicks} | {users} |\n"
+        
+        return output
+    
+    def _format_click_patterns(self, results: List[list], days: int) -> str:
+        output = f"## Click Pattern Analysis (Last {days} Days)\n\n"
+        output += "*Note: No explicit $rageclick events found. Analyzing general click patterns.*\n\n"
+        
+        if results:
+            output += "| Page | Total Clicks | Unique Users |\n"
+            output += "|------|--------------|-------------|\n"
             
             for row in results:
-                event_name = row[0] if row[0] else "unknown"
-                count = row[1] if len(row) > 1 else 0
+                page = row[0] if row[0] else "unknown"
+                clicks = row[1] if len(row) > 1 else 0
                 users = row[2] if len(row) > 2 else 0
-                output += f"| {event_name} | {count} | {users} |\n"
-            
-            return output
+                page_short = page[:50] + "..." if len(str(page)) > 50 else page
+                output += f"| {page_short} | {clicks} | {users} |\n"
+        else:
+            output += "No click data found.\n"
         
-        return f"Event query failed: {response.status_code}"
+        return output
     
-    def _query_persons(
-        self,
-        base_url: str,
-        headers: dict,
-        limit: int
-    ) -> str:
-        """Query person/user data."""
-        response = requests.get(
-            f"{base_url}/persons/",
-            headers=headers,
-            params={"limit": limit},
-            timeout=30
-        )
+    def _format_funnel_analysis(self, results: List[list], days: int) -> str:
+        if not results:
+            return f"No funnel events found in the last {days} days."
+        
+        # Build a dict of event counts
+        event_data = {}
+        for row in results:
+            event_name = row[0]
+            count = row[1] if len(row) > 1 else 0
+            users = row[2] if len(row) > 2 else 0
+            event_data[event_name] = {"count": count, "users": users}
+        
+        output = f"## Conversion Funnel Analysis (Last {days} Days)\n\n"
+        
+        # Calculate conversion rates
+        product_views = event_data.get("product_viewed", {}).get("count", 0)
+        add_to_cart = event_data.get("product_added_to_cart", {}).get("count", 0)
+        checkout = event_data.get("checkout_started", event_data.get("checkout_initiated", {})).get("count", 0)
+        payment = event_data.get("payment_completed", {}).get("count", 0)
         
-        if response.status_code == 200:
-            data = response.json()
-            persons = data.get("results", [])
-            return f"Found {len(persons)} users in the system."
+        output += "### Funnel Steps\n\n"
+        output += "| Step | Events | Conversion Rate |\n"
+        output += "|------|--------|----------------|\n"
+        output += f"| Product Viewed | {product_views} | 100% (baseline) |\n"
         
-        return f"Persons query failed: {response.status_code}"
+        if product_views > 0:
+            cart_rate = (add_to_cart / product_views) * 100
+            output += f"| Added to Cart | {add_to_cart} | {cart_rate:.1f}% |\n"
+            
+            if add_to_cart > 0:
+                checkout_rate = (checkout / add_to_cart) * 100
+                output += f"| Checkout Started | {checkout} | {checkout_rate:.1f}% |\n"
+            
+            if checkout > 0:
+                payment_rate = (payment / checkout) * 100
+                output += f"| Payment Completed | {payment} | {payment_rate:.1f}% |\n"
+        
+        # Identify drop-off points
+        output += "\n### 🚨 Drop-off Analysis\n\n"
+        
+        if product_views > 0 and add_to_cart > 0:
+            view_to_cart_drop = product_views - add_to_cart
+            view_to_cart_rate = (add_to_cart / product_views) * 100
+            
+            if view_to_cart_rate < 30:  # Less than 30% conversion is concerning
+                output += f"**CRITICAL DROP-OFF DETECTED:**\n"
+                output += f"- Product View → Add to Cart: Only {view_to_cart_rate:.1f}% conversion\n"
+                output += f"- {view_to_cart_drop} users ({100-view_to_cart_rate:.1f}%) dropped off\n"
+                output += f"- **Recommendation:** Investigate Add to Cart button usability on product pages\n\n"
+            elif view_to_cart_rate < 50:
+                output += f"**MODERATE DROP-OFF:**\n"
+                output += f"- Product View → Add to Cart: {view_to_cart_rate:.1f}% conversion\n"
+                output += f"- {view_to_cart_drop} users dropped off\n\n"
+        
+        if add_to_cart > 0 and checkout > 0:
+            cart_to_checkout_rate = (checkout / add_to_cart) * 100
+            if cart_to_checkout_rate < 50:
+                output += f"**Cart to Checkout Drop-off:**\n"
+                output += f"- Add to Cart → Checkout: {cart_to_checkout_rate:.1f}% conversion\n\n"
+        
+        return output
 
 
 class PostHogRecordingsInput(BaseModel):
@@ -458,6 +549,8 @@ class PostHogRecordingsInput(BaseModel):
     )
 
 
+@track_tool_calls
+@budget_tool_output
 class PostHogRecordingsTool(BaseTool):
     """
     Fetch session recording URLs from PostHog.
@@ -476,21 +569,15 @@ class PostHogRecordingsTool(BaseTool):
     def _run(self, limit: int = 10, page_filter: Optional[str] = None) -> str:
         """Fetch session recordings."""
         settings = get_settings()
-        
-        headers = {
-            "Authorization": f"Bearer {settings.POSTHOG_API_KEY}"
-        }
-        
-        base_url = f"{settings.POSTHOG_HOST}/api/projects/{settings.POSTHOG_PROJECT_ID}"
+        client = get_posthog_client()
         
         try:
             params = {"limit": limit}
             
-            response = requests.get(
-                f"{base_url}/session_recordings/",
-                headers=headers,
-                params=params,
-                timeout=30
+            response = client.request(
+                "GET",
+                client.project_path("/session_recordings/"),
+                params=params
             )
             
             if response.status_code == 200:
@@ -0,0 +1,93 @@
+"""
+Darwin Multi-Agent System - Tool Progress Reporting
+===================================================
+Lets tools report structured progress events (tool calls with their
+latency, documents written) to whoever is running the pipeline.
+
+The reporter is held in a context variable set around `crew.kickoff()`,
+so concurrent pipeline jobs on different threads never see each other's
+events. Without a reporter every call here is a no-op.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Callable, Dict, Any
+
+
+# Callback receiving (event_type, data)
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+_reporter: ContextVar[Optional[ProgressCallback]] = ContextVar("darwin_progress_reporter", default=None)
+
+# Longest tool argument value included in a tool_call event
+_ARG_PREVIEW_CHARS = 120
+
+
+@contextmanager
+def progress_reporter(callback: Optional[ProgressCallback]):
+    """Route progress events raised inside the block to `callback`."""
+    token = _reporter.set(callback)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+
+def report_progress(event_type: str, **data: Any) -> None:
+    """Report a progress event; reporting never interrupts the caller."""
+    callback = _reporter.get()
+    if callback is None:
+        return
+    try:
+        callback(event_type, data)
+    except Exception:
+        pass
+
+
+def _preview(value: Any) -> Any:
+    """Shorten long argument values for event payloads."""
+    if isinstance(value, str) and len(value) > _ARG_PREVIEW_CHARS:
+        return value[:_ARG_PREVIEW_CHARS] + "…"
+    return value
+
+
+def track_tool_calls(tool_cls):
+    """
+    Class decorator reporting a `tool_call` event for every `_run`.
+
+    The event carries the tool name, argument previews, latency in
+    milliseconds and output size (or the exception, if the tool raised).
+    """
+    run = tool_cls._run
+
+    @functools.wraps(run)
+    def _run(self, *args, **kwargs):
+        if _reporter.get() is None:
+            return run(self, *args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            output = run(self, *args, **kwargs)
+        except Exception as e:
+            report_progress(
+                "tool_call",
+                tool=self.name,
+                args={k: _preview(v) for k, v in kwargs.items()},
+                latency_ms=round((time.perf_counter() - start) * 1000, 1),
+                error=str(e),
+            )
+            raise
+
+        report_progress(
+            "tool_call",
+            tool=self.name,
+            args={k: _preview(v) for k, v in kwargs.items()},
+            latency_ms=round((time.perf_counter() - start) * 1000, 1),
+            output_chars=len(output) if isinstance(output, str) else None,
+        )
+        return output
+
+    tool_cls._run = _run
+    return tool_cls
@@ -0,0 +1,428 @@
+"""
+Darwin Multi-Agent System - Rule-Based Signal Detection
+=======================================================
+Deterministic friction detection: runs the detection HogQL queries,
+applies the SIGNAL_* thresholds and writes `Signal` documents in one
+bulk upsert. No LLM is involved, so the same analytics always yield the
+same signals and a run takes as long as its queries.
+
+Rules:
+- rage_click: rage clicks on a page element. URLs are grouped by route
+  (/product/12 and /product/13 → /product/[id]), which is how pages map
+  to source files.
+- drop_off: share of funnel events not followed by the next step.
+- error_spike: `$exception` rate on a page in the last
+  SIGNAL_ERROR_RECENT_HOURS against its rate over the rest of the window
+  (pages with no earlier errors are reported by error count).
+
+Severity comes from SEVERITY_THRESHOLDS for the signal's metric. A
+signal that has not been processed yet is updated in place (metric,
+severity, last_seen) when it is detected again instead of duplicated.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlparse
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from src.config.settings import get_settings
+from src.models import Signal, SignalType, Severity, SEVERITY_THRESHOLDS
+from .posthog_client import PostHogClient, get_posthog_client
+from .posthog_incremental import (
+    IncrementalAggregator,
+    RAGE_CLICKS,
+    FUNNEL_EVENTS,
+    ERRORS,
+    get_incremental_aggregator,
+)
+from .posthog_tools import rage_clicks_query, funnel_query
+
+
+# Funnel steps in order: (label, events counted for the step, page users leave from)
+FUNNEL_STEPS: List[Tuple[str, Tuple[str, ...], str]] = [
+    ("Product Viewed", ("product_viewed",), "/product/[id]"),
+    ("Added to Cart", ("product_added_to_cart",), "/cart"),
+    ("Checkout Started", ("checkout_started", "checkout_initiated"), "/checkout"),
+    ("Payment Completed", ("payment_completed", "order_created"), "/checkout"),
+]
+
+# Path segments that identify a record rather than a route
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,})$")
+
+# Per-URL evidence kept on a signal
+_MAX_SAMPLES = 5
+
+# Signal fields refreshed when an unprocessed signal is detected again
+_REFRESHED_FIELDS = (
+    "severity", "title", "description", "metric_value", "threshold",
+    "confidence", "affected_users", "sample_events", "last_seen",
+)
+
+
+def error_spike_query(days: int, recent_hours: int, limit: int) -> str:
+    return f"""
+        SELECT
+            properties.$current_url as page,
+            count() as errors,
+            countIf(timestamp > now() - INTERVAL {recent_hours} HOUR) as recent_errors,
+            uniqIf(distinct_id, timestamp > now() - INTERVAL {recent_hours} HOUR) as affected_users
+        FROM events
+        WHERE event = '$exception'
+        AND timestamp > now() - INTERVAL {days} DAY
+        GROUP BY page
+        ORDER BY recent_errors DESC
+        LIMIT {limit}
+    """
+
+
+def route_of(url: Optional[str]) -> str:
+    """Route of a URL, with id-like path segments replaced by [id]."""
+    if not url:
+        return "(unknown)"
+    path = urlparse(str(url)).path or "/"
+    segments = ["[id]" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")]
+    return "/".join(segments) or "/"
+
+
+def severity_for(metric_name: str, value: float) -> Severity:
+    """Severity of a metric value according to SEVERITY_THRESHOLDS."""
+    for severity, minimum in SEVERITY_THRESHOLDS[metric_name].items():
+        if value >= minimum:
+            return severity
+    return Severity.LOW
+
+
+def _confidence(affected_users: int) -> float:
+    """More affected users, more confidence that the friction is real."""
+    return round(min(0.95, 0.6 + affected_users / 250), 2)
+
+
+@dataclass(frozen=True)
+class DetectionThresholds:
+    """Minimums a metric must reach before it becomes a signal."""
+    rage_click_min: int = 5
+    min_affected_users: int = 3
+    drop_off_ratio: float = 0.5
+    min_funnel_users: int = 20
+    error_recent_hours: int = 24
+    error_spike_ratio: float = 3.0
+    error_min_count: int = 5
+
+    @classmethod
+    def from_settings(cls) -> "DetectionThresholds":
+        settings = get_settings()
+        return cls(
+            rage_click_min=settings.SIGNAL_RAGE_CLICK_MIN,
+            min_affected_users=settings.SIGNAL_MIN_AFFECTED_USERS,
+            drop_off_ratio=settings.SIGNAL_DROP_OFF_RATIO,
+            min_funnel_users=settings.SIGNAL_MIN_FUNNEL_USERS,
+            error_recent_hours=settings.SIGNAL_ERROR_RECENT_HOURS,
+            error_spike_ratio=settings.SIGNAL_ERROR_SPIKE_RATIO,
+            error_min_count=settings.SIGNAL_ERROR_MIN_COUNT,
+        )
+
+
+class SignalDetector:
+    """Turns PostHog detection queries into typed signals."""
+
+    def __init__(
+        self,
+        client: PostHogClient,
+        thresholds: Optional[DetectionThresholds] = None,
+        aggregator: Optional[IncrementalAggregator] = None,
+    ):
+        self.client = client
+        self.thresholds = thresholds or DetectionThresholds()
+        self.aggregator = aggregator
+
+    # ===================
+    # Queries
+    # ===================
+
+    def fetch(self, days: int, limit: int = 100, use_cache: bool = True) -> Tuple[Dict[str, List[list]], List[str]]:
+        """
+        Raw rows of every detection query.
+
+        Returns:
+            (rows, errors): rows by name -
+            rage_clicks [page, element, rage_clicks, affected_users],
+            funnel [event, total, unique_users],
+            errors [page, errors, recent_errors, recent_users];
+            errors lists the queries that failed (their rows are empty)
+        """
+        recent_hours = self.thresholds.error_recent_hours
+        if self.aggregator is not None and days <= self.aggregator.retention_days:
+            try:
+                rows, _ = self.aggregator.query([RAGE_CLICKS, FUNNEL_EVENTS, ERRORS], days, limit)
+                recent = {row[0]: row for row in self.aggregator.rows(ERRORS, recent_hours / 24, limit)}
+                errors = []
+                for page, total, _ in rows["errors"]:
+                    _, recent_errors, recent_users = recent.get(page, (page, 0, 0))
+                    errors.append([page, total, recent_errors, recent_users])
+                return {"rage_clicks": rows["rage_clicks"], "funnel": rows["funnel_events"], "errors": errors}, []
+            except PyMongoError as e:
+                print(f"[SignalDetector] Incremental aggregates unavailable, scanning full window: {e}")
+
+        responses = self.client.query_many({
+            "rage_clicks": rage_clicks_query(days, limit),
+            "funnel": funnel_query(days),
+            "errors": error_spike_query(days, recent_hours, limit),
+        }, use_cache=use_cache)
+        failed = [f"{name}: {response['error']}" for name, response in responses.items() if "error" in response]
+        return {name: response.get("results", []) for name, response in responses.items()}, failed
+
+    # ===================
+    # Rules
+    # ===================
+
+    def rage_click_signals(self, rows: List[list], days: int) -> List[Signal]:
+        grouped: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        for row in rows:
+            url, element, clicks, users = row[0], row[1], row[2] or 0, row[3] or 0
+            entry = grouped.setdefault((route_of(url), element), {"clicks": 0, "users": 0, "samples": []})
+            entry["clicks"] += clicks
+            entry["users"] += users  # Users on different URLs of a route are counted once per URL
+            entry["samples"].append({"url": url, "rage_clicks": clicks, "affected_users": users})
+
+        signals = []
+        for (route, element), entry in grouped.items():
+            clicks, users = entry["clicks"], entry["users"]
+            if clicks < self.thresholds.rage_click_min or users < self.thresholds.min_affected_users:
+                continue
+            target = f"'{element}' on {route}" if element else route
+            signals.append(Signal(
+                type=SignalType.RAGE_CLICK,
+                severity=severity_for("rage_click_count", clicks),
+                title=f"Rage clicks on {target}",
+                description=(
+                    f"{clicks} rage clicks by {users} users on {target} in the last {days} days, "
+                    f"across {len(entry['samples'])} URL(s)."
+                ),
+                metric_name="rage_click_count",
+                metric_value=clicks,
+                threshold=self.thresholds.rage_click_min,
+                confidence=_confidence(users),
+                page=route,
+                element=element,
+                affected_users=users,
+                sample_events=entry["samples"][:_MAX_SAMPLES],
+            ))
+        return signals
+
+    def drop_off_signals(self, rows: List[list], days: int) -> List[Signal]:
+        totals = {row[0]: (row[1] or 0, row[2] or 0) for row in rows}
+        steps = []
+        for label, events, page in FUNNEL_STEPS:
+            # (events, users) of the step; alternative event names count as one step
+            steps.append((label, max((totals.get(event, (0, 0)) for event in events)), page))
+
+        signals = []
+        for (label, (events, users), page), (next_label, (next_events, next_users), _) in zip(steps, steps[1:]):
+            # No events at the next step usually means it is not instrumented
+            if users < self.thresholds.min_funnel_users or next_events == 0:
+                continue
+            # Conversion by events, like the funnel analysis of PostHogQueryTool
+            # (unique users from incremental aggregates are lower bounds)
+            ratio = 1 - next_events / events
+            if ratio < self.thresholds.drop_off_ratio:
+                continue
+            lost = max(users - next_users, 0)
+            signals.append(Signal(
+                type=SignalType.DROP_OFF,
+                severity=severity_for("drop_off_rate", ratio),
+                title=f"Drop-off from {label} to {next_label}",
+                description=(
+                    f"Only {1 - ratio:.0%} of {label} events ({next_events} of {events}) were followed by "
+                    f"{next_label} in the last {days} days; about {lost} users dropped off."
+                ),
+                metric_name="drop_off_rate",
+                metric_value=round(ratio, 3),
+                threshold=self.thresholds.drop_off_ratio,
+                confidence=_confidence(lost),
+                page=page,
+                element=f"{label} → {next_label}",
+                affected_users=lost,
+                sample_events=[
+                    {"step": label, "events": events, "users": users},
+                    {"step": next_label, "events": next_events, "users": next_users},
+                ],
+            ))
+        return signals
+
+    def error_spike_signals(self, rows: List[list], days: int) -> List[Signal]:
+        recent_hours = self.thresholds.error_recent_hours
+        baseline_hours = days * 24 - recent_hours
+        if baseline_hours <= 0:
+            return []  # The window has no baseline to compare against
+
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            url, total, recent, users = row[0], row[1] or 0, row[2] or 0, row[3] or 0
+            entry = grouped.setdefault(route_of(url), {"total": 0, "recent": 0, "users": 0, "samples": []})
+            entry["total"] += total
+            entry["recent"] += recent
+            entry["users"] += users
+            entry["samples"].append({"url": url, "errors": total, "recent_errors": recent})
+
+        signals = []
+        for route, entry in grouped.items():
+            recent, users = entry["recent"], entry["users"]
+            if recent < self.thresholds.error_min_count or users < self.thresholds.min_affected_users:
+                continue
+            baseline_rate = (entry["total"] - recent) / baseline_hours
+            if baseline_rate > 0:
+                ratio = (recent / recent_hours) / baseline_rate
+                if ratio < self.thresholds.error_spike_ratio:
+                    continue
+                metric_name, metric_value, threshold = "error_spike_ratio", round(ratio, 2), self.thresholds.error_spike_ratio
+                detail = f"{ratio:.1f}x the hourly rate of the rest of the last {days} days"
+            else:
+                metric_name, metric_value, threshold = "error_count", recent, self.thresholds.error_min_count
+                detail = f"none in the rest of the last {days} days"
+            signals.append(Signal(
+                type=SignalType.ERROR_SPIKE,
+                severity=severity_for(metric_name, metric_value),
+                title=f"Error spike on {route}",
+                description=f"{recent} errors for {users} users in the last {recent_hours} hours ({detail}).",
+                metric_name=metric_name,
+                metric_value=metric_value,
+                threshold=threshold,
+                confidence=_confidence(users),
+                page=route,
+                affected_users=users,
+                sample_events=entry["samples"][:_MAX_SAMPLES],
+            ))
+        return signals
+
+    def detect(self, days: int, limit: int = 100, use_cache: bool = True) -> Tuple[List[Signal], List[str]]:
+        """
+        Run every rule.
+
+        Returns:
+            (signals, failed queries)
+        """
+        rows, failed = self.fetch(days, limit, use_cache)
+        signals = (
+            self.rage_click_signals(rows["rage_clicks"], days)
+            + self.drop_off_signals(rows["funnel"], days)
+            + self.error_spike_signals(rows["errors"], days)
+        )
+        return signals, failed
+
+
+def save_signals(signals: List[Signal], collection=None) -> Dict[str, int]:
+    """
+    Bulk-upsert signals into MongoDB.
+
+    A signal matches an existing one with the same type, page, element and
+    metric that has not been processed yet; the match is refreshed,
+    anything else is inserted.
+
+    Returns:
+        {"inserted": n, "updated": n}
+    """
+    if not signals:
+        return {"inserted": 0, "updated": 0}
+    if collection is None:
+        from src.db import signals_collection
+        collection = signals_collection()
+
+    operations = []
+    for signal in signals:
+        # Timestamps as ISO strings, like every other signals writer (Mongo
+        # orders by BSON type first, so mixing in dates breaks sorting/paging)
+        document = {
+            field: value.isoformat() if isinstance(value, datetime) else value
+            for field, value in signal.to_mongo().items()
+        }
+        refreshed = {field: document.pop(field) for field in _REFRESHED_FIELDS if field in document}
+        key = {
+            "type": document.pop("type"),
+            "page": document.pop("page"),
+            "element": document.pop("element", None),
+            "metric_name": document.pop("metric_name"),
+            "processed": document.pop("processed"),
+        }
+        operations.append(UpdateOne(key, {"$set": refreshed, "$setOnInsert": document}, upsert=True))
+
+    result = collection.bulk_write(operations, ordered=False)
+    return {"inserted": result.upserted_count, "updated": result.matched_count}
+
+
+def detect_signals(
+    days: Optional[int] = None,
+    save: bool = True,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Detect signals with the rule-based detector and (optionally) save them.
+
+    Args:
+        days: Lookback window (default SIGNAL_DETECTION_DAYS)
+        save: Upsert the signals into the `signals` collection
+        use_cache: Allow cached HogQL results
+
+    Returns:
+        Report with the detected signals (as dicts), insert/update counts,
+        failed queries and the duration in seconds
+    """
+    started = time.monotonic()
+    days = days or get_settings().SIGNAL_DETECTION_DAYS
+    detector = SignalDetector(
+        get_posthog_client(),
+        DetectionThresholds.from_settings(),
+        get_incremental_aggregator(),
+    )
+    signals, failed = detector.detect(days, use_cache=use_cache)
+    saved = save_signals(signals) if save else {"inserted": 0, "updated": 0}
+
+    report = {
+        "days": days,
+        "signals": [signal.model_dump(exclude={"id"}) for signal in signals],
+        "inserted": saved["inserted"],
+        "updated": saved["updated"],
+        "failed_queries": failed,
+        "duration_seconds": round(time.monotonic() - started, 2),
+        "detected_at": datetime.utcnow().isoformat(),
+    }
+
+    if save:
+        from src.db import log_agent_action
+        log_agent_action(
+            agent_name="Signal Detector",
+            action="signals_detected",
+            details={key: value for key, value in report.items() if key != "signals"} | {"count": len(signals)},
+            status="failed" if failed and not signals else "success",
+        )
+    return report
+
+
+def format_detection_report(report: Dict[str, Any]) -> str:
+    """Markdown summary of a detection report (for the Watcher and the CLI)."""
+    signals = report["signals"]
+    output = f"## Detected Signals (Last {report['days']} Days)\n\n"
+    output += (
+        f"{len(signals)} signal(s): {report['inserted']} new, {report['updated']} updated "
+        f"({report['duration_seconds']}s).\n\n"
+    )
+    if report["failed_queries"]:
+        output += "Failed queries (their signals are missing):\n"
+        for failure in report["failed_queries"]:
+            output += f"- {failure}\n"
+        output += "\n"
+    if not signals:
+        return output + "No metric crossed its threshold.\n"
+
+    output += "| Type | Severity | Page | Element | Metric | Users |\n"
+    output += "|------|----------|------|---------|--------|-------|\n"
+    for signal in signals:
+        output += (
+            f"| {signal['type']} | {signal['severity']} | {signal['page']} | {signal.get('element') or '-'} "
+            f"| {signal['metric_name']} = {signal['metric_value']} | {signal['affected_users']} |\n"
+        )
+    return output